@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Verifica que los iteradores particionados de ImportDataFrame
+    (iter_banco_invico, iter_siif_rcocc31) devuelvan las mismas particiones,
+    columnas, tipos y valores dentro y fuera de memory_budget(). Dentro del
+    modo acotado las particiones se leen con SQL directo (ver
+    utils.partitions), no con el lector de invicodatpy, así que pueden
+    desviarse de éste. Por defecto corre sobre bases sintéticas; con
+    --db-path, sobre las bases reales y su lector.
+
+Ejemplo:
+    python -m benchmarks.check_partitions
+    python -m benchmarks.check_partitions -p mes -e 2024
+    python -m benchmarks.check_partitions --db-path '/ruta/a/las/bases'
+"""
+
+import argparse
+import tempfile
+import traceback
+from contextlib import nullcontext
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.partitions import PARTITIONS, memory_budget
+from invicoctrlpy.utils.session import DataSession
+
+from .synthetic import SyntheticReader, generate
+
+
+# --------------------------------------------------
+def banco_invico(import_df:ImportDataFrame, ejercicios:List[str], partition:str):
+    return import_df.iter_banco_invico(
+        ejercicio=ejercicios, clasificar=True, partition=partition
+    )
+
+
+# --------------------------------------------------
+def siif_rcocc31(import_df:ImportDataFrame, ejercicios:List[str], partition:str):
+    return import_df.iter_siif_rcocc31(
+        ejercicio=ejercicios, cta_contable='1112-2-6', partition=partition
+    )
+
+
+CHECKS:Dict[str, Callable] = {
+    'banco_invico': banco_invico,
+    'siif_rcocc31': siif_rcocc31,
+}
+
+
+# --------------------------------------------------
+def run_check(
+    check:Callable, ejercicios:List[str], db_path:str, partition:str
+) -> str:
+    """None si ambos caminos coinciden; si no, el motivo"""
+    import_df = ImportDataFrame()
+    import_df.db_path = db_path
+    import_df.import_ctas_ctes()
+    expected = dict(check(import_df, ejercicios, partition))
+    with memory_budget(partition):
+        result = dict(check(import_df, ejercicios, partition))
+    if list(result) != list(expected):
+        return f'particiones {list(result)} vs {list(expected)}'
+    for key, df in result.items():
+        other = expected[key]
+        if list(df.columns) != list(other.columns):
+            return f'{key}: columnas {list(df.columns)} vs {list(other.columns)}'
+        dtypes = {
+            col: (str(df[col].dtype), str(other[col].dtype))
+            for col in df.columns if df[col].dtype != other[col].dtype
+        }
+        if dtypes:
+            return f'{key}: tipos (particionado, completo) {dtypes}'
+        try:
+            pd.testing.assert_frame_equal(
+                df.reset_index(drop=True), other.reset_index(drop=True),
+                check_exact=False
+            )
+        except AssertionError as e:
+            return f'{key}: ' + str(e).splitlines()[0]
+    return None
+
+
+# --------------------------------------------------
+def run_checks(
+    checks:List[str], ejercicios:List[str], db_path:str,
+    partitions:List[str], synthetic:bool = True
+) -> pd.DataFrame:
+    results = []
+    reader = SyntheticReader() if synthetic else None
+    with DataSession(reader=reader):
+        for name in checks:
+            for partition in partitions:
+                try:
+                    error = run_check(CHECKS[name], ejercicios, db_path, partition)
+                except Exception:
+                    error = traceback.format_exc(limit=1).strip().splitlines()[-1]
+                results.append({
+                    'check': name, 'partition': partition,
+                    'ok': error is None, 'error': error
+                })
+                label = f'{name} ({partition})'
+                print(f'{label:<30} ' + ('OK' if error is None else error))
+    return pd.DataFrame(results)
+
+
+# --------------------------------------------------
+def get_args():
+    parser = argparse.ArgumentParser(
+        description = 'Compara la lectura particionada con la completa',
+        formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-c', '--check',
+        nargs = '+',
+        choices = list(CHECKS),
+        default = list(CHECKS),
+        help = 'Verificaciones a ejecutar')
+
+    parser.add_argument(
+        '-e', '--ejercicio',
+        nargs = '+',
+        default = ['2023', '2024'],
+        help = 'Ejercicios a comparar (y a generar, sin --db-path)')
+
+    parser.add_argument(
+        '-p', '--partition',
+        nargs = '+',
+        choices = list(PARTITIONS),
+        default = list(PARTITIONS),
+        help = 'Particiones a comparar')
+
+    parser.add_argument(
+        '-d', '--db-path',
+        default = None,
+        help = 'Bases reales (por defecto, se generan bases sintéticas)')
+
+    parser.add_argument(
+        '-n', '--rows',
+        type = int,
+        default = 2000,
+        help = 'Filas por ejercicio y tabla (bases sintéticas)')
+
+    parser.add_argument(
+        '--seed',
+        type = int,
+        default = 0,
+        help = 'Semilla del generador')
+
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+def main():
+    args = get_args()
+    synthetic = args.db_path is None
+    with (tempfile.TemporaryDirectory() if synthetic else nullcontext(args.db_path)) as db_path:
+        if synthetic:
+            generate(db_path, args.ejercicio, rows_per_year=args.rows, seed=args.seed)
+        df = run_checks(
+            args.check, args.ejercicio, db_path, args.partition, synthetic=synthetic
+        )
+    return 0 if df['ok'].all() else 1
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Verifica que los métodos con camino SQL (ver utils.sql_engine) den
+    el mismo resultado con y sin SqlEngine, sobre bases sintéticas. Se
+    quita una cuenta de ctas_ctes para que haya cta_cte sin mapear (claves
+    nulas), el caso en que SQL y pandas difieren si no se las trata igual.
+
+Ejemplo:
+    python -m benchmarks.check_sql_engine
+    python -m benchmarks.check_sql_engine --backend duckdb -e 2023 2024
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import traceback
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from invicoctrlpy.utils.session import DataSession
+from invicoctrlpy.utils.sql_engine import SqlEngine
+
+from .synthetic import CTAS_CTES, SyntheticReader, generate, table_name
+
+
+# --------------------------------------------------
+def obras_control_cruzado(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.control_obras.control_obras import ControlObras
+    return ControlObras(ejercicio=ejercicios[-1], db_path=db_path).control_cruzado()
+
+
+# --------------------------------------------------
+def haberes_control_cruzado(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.control_haberes.control_haberes import \
+        ControlHaberes
+    return ControlHaberes(ejercicio=ejercicios[-1], db_path=db_path).control_cruzado()
+
+
+# --------------------------------------------------
+def siif_pagos_contratistas(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.control_retenciones.control_retenciones import \
+        ControlRetenciones
+    return ControlRetenciones(
+        ejercicio=ejercicios, db_path=db_path
+    ).import_siif_pagos_contratistas()
+
+
+# --------------------------------------------------
+def siif_pagos_retenciones(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.control_retenciones.control_retenciones import \
+        ControlRetenciones
+    return ControlRetenciones(
+        ejercicio=ejercicios, db_path=db_path
+    ).import_siif_pagos_retenciones()
+
+
+# --------------------------------------------------
+def siif_retencion_337(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.recursos.aporte_empresario.aporte_empresario import \
+        ControlAporteEmpresario
+    return ControlAporteEmpresario(
+        ejercicio=ejercicios, db_path=db_path
+    ).import_siif_retencion_337()
+
+
+CHECKS:Dict[str, Callable[[List[str], str], pd.DataFrame]] = {
+    'obras_control_cruzado': obras_control_cruzado,
+    'haberes_control_cruzado': haberes_control_cruzado,
+    'siif_pagos_contratistas': siif_pagos_contratistas,
+    'siif_pagos_retenciones': siif_pagos_retenciones,
+    'siif_retencion_337': siif_retencion_337,
+}
+
+
+# --------------------------------------------------
+def unmap_cta_cte(db_path:str, cta_cte:str = CTAS_CTES[0]):
+    """Quita cta_cte de ctas_ctes: sus movimientos quedan sin map_to"""
+    with sqlite3.connect(os.path.join(db_path, 'sscc.sqlite')) as conn:
+        conn.execute(
+            f'DELETE FROM "{table_name("CtasCtes")}" WHERE map_to = ?', (cta_cte,)
+        )
+
+
+# --------------------------------------------------
+def normalize(df:pd.DataFrame) -> pd.DataFrame:
+    """Mismo orden de columnas y filas, para comparar sin importar el camino"""
+    df = df.loc[:, sorted(df.columns)]
+    return df.sort_values(by=list(df.columns)).reset_index(drop=True)
+
+
+# --------------------------------------------------
+def run_check(
+    check:Callable, ejercicios:List[str], db_path:str, backend:str = None
+) -> str:
+    """None si ambos caminos coinciden; si no, el motivo"""
+    with DataSession(reader=SyntheticReader()):
+        expected = check(ejercicios, db_path)
+    with DataSession(reader=SyntheticReader()), SqlEngine(db_path, backend=backend):
+        result = check(ejercicios, db_path)
+    if len(result) != len(expected):
+        return f'{len(result)} filas con SqlEngine vs {len(expected)} con pandas'
+    try:
+        pd.testing.assert_frame_equal(
+            normalize(result), normalize(expected),
+            check_dtype=False, check_exact=False
+        )
+    except AssertionError as e:
+        return str(e).splitlines()[0]
+    return None
+
+
+# --------------------------------------------------
+def run_checks(
+    checks:List[str], ejercicios:List[str], db_path:str, backend:str = None
+) -> pd.DataFrame:
+    results = []
+    for name in checks:
+        try:
+            error = run_check(CHECKS[name], ejercicios, db_path, backend)
+        except Exception:
+            error = traceback.format_exc(limit=1).strip().splitlines()[-1]
+        results.append({'check': name, 'ok': error is None, 'error': error})
+        print(f'{name:<30} ' + ('OK' if error is None else error))
+    return pd.DataFrame(results)
+
+
+# --------------------------------------------------
+def get_args():
+    parser = argparse.ArgumentParser(
+        description = 'Compara los caminos SQL y pandas sobre bases sintéticas',
+        formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-c', '--check',
+        nargs = '+',
+        choices = list(CHECKS),
+        default = list(CHECKS),
+        help = 'Verificaciones a ejecutar')
+
+    parser.add_argument(
+        '-e', '--ejercicio',
+        nargs = '+',
+        default = ['2023', '2024'],
+        help = 'Ejercicios a generar')
+
+    parser.add_argument(
+        '-b', '--backend',
+        choices = ['duckdb', 'sqlite'],
+        default = None,
+        help = 'Motor SQL (por defecto, duckdb si está instalado)')
+
+    parser.add_argument(
+        '-n', '--rows',
+        type = int,
+        default = 2000,
+        help = 'Filas por ejercicio y tabla')
+
+    parser.add_argument(
+        '--seed',
+        type = int,
+        default = 0,
+        help = 'Semilla del generador')
+
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+def main():
+    args = get_args()
+    with tempfile.TemporaryDirectory() as db_path:
+        generate(db_path, args.ejercicio, rows_per_year=args.rows, seed=args.seed)
+        unmap_cta_cte(db_path)
+        df = run_checks(args.check, args.ejercicio, db_path, backend=args.backend)
+    return 0 if df['ok'].all() else 1
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Tiempo de importación de los módulos de invicoctrlpy. Cada módulo se
+    importa en un intérprete nuevo con -X importtime; se informa el tiempo
+    acumulado, los paquetes más pesados que arrastra y si carga invicodatpy /
+    invicodb (que deberían importarse recién al leer o actualizar).
+
+Ejemplo:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time -m invicoctrlpy.cli -n 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List
+
+import pandas as pd
+
+MODULES = [
+    'invicoctrlpy',
+    'invicoctrlpy.cli',
+    'invicoctrlpy.utils.import_dataframe',
+    'invicoctrlpy.gastos.control_haberes.control_haberes',
+    'invicoctrlpy.gastos.control_retenciones.control_retenciones',
+    'invicoctrlpy.gastos.control_honorarios.control_honorarios',
+    'invicoctrlpy.gastos.ejecucion_obras.ejecucion_obras',
+    'invicoctrlpy.recursos.recuperos.recuperos',
+]
+LAZY_PACKAGES = ('invicodatpy', 'invicodb')
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+# --------------------------------------------------
+def import_profile(module:str, repeat:int = 3) -> pd.DataFrame:
+    """
+    Tiempos (µs) de cada módulo importado al hacer 'import module'. Se queda
+    con la corrida más rápida de repeat.
+    """
+    best = None
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '0'}
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, env=env
+        )
+        if proc.returncode != 0:
+            raise ImportError(proc.stderr.strip().splitlines()[-1])
+        rows = []
+        for line in proc.stderr.splitlines():
+            match = LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                rows.append({
+                    'module': name, 'self_us': int(self_us),
+                    'cumulative_us': int(cumulative_us),
+                    'depth': len(indent) // 2,
+                })
+        df = pd.DataFrame(rows)
+        total = df.loc[df['module'] == module, 'cumulative_us'].max()
+        if best is None or total < best[0]:
+            best = (total, df)
+    return best[1]
+
+
+# --------------------------------------------------
+def summarize(modules:List[str], top:int = 10, repeat:int = 3) -> pd.DataFrame:
+    results = []
+    for module in modules:
+        try:
+            df = import_profile(module, repeat=repeat)
+        except ImportError as e:
+            results.append({'module': module, 'error': str(e)})
+            continue
+        total = df.loc[df['module'] == module, 'cumulative_us'].max()
+        packages = df['module'].str.split('.').str[0]
+        by_package = df.groupby(packages)['self_us'].sum().sort_values(ascending=False)
+        results.append({
+            'module': module,
+            'import_ms': total / 1000,
+            'modules': len(df),
+            **{f'loads_{package}': package in set(packages) for package in LAZY_PACKAGES},
+            'heaviest': ', '.join(
+                f'{name} {us / 1000:.0f}ms' for name, us in by_package.head(top).items()
+            ),
+        })
+    return pd.DataFrame(results)
+
+
+# --------------------------------------------------
+def get_args():
+    parser = argparse.ArgumentParser(
+        description = 'Tiempo de importación de los módulos de invicoctrlpy',
+        formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-m', '--module',
+        nargs = '+',
+        default = MODULES,
+        help = 'Módulos a medir')
+
+    parser.add_argument(
+        '-n', '--top',
+        type = int,
+        default = 5,
+        help = 'Paquetes más pesados a listar por módulo')
+
+    parser.add_argument(
+        '-r', '--repeat',
+        type = int,
+        default = 3,
+        help = 'Corridas por módulo (se informa la más rápida)')
+
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+def main():
+    args = get_args()
+    df = summarize(args.module, top=args.top, repeat=args.repeat)
+    with pd.option_context('display.width', 250, 'display.max_colwidth', 120):
+        print(df.to_string(index=False, float_format='{:.1f}'.format))
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
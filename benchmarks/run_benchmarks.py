@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Benchmarks de los métodos principales de los controles sobre bases
+    sintéticas (ver benchmarks/synthetic.py) a escala 1×, 10× y 100×. Cada
+    medición corre en una DataSession nueva, de modo que incluye la lectura
+    de las tablas.
+
+Ejemplo:
+    python -m benchmarks.run_benchmarks --scale 1 10 --ejercicio 2023 2024
+    python -m benchmarks.run_benchmarks -b icaro_vs_siif --json result.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import traceback
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from invicoctrlpy.utils.session import DataSession
+
+from .synthetic import SyntheticReader, generate
+
+BASE_ROWS = 1000
+
+
+# --------------------------------------------------
+def icaro_vs_siif(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.control_retenciones.control_retenciones import \
+        ControlRetenciones
+    return ControlRetenciones(ejercicio=ejercicios, db_path=db_path).icaro_vs_siif()
+
+
+# --------------------------------------------------
+def slave_vs_sgf(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.control_honorarios.control_honorarios import \
+        ControlHonorarios
+    return ControlHonorarios(ejercicio=ejercicios, db_path=db_path).slave_vs_sgf()
+
+
+# --------------------------------------------------
+def reporte_planillometro_contabilidad(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.gastos.ejecucion_obras.ejecucion_obras import \
+        EjecucionObras
+    # El acumulado 2008 sale de un Excel de producción, que no se sintetiza
+    return EjecucionObras(
+        ejercicio=ejercicios[-1], db_path=db_path
+    ).reporte_planillometro_contabilidad(agregar_acum_2008=False)
+
+
+# --------------------------------------------------
+def rdeu012_with_accounting(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.contabilidad.deuda_flotante.control_deuda_flotante_fct import \
+        rdeu012_with_accounting
+    return rdeu012_with_accounting(ejercicios=ejercicios, db_path=db_path).rdeu_cta_contable
+
+
+# --------------------------------------------------
+def banco_siif_vs_invico_ajustes(ejercicios:List[str], db_path:str):
+    from invicoctrlpy.contabilidad.banco.control_banco_siif import ControlBanco
+    return ControlBanco(
+        ejercicio=ejercicios, db_path=db_path
+    ).banco_siif_vs_invico_ajustes()
+
+
+BENCHMARKS:Dict[str, Callable[[List[str], str], pd.DataFrame]] = {
+    'icaro_vs_siif': icaro_vs_siif,
+    'slave_vs_sgf': slave_vs_sgf,
+    'reporte_planillometro_contabilidad': reporte_planillometro_contabilidad,
+    'rdeu012_with_accounting': rdeu012_with_accounting,
+    'banco_siif_vs_invico_ajustes': banco_siif_vs_invico_ajustes,
+}
+
+
+# --------------------------------------------------
+def time_benchmark(
+    bench:Callable, ejercicios:List[str], db_path:str, repeat:int = 1
+) -> dict:
+    """Mejor tiempo de repeat corridas, cada una con una DataSession nueva"""
+    times, rows, error = [], None, None
+    for _ in range(repeat):
+        with DataSession(reader=SyntheticReader()):
+            start = time.perf_counter()
+            try:
+                result = bench(ejercicios, db_path)
+            except Exception:
+                error = traceback.format_exc(limit=1).strip().splitlines()[-1]
+                break
+            times.append(time.perf_counter() - start)
+        rows = len(result) if isinstance(result, pd.DataFrame) else None
+    return {
+        'seconds': min(times) if times else None,
+        'rows_out': rows,
+        'error': error,
+    }
+
+
+# --------------------------------------------------
+def run_benchmarks(
+    benchmarks:List[str], scales:List[int], ejercicios:List[str],
+    work_path:str, repeat:int = 1, seed:int = 0
+) -> pd.DataFrame:
+    results = []
+    for scale in scales:
+        db_path = os.path.join(work_path, f'x{scale}')
+        counts = generate(
+            db_path, ejercicios, rows_per_year=BASE_ROWS * scale, seed=seed
+        )
+        rows_in = sum(counts.values())
+        for name in benchmarks:
+            result = time_benchmark(BENCHMARKS[name], ejercicios, db_path, repeat)
+            results.append({
+                'benchmark': name, 'scale': scale, 'rows_in': rows_in, **result
+            })
+            print(
+                f'{name:<40} {scale:>4}x '
+                + (f'{result["seconds"]:>9.3f}s' if result['error'] is None
+                   else result['error'])
+            )
+    return pd.DataFrame(results)
+
+
+# --------------------------------------------------
+def get_args():
+    parser = argparse.ArgumentParser(
+        description = 'Benchmarks de invicoctrlpy sobre bases sintéticas',
+        formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-b', '--benchmark',
+        nargs = '+',
+        choices = list(BENCHMARKS),
+        default = list(BENCHMARKS),
+        help = 'Benchmarks a ejecutar')
+
+    parser.add_argument(
+        '-s', '--scale',
+        nargs = '+',
+        type = int,
+        default = [1, 10, 100],
+        help = f'Escalas ({BASE_ROWS} filas por ejercicio y tabla = 1x)')
+
+    parser.add_argument(
+        '-e', '--ejercicio',
+        nargs = '+',
+        default = ['2022', '2023', '2024'],
+        help = 'Ejercicios a generar')
+
+    parser.add_argument(
+        '-r', '--repeat',
+        type = int,
+        default = 1,
+        help = 'Corridas por medición (se informa la mejor)')
+
+    parser.add_argument(
+        '-w', '--work-path',
+        default = None,
+        help = 'Carpeta de las bases sintéticas (por defecto, una temporal)')
+
+    parser.add_argument(
+        '--seed',
+        type = int,
+        default = 0,
+        help = 'Semilla del generador')
+
+    parser.add_argument(
+        '--json',
+        default = None,
+        help = 'Guarda los resultados en este archivo JSON')
+
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+def main():
+    args = get_args()
+    with tempfile.TemporaryDirectory() as tmp_path:
+        df = run_benchmarks(
+            args.benchmark, args.scale, args.ejercicio,
+            work_path=args.work_path or tmp_path,
+            repeat=args.repeat, seed=args.seed
+        )
+    print(df.to_string(index=False))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(df.to_dict(orient='records'), f, indent=2)
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
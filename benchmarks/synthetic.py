@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Generador de bases SQLite sintéticas (siif, sscc, sgf, icaro,
+    slave, sgv y sgo) con una tabla por cada lectura de ImportDataFrame y las
+    columnas que el paquete usa de ella. Las claves compartidas (cta_cte,
+    cuit, nro_comprobante, actividad, ...) salen de los mismos catálogos, de
+    modo que los merges de los controles encuentran coincidencias.
+
+    Las tablas se nombran como el modelo de invicodatpy (más sus argumentos:
+    MigrateIcaro__carga) y se leen a través de SyntheticReader, que se pasa a
+    DataSession(reader=...) en lugar de model().from_sql.
+"""
+
+__all__ = ['generate', 'SyntheticReader', 'TABLES']
+
+import os
+import sqlite3
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from invicoctrlpy.utils.registry import model_name
+
+CTAS_CTES = [
+    '130832-03', '130832-04', '130832-05', '130832-07', '130832-08',
+    '130832-12', '106', '10270', '2210178150', '334', 'Macro', 'Patagonia'
+]
+FUENTES = ['10', '11', '12', '13']
+PARTIDAS = ['100', '150', '151', '232', '331', '354', '421', '422', '511']
+COD_IMPUTACIONES = [
+    '001', '002', '005', '018', '019', '023', '029', '034', '049', '055',
+    '056', '059', '062', '112', '142', '143', '213', '999'
+]
+CTAS_CONTABLES = [
+    '1112-2-6', '2111-1-1', '2111-1-2', '2113-2-9', '2122-1-2', '2241-1'
+]
+TIPOS_COMPROBANTE = ['CAO', 'CAP', 'AJU', 'APE', 'CYO', 'PA6']
+DESTINOS_SGF = [
+    'HONORARIOS - FUNCIONAMIENTO', 'COMISIONES - FUNCIONAMIENTO',
+    'HONORARIOS - EPAM', 'OBRAS', 'ESCRIBANOS'
+]
+N_CUITS = 500
+N_ACTIVIDADES = 60
+N_BARRIOS = 300
+N_MOTIVOS = 12
+
+
+# --------------------------------------------------
+class Gen():
+    """Catálogos y columnas aleatorias compartidas entre tablas"""
+
+    # --------------------------------------------------
+    def __init__(self, ejercicios:List[str], rows:int, seed:int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.ejercicios = ejercicios
+        self.rows = rows
+        self.cuits = np.array([f'30{i:09d}' for i in range(N_CUITS)])
+        self.actividades = np.array([
+            f'{11 + i % 20:02d}-{i % 3:02d}-{i % 5:02d}-{1 + i % 9:02d}'
+            for i in range(N_ACTIVIDADES)
+        ])
+        self.obras = np.array([f'OBRA {i:04d}' for i in range(N_ACTIVIDADES * 4)])
+
+    # --------------------------------------------------
+    def choice(self, values, n:int) -> np.ndarray:
+        return self.rng.choice(np.asarray(values), n)
+
+    # --------------------------------------------------
+    def amount(self, n:int, scale:float = 1e6) -> np.ndarray:
+        return np.round(self.rng.gamma(2.0, scale / 2, n), 2)
+
+    # --------------------------------------------------
+    def per_year(self, n:int = None) -> pd.DataFrame:
+        """ejercicio, mes ('MM/YYYY') y fecha, n filas por ejercicio"""
+        n = self.rows if n is None else n
+        frames = []
+        for ejercicio in self.ejercicios:
+            month = self.rng.integers(1, 13, n)
+            day = self.rng.integers(1, 29, n)
+            frames.append(pd.DataFrame({
+                'ejercicio': ejercicio,
+                'mes': [f'{m:02d}/{ejercicio}' for m in month],
+                'fecha': pd.to_datetime({
+                    'year': int(ejercicio), 'month': month, 'day': day
+                }),
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    # --------------------------------------------------
+    def nro_comprobante(self, df:pd.DataFrame, suffix:str = '') -> pd.Series:
+        nro = pd.Series(self.rng.integers(1, self.rows * 2, len(df)), index=df.index)
+        return nro.astype(str).str.zfill(5) + '/' + df['ejercicio'].str[-2:] + suffix
+
+
+# --------------------------------------------------
+def ctas_ctes(g:Gen) -> pd.DataFrame:
+    df = pd.DataFrame({'map_to': CTAS_CTES, 'desc_cta_cte': CTAS_CTES})
+    for col in [
+        'icaro_cta_cte', 'siif_contabilidad_cta_cte', 'siif_gastos_cta_cte',
+        'siif_recursos_cta_cte', 'sgf_cta_cte', 'sscc_cta_cte'
+    ]:
+        df[col] = df['map_to']
+    return df
+
+
+# --------------------------------------------------
+def listado_imputaciones(g:Gen) -> pd.DataFrame:
+    return pd.DataFrame({
+        'cod_imputacion': COD_IMPUTACIONES,
+        'imputacion': [f'IMPUTACION {cod}' for cod in COD_IMPUTACIONES],
+        'tipo': g.choice(['Ingreso', 'Egreso'], len(COD_IMPUTACIONES)),
+    })
+
+
+# --------------------------------------------------
+def banco_invico(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['cta_cte'] = g.choice(CTAS_CTES, n)
+    df['movimiento'] = g.choice(['DEPOSITO', 'DEBITO'], n)
+    df['es_cheque'] = g.choice([True, False], n)
+    df['beneficiario'] = g.choice(g.cuits, n)
+    df['importe'] = np.where(df['movimiento'] == 'DEPOSITO', 1, -1) * g.amount(n)
+    df['concepto'] = 'CONCEPTO'
+    df['moneda'] = 'PESOS'
+    df['libramiento'] = g.rng.integers(1, 9999, n).astype(str)
+    df['cod_imputacion'] = g.choice(COD_IMPUTACIONES, n)
+    df['imputacion'] = 'IMPUTACION ' + df['cod_imputacion']
+    return df
+
+
+# --------------------------------------------------
+def sdo_final_banco_invico(g:Gen) -> pd.DataFrame:
+    df = pd.MultiIndex.from_product(
+        [g.ejercicios, CTAS_CTES], names=['ejercicio', 'cta_cte']
+    ).to_frame(index=False)
+    df['desc_cta_cte'] = df['cta_cte']
+    df['desc_banco'] = 'BANCO'
+    df['saldo'] = g.amount(len(df), 1e8)
+    return df
+
+
+# --------------------------------------------------
+def rdeu012(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['mes_hasta'] = g.choice(['06', '12'], n) + '/' + df['ejercicio']
+    df['fecha_hasta'] = pd.to_datetime(
+        df['mes_hasta'].str[-4:] + '-' + df['mes_hasta'].str[:2] + '-28'
+    )
+    df['fecha_aprobado'] = df['fecha']
+    df['fecha_desde'] = df['fecha']
+    df['nro_comprobante'] = g.nro_comprobante(df)
+    df['nro_origen'] = df['nro_comprobante'].str[:5].str.lstrip('0')
+    df['fuente'] = g.choice(FUENTES, n)
+    df['org_fin'] = '1'
+    df['importe'] = g.amount(n)
+    df['saldo'] = np.round(df['importe'] * g.rng.uniform(0, 1, n), 2)
+    df['cuit'] = g.choice(g.cuits, n)
+    df['beneficiario'] = df['cuit']
+    df['glosa'] = 'GLOSA'
+    df['nro_expte'] = g.rng.integers(9e8, 1e9, n).astype(str)
+    df['cta_cte'] = g.choice(CTAS_CTES, n)
+    return df
+
+
+# --------------------------------------------------
+def rdeu012b2_c(g:Gen) -> pd.DataFrame:
+    df = rdeu012(g)
+    return df.loc[:, [
+        'ejercicio', 'mes_hasta', 'fuente', 'cta_cte', 'nro_comprobante',
+        'importe', 'saldo', 'cuit', 'beneficiario'
+    ]]
+
+
+# --------------------------------------------------
+def estructuras(g:Gen) -> pd.DataFrame:
+    """Una fila por ejercicio, actividad y partida (presupuesto)"""
+    df = pd.MultiIndex.from_product(
+        [g.ejercicios, g.actividades, PARTIDAS],
+        names=['ejercicio', 'actividad_full', 'partida']
+    ).to_frame(index=False)
+    parts = df['actividad_full'].str.split('-', expand=True)
+    df['programa'], df['subprograma'] = parts[0], parts[1]
+    df['proyecto'], df['actividad'] = parts[2], parts[3]
+    df['estructura'] = df['actividad_full'] + '-' + df['partida']
+    df['grupo'] = df['partida'].str[0] + '00'
+    return df.drop(columns=['actividad_full'])
+
+
+# --------------------------------------------------
+def rf602(g:Gen) -> pd.DataFrame:
+    df = estructuras(g)
+    n = len(df)
+    df['fuente'] = g.choice(FUENTES, n)
+    df['org'] = '1'
+    df['credito_original'] = g.amount(n, 1e7)
+    df['credito_vigente'] = df['credito_original'] * 1.1
+    df['comprometido'] = np.round(df['credito_vigente'] * g.rng.uniform(0, 1, n), 2)
+    df['ordenado'] = np.round(df['comprometido'] * g.rng.uniform(0, 1, n), 2)
+    df['saldo'] = df['credito_vigente'] - df['comprometido']
+    df['pendiente'] = df['comprometido'] - df['ordenado']
+    return df
+
+
+# --------------------------------------------------
+def rfp_p605b(g:Gen) -> pd.DataFrame:
+    df = estructuras(g)
+    df['fuente'] = g.choice(FUENTES, len(df))
+    df['org'] = '1'
+    df['formulado'] = g.amount(len(df), 1e7)
+    return df
+
+
+# --------------------------------------------------
+def rf610(g:Gen) -> pd.DataFrame:
+    df = estructuras(g)
+    for col, prefix in [
+        ('desc_prog', 'PROGRAMA'), ('desc_subprog', 'SUBPROGRAMA'),
+        ('desc_proy', 'PROYECTO'), ('desc_act', 'ACTIVIDAD')
+    ]:
+        df[col] = prefix + ' ' + df['estructura'].str[:11]
+    df['desc_gpo'] = 'GRUPO ' + df['grupo']
+    df['desc_part'] = 'PARTIDA ' + df['partida']
+    df['credito_original'] = g.amount(len(df), 1e7)
+    df['credito_vigente'] = df['credito_original']
+    df['comprometido'] = df['credito_original'] / 2
+    df['ordenado'] = df['credito_original'] / 3
+    df['saldo'] = df['credito_vigente'] - df['comprometido']
+    return df
+
+
+# --------------------------------------------------
+def ppto_gtos_fte_desc(g:Gen) -> pd.DataFrame:
+    desc = rf610(g).loc[:, [
+        'ejercicio', 'estructura', 'desc_prog', 'desc_subprog', 'desc_proy',
+        'desc_act', 'desc_gpo', 'desc_part'
+    ]]
+    return rf602(g).merge(desc, on=['ejercicio', 'estructura'], how='left')
+
+
+# --------------------------------------------------
+def rfondo07tp(g:Gen) -> pd.DataFrame:
+    df = g.per_year(max(g.rows // 10, 1))
+    n = len(df)
+    df['tipo_comprobante'] = g.choice([
+        'ADELANTOS A CONTRATISTAS Y PROVEEDORES', 'FONDOS PERMANENTES'
+    ], n)
+    df['nro_fondo'] = g.rng.integers(1, 999, n).astype(str)
+    df['glosa'] = 'GLOSA'
+    df['ingresos'] = g.amount(n)
+    df['egresos'] = np.round(df['ingresos'] * g.rng.uniform(0, 1, n), 2)
+    df['saldo'] = df['ingresos'] - df['egresos']
+    return df
+
+
+# --------------------------------------------------
+def rcg01_uejp(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['nro_comprobante'] = g.nro_comprobante(df)
+    df['nro_entrada'] = df['nro_comprobante'].str[:5].str.lstrip('0')
+    df['nro_origen'] = df['nro_entrada']
+    df['importe'] = g.amount(n)
+    df['fuente'] = g.choice(FUENTES, n)
+    df['cta_cte'] = g.choice(CTAS_CTES, n)
+    df['cuit'] = g.choice(g.cuits, n)
+    df['beneficiario'] = df['cuit']
+    df['nro_expte'] = g.rng.integers(9e8, 1e9, n).astype(str)
+    df['nro_fondo'] = np.where(g.rng.uniform(size=n) < 0.1, '1', None)
+    df['clase_reg'] = g.choice(['CYO', 'REG'], n)
+    df['clase_mod'] = 'NOR'
+    df['clase_gto'] = g.choice(['REM', 'OTR'], n)
+    for col in ['es_comprometido', 'es_verificado', 'es_aprobado', 'es_pagado']:
+        df[col] = g.choice([True, False], n)
+    return df
+
+
+# --------------------------------------------------
+def comprobantes_gtos_gpo_part(g:Gen) -> pd.DataFrame:
+    df = rcg01_uejp(g)
+    df['partida'] = g.choice(PARTIDAS, len(df))
+    df['grupo'] = df['partida'].str[0] + '00'
+    df['glosa'] = 'GLOSA'
+    return df
+
+
+# --------------------------------------------------
+def rci02(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['nro_entrada'] = g.rng.integers(1, 99999, n).astype(str)
+    df['fuente'] = g.choice(FUENTES, n)
+    df['clase_reg'] = 'CYO'
+    df['clave'] = df['nro_entrada']
+    df['cta_cte'] = g.choice(CTAS_CTES, n)
+    df['glosa'] = g.choice(['RECUPEROS', 'FONAVI', 'HABERES ERRONEOS'], n)
+    df['importe'] = g.amount(n)
+    for col in ['es_remanente', 'es_invico', 'es_verificado']:
+        df[col] = g.choice([True, False], n)
+    return df
+
+
+# --------------------------------------------------
+def ri102(g:Gen) -> pd.DataFrame:
+    n = len(g.ejercicios) * 40
+    df = pd.DataFrame({'ejercicio': np.repeat(g.ejercicios, 40)})
+    df['tipo'] = '1'
+    df['clase'] = '1'
+    df['cod_recurso'] = g.rng.integers(10000, 99999, n).astype(str)
+    df['desc_recurso'] = 'RECURSO ' + df['cod_recurso']
+    df['fuente'] = g.choice(FUENTES, n)
+    df['org_fin'] = '1'
+    df['ppto_inicial'] = g.amount(n, 1e8)
+    df['ppto_modif'] = 0.0
+    df['ppto_vigente'] = df['ppto_inicial']
+    df['ingreso'] = np.round(df['ppto_inicial'] * g.rng.uniform(0, 1, n), 2)
+    df['saldo'] = df['ppto_vigente'] - df['ingreso']
+    return df
+
+
+# --------------------------------------------------
+def rcocc31(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['fecha_aprobado'] = df['fecha']
+    df['cta_contable'] = g.choice(CTAS_CONTABLES, n)
+    df['nro_entrada'] = g.rng.integers(1, g.rows * 2, n).astype(str)
+    df['nro_original'] = df['nro_entrada']
+    df['auxiliar_1'] = np.where(
+        df['cta_contable'] == '1112-2-6', g.choice(CTAS_CTES, n),
+        g.choice(['245', '310', '337', '101'], n)
+    )
+    df['auxiliar_2'] = ''
+    df['tipo_comprobante'] = g.choice(TIPOS_COMPROBANTE, n)
+    df['creditos'] = g.amount(n)
+    df['debitos'] = g.amount(n)
+    df['saldo'] = df['debitos'] - df['creditos']
+    return df
+
+
+# --------------------------------------------------
+def rvicon03(g:Gen) -> pd.DataFrame:
+    df = pd.MultiIndex.from_product(
+        [g.ejercicios, CTAS_CONTABLES], names=['ejercicio', 'cta_contable']
+    ).to_frame(index=False)
+    n = len(df)
+    df['nivel'] = df['cta_contable'].str[:4]
+    df['nivel_desc'] = 'NIVEL ' + df['nivel']
+    df['cta_contable_desc'] = 'CUENTA ' + df['cta_contable']
+    for col in [
+        'saldo_inicial', 'debe', 'haber', 'ajuste_debe', 'ajuste_haber',
+        'fondos_debe', 'fondos_haber'
+    ]:
+        df[col] = g.amount(n)
+    df['saldo_final'] = df['saldo_inicial'] + df['debe'] - df['haber']
+    return df
+
+
+# --------------------------------------------------
+def resumen_rend_prov(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['origen'] = g.choice(['OBRAS', 'FUNCIONAMIENTO', 'EPAM'], n)
+    df['beneficiario'] = g.choice(g.cuits, n)
+    df['destino'] = g.choice(DESTINOS_SGF, n)
+    df['libramiento_sgf'] = g.rng.integers(1, 9999, n).astype(str)
+    df['movimiento'] = g.choice(['TRANSF', 'CHEQUE'], n)
+    df['cta_cte'] = g.choice(CTAS_CTES, n)
+    df['importe_bruto'] = g.amount(n)
+    for col in [
+        'gcias', 'sellos', 'iibb', 'suss', 'invico', 'seguro', 'salud',
+        'mutual', 'otras'
+    ]:
+        df[col] = np.round(df['importe_bruto'] * 0.01, 2)
+    df['retenciones'] = np.round(df['importe_bruto'] * 0.09, 2)
+    df['importe_neto'] = df['importe_bruto'] - df['retenciones']
+    return df
+
+
+# --------------------------------------------------
+def resumen_rend_prov_cuit(g:Gen) -> pd.DataFrame:
+    df = resumen_rend_prov(g)
+    df['cuit'] = df['beneficiario']
+    return df
+
+
+# --------------------------------------------------
+def icaro_programas(g:Gen) -> pd.DataFrame:
+    programa = pd.Series(g.actividades).str[:2].unique()
+    return pd.DataFrame({'programa': programa, 'desc_prog': 'PROGRAMA ' + programa})
+
+
+# --------------------------------------------------
+def icaro_subprogramas(g:Gen) -> pd.DataFrame:
+    subprograma = pd.Series(g.actividades).str[:5].unique()
+    return pd.DataFrame({
+        'subprograma': subprograma, 'desc_subprog': 'SUBPROGRAMA ' + subprograma,
+        'programa': pd.Series(subprograma).str[:2],
+    })
+
+
+# --------------------------------------------------
+def icaro_proyectos(g:Gen) -> pd.DataFrame:
+    proyecto = pd.Series(g.actividades).str[:8].unique()
+    return pd.DataFrame({
+        'proyecto': proyecto, 'desc_proy': 'PROYECTO ' + proyecto,
+        'subprograma': pd.Series(proyecto).str[:5],
+    })
+
+
+# --------------------------------------------------
+def icaro_actividades(g:Gen) -> pd.DataFrame:
+    return pd.DataFrame({
+        'actividad': g.actividades, 'desc_act': 'ACTIVIDAD ' + g.actividades,
+        'proyecto': pd.Series(g.actividades).str[:8],
+    })
+
+
+# --------------------------------------------------
+def icaro_carga(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['nro_comprobante'] = g.nro_comprobante(df)
+    df['tipo'] = g.choice(['CYO', 'CYO', 'CYO', 'PA6', 'REG'], n)
+    df['id'] = df['nro_comprobante'] + df['tipo'].str[0]
+    df['fuente'] = g.choice(FUENTES, n)
+    df['cta_cte'] = g.choice(CTAS_CTES, n)
+    df['cuit'] = g.choice(g.cuits, n)
+    df['importe'] = g.amount(n)
+    df['actividad'] = g.choice(g.actividades, n)
+    df['partida'] = g.choice(PARTIDAS, n)
+    df['fondo_reparo'] = np.round(df['importe'] * 0.05, 2)
+    df['certificado'] = g.rng.integers(1, 30, n).astype(str)
+    df['avance'] = np.round(g.rng.uniform(0, 1, n), 4)
+    df['origen'] = g.choice(['OBRA', 'EPAM', 'MODULO'], n)
+    df['obra'] = g.choice(g.obras, n)
+    return df
+
+
+# --------------------------------------------------
+def icaro_obras(g:Gen) -> pd.DataFrame:
+    n = len(g.obras)
+    return pd.DataFrame({
+        'obra': g.obras,
+        'cuit': g.choice(g.cuits, n),
+        'actividad': g.choice(g.actividades, n),
+        'partida': g.choice(PARTIDAS, n),
+        'fuente': g.choice(FUENTES, n),
+        'monto_contrato': g.amount(n, 1e8),
+        'adicional': 0.0,
+        'cta_cte': g.choice(CTAS_CTES, n),
+        'norma_legal': 'RES',
+        'localidad': 'CORRIENTES',
+        'info_adicional': '',
+    })
+
+
+# --------------------------------------------------
+def icaro_retenciones(g:Gen) -> pd.DataFrame:
+    carga = icaro_carga(g)
+    df = carga.loc[carga.index.repeat(2), ['id', 'importe']]
+    df = df.rename(columns={'id': 'id_carga'}).reset_index(drop=True)
+    df['codigo'] = g.choice(['101', '102', '110', '111', '112', '113', '114', '337'], len(df))
+    df['importe'] = np.round(df['importe'] * 0.02, 2)
+    return df
+
+
+# --------------------------------------------------
+def icaro_proveedores(g:Gen) -> pd.DataFrame:
+    return pd.DataFrame({
+        'cuit': g.cuits, 'desc_prov': 'PROVEEDOR ' + g.cuits,
+        'domicilio': '', 'localidad': 'CORRIENTES', 'telefono': '',
+        'condicion_iva': 'RI',
+    })
+
+
+# --------------------------------------------------
+def slave_honorarios(g:Gen) -> pd.DataFrame:
+    df = g.per_year()
+    n = len(df)
+    df['id'] = np.arange(n)
+    df['nro_comprobante'] = g.nro_comprobante(df)
+    df['tipo'] = 'HONORARIOS'
+    df['razon_social'] = g.choice(g.cuits, n)
+    df['cuit'] = df['razon_social']
+    df['actividad'] = g.choice(g.actividades, n)
+    df['partida'] = g.choice(PARTIDAS, n)
+    df['importe_bruto'] = g.amount(n, 1e5)
+    for col in [
+        'iibb', 'sellos', 'seguro', 'lp', 'otras_retenciones', 'anticipo',
+        'descuento', 'embargo', 'mutual'
+    ]:
+        df[col] = np.round(df['importe_bruto'] * 0.01, 2)
+    df['importe_neto'] = df['importe_bruto'] * 0.91
+    return df
+
+
+# --------------------------------------------------
+def sgv_por_ejercicio(g:Gen, columns:List[str]) -> pd.DataFrame:
+    df = g.per_year(12)
+    df['mes'] = df['mes'].str[:2] + '/' + df['ejercicio']
+    for col in columns:
+        df[col] = g.amount(len(df), 1e7)
+    return df.drop(columns=['fecha'])
+
+
+# --------------------------------------------------
+def por_barrio(g:Gen) -> pd.DataFrame:
+    df = pd.MultiIndex.from_product(
+        [g.ejercicios, [f'{i:04d}' for i in range(N_BARRIOS)]],
+        names=['ejercicio', 'cod_barrio']
+    ).to_frame(index=False)
+    df['barrio'] = 'BARRIO ' + df['cod_barrio']
+    return df
+
+
+# --------------------------------------------------
+def barrios_nuevos(g:Gen) -> pd.DataFrame:
+    df = por_barrio(g).sample(frac=0.1, random_state=0).reset_index(drop=True)
+    df['localidad'] = 'CORRIENTES'
+    df['q_entregadas'] = g.rng.integers(10, 200, len(df))
+    df['importe_total'] = g.amount(len(df), 1e8)
+    df['importe_promedio'] = df['importe_total'] / df['q_entregadas']
+    return df
+
+
+# --------------------------------------------------
+def saldo_barrio_variacion(g:Gen) -> pd.DataFrame:
+    df = por_barrio(g)
+    n = len(df)
+    df['saldo_inicial'] = g.amount(n, 1e7)
+    df['amortizacion'] = -np.round(df['saldo_inicial'] * g.rng.uniform(0, 0.2, n), 2)
+    df['cambios'] = np.round(df['saldo_inicial'] * g.rng.uniform(-0.1, 0.1, n), 2)
+    df['saldo_final'] = df['saldo_inicial'] + df['amortizacion'] + df['cambios']
+    return df
+
+
+# --------------------------------------------------
+def saldo_barrio(g:Gen) -> pd.DataFrame:
+    df = por_barrio(g)
+    df['localidad'] = 'CORRIENTES'
+    df['saldo_actual'] = g.amount(len(df), 1e7)
+    return df
+
+
+# --------------------------------------------------
+def saldo_recuperos_cobrar_variacion(g:Gen) -> pd.DataFrame:
+    conceptos = ['SALDO AL INICIO:', 'AMORTIZACION', 'CAMBIOS', 'SALDO AL FINAL:']
+    df = pd.MultiIndex.from_product(
+        [g.ejercicios, conceptos], names=['ejercicio', 'concepto']
+    ).to_frame(index=False)
+    df['importe'] = g.amount(len(df), 1e9)
+    return df
+
+
+# --------------------------------------------------
+def saldo_motivo_por_barrio(g:Gen) -> pd.DataFrame:
+    df = por_barrio(g)
+    df = df.loc[df.index.repeat(3)].reset_index(drop=True)
+    motivo = g.rng.integers(1, N_MOTIVOS + 1, len(df))
+    df['cod_motivo'] = pd.Series(motivo).astype(str).str.zfill(3)
+    df['motivo'] = 'MOTIVO ' + df['cod_motivo']
+    df['importe'] = np.round(g.rng.normal(0, 1e6, len(df)), 2)
+    return df
+
+
+# --------------------------------------------------
+def saldo_motivo(g:Gen) -> pd.DataFrame:
+    df = pd.MultiIndex.from_product(
+        [g.ejercicios, [str(i) for i in range(1, N_MOTIVOS + 1)]],
+        names=['ejercicio', 'cod_motivo']
+    ).to_frame(index=False)
+    df['motivo'] = 'MOTIVO ' + df['cod_motivo']
+    df['importe'] = np.round(g.rng.normal(0, 1e8, len(df)), 2)
+    return df
+
+
+# --------------------------------------------------
+def listado_obras(g:Gen) -> pd.DataFrame:
+    n = len(g.obras)
+    return pd.DataFrame({
+        'cod_obra': [f'{i:05d}' for i in range(n)],
+        'obra': g.obras,
+        'contratista': g.choice(g.cuits, n),
+        'localidad': 'CORRIENTES',
+        'tipo_obra': 'VIVIENDAS',
+        'operatoria': 'FONAVI',
+        'fecha_inicio': pd.Timestamp('2015-01-01'),
+        'fecha_fin': pd.Timestamp('2030-01-01'),
+        'avance_fis_real': np.round(g.rng.uniform(0, 100, n), 2),
+        'nro_ultimo_certif': g.rng.integers(1, 30, n),
+        'mes_obra_certif': g.rng.integers(1, 60, n),
+        'monto_pagado': g.amount(n, 1e8),
+    })
+
+
+# (archivo, tabla) -> generador. La tabla es el nombre del modelo de
+# invicodatpy, con sus argumentos de from_sql separados por '__'
+TABLES:Dict[Tuple[str, str], Callable[[Gen], pd.DataFrame]] = {
+    ('sscc.sqlite', 'CtasCtes'): ctas_ctes,
+    ('sscc.sqlite', 'ListadoImputaciones'): listado_imputaciones,
+    ('sscc.sqlite', 'BancoINVICO'): banco_invico,
+    ('sscc.sqlite', 'SdoFinalBancoINVICO'): sdo_final_banco_invico,
+    ('siif.sqlite', 'DeudaFlotanteRdeu012'): rdeu012,
+    ('siif.sqlite', 'DeudaFlotanteRdeu012b2C'): rdeu012b2_c,
+    ('siif.sqlite', 'PptoGtosFteRf602'): rf602,
+    ('siif.sqlite', 'FormGtoRfpP605b'): rfp_p605b,
+    ('siif.sqlite', 'PptoGtosDescRf610'): rf610,
+    ('siif.sqlite', 'JoinPptoGtosFteDesc'): ppto_gtos_fte_desc,
+    ('siif.sqlite', 'ResumenFdosRfondo07tp'): rfondo07tp,
+    ('siif.sqlite', 'ComprobantesGtosRcg01Uejp'): rcg01_uejp,
+    ('siif.sqlite', 'JoinComprobantesGtosGpoPart'): comprobantes_gtos_gpo_part,
+    ('siif.sqlite', 'ComprobantesRecRci02'): rci02,
+    ('siif.sqlite', 'PptoRecRi102'): ri102,
+    ('siif.sqlite', 'MayorContableRcocc31'): rcocc31,
+    ('siif.sqlite', 'ResumenContableCtaRvicon03'): rvicon03,
+    ('sgf.sqlite', 'ResumenRendProv'): resumen_rend_prov,
+    ('sgf.sqlite', 'JoinResumenRendProvCuit'): resumen_rend_prov_cuit,
+    ('icaro.sqlite', 'MigrateIcaro__programas'): icaro_programas,
+    ('icaro.sqlite', 'MigrateIcaro__subprogramas'): icaro_subprogramas,
+    ('icaro.sqlite', 'MigrateIcaro__proyectos'): icaro_proyectos,
+    ('icaro.sqlite', 'MigrateIcaro__actividades'): icaro_actividades,
+    ('icaro.sqlite', 'MigrateIcaro__carga'): icaro_carga,
+    ('icaro.sqlite', 'MigrateIcaro__obras'): icaro_obras,
+    ('icaro.sqlite', 'MigrateIcaro__retenciones'): icaro_retenciones,
+    ('icaro.sqlite', 'MigrateIcaro__proveedores'): icaro_proveedores,
+    ('slave.sqlite', 'MigrateSlave__honorarios_factureros'): slave_honorarios,
+    ('sgv.sqlite', 'BarriosNuevos'): barrios_nuevos,
+    ('sgv.sqlite', 'ResumenFacturado'): lambda g: sgv_por_ejercicio(g, [
+        'amortizacion', 'int_financiero', 'int_mora', 'gtos_adm',
+        'seg_incendio', 'seg_vida', 'subsidio', 'facturado_total'
+    ]),
+    ('sgv.sqlite', 'ResumenRecaudado'): lambda g: sgv_por_ejercicio(g, [
+        'amortizacion', 'int_financiero', 'int_mora', 'gtos_adm',
+        'seg_incendio', 'seg_vida', 'subsidio', 'pago_amigable', 'escritura',
+        'pend_acreditacion', 'recaudado_total'
+    ]),
+    ('sgv.sqlite', 'SaldoBarrioVariacion'): saldo_barrio_variacion,
+    ('sgv.sqlite', 'SaldoBarrio'): saldo_barrio,
+    ('sgv.sqlite', 'SaldoRecuperosCobrarVariacion'): saldo_recuperos_cobrar_variacion,
+    ('sgv.sqlite', 'SaldoMotivoPorBarrio'): saldo_motivo_por_barrio,
+    ('sgv.sqlite', 'SaldoMotivo'): saldo_motivo,
+    ('sgo.sqlite', 'ListadoObras'): listado_obras,
+}
+
+
+# --------------------------------------------------
+def table_name(model:Union[str, type], *args) -> str:
+    return '__'.join([model_name(model), *map(str, args)])
+
+
+# --------------------------------------------------
+def generate(
+    db_path:str, ejercicios:List[str], rows_per_year:int = 1000,
+    seed:int = 0
+) -> Dict[str, int]:
+    """
+    Escribe las bases sintéticas en db_path (las reemplaza si existen).
+    Devuelve la cantidad de filas de cada tabla.
+    """
+    os.makedirs(db_path, exist_ok=True)
+    ejercicios = [str(ejercicio) for ejercicio in ejercicios]
+    counts = {}
+    files = {file for file, _ in TABLES}
+    for file in files:
+        file_path = os.path.join(db_path, file)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    for (file, table), build in TABLES.items():
+        # Misma semilla por tabla: las claves compartidas coinciden entre tablas
+        df = build(Gen(ejercicios, rows_per_year, seed))
+        with sqlite3.connect(os.path.join(db_path, file)) as conn:
+            df.to_sql(table, conn, index=False)
+        counts[f'{file}:{table}'] = len(df)
+    return counts
+
+
+# --------------------------------------------------
+class SyntheticReader():
+    """Reemplazo de model().from_sql para DataSession(reader=...)"""
+
+    # --------------------------------------------------
+    def __call__(self, model:Union[str, type], sqlite_path:str, *args) -> pd.DataFrame:
+        table = table_name(model, *args)
+        with sqlite3.connect(sqlite_path) as conn:
+            df = pd.read_sql(f'SELECT * FROM "{table}"', conn)
+        for col in df.columns:
+            if col.startswith('fecha'):
+                df[col] = pd.to_datetime(df[col])
+            elif col.startswith('es_'):
+                df[col] = df[col].astype(bool)
+        return df
@@ -11,6 +11,10 @@ setup(
     author_email='fscpython@gmail.com',
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
+    package_data={'invicoctrlpy.utils': ['*.json']},
+    entry_points={
+        'console_scripts': ['invicoctrlpy=invicoctrlpy.cli:main'],
+    },
     install_requires=[
         'nbconvert',
         'ipykernel',
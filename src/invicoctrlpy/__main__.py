@@ -0,0 +1,3 @@
+from invicoctrlpy.cli import main
+
+raise SystemExit(main())
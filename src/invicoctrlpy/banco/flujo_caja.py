@@ -11,11 +11,12 @@ Packages:
 """
 
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 
 import numpy as np
 import pandas as pd
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
 
@@ -27,6 +28,7 @@ class FlujoCaja(ImportDataFrame):
     input_path:str = None
     db_path:str = None
     update_db:bool = False
+    movimientos:pd.DataFrame = field(init=False, repr=False, default=None)
 
     # --------------------------------------------------
     def __post_init__(self):
@@ -57,40 +59,9 @@ class FlujoCaja(ImportDataFrame):
 
     # --------------------------------------------------
     def import_banco_invico(self):
-        df = super().import_banco_invico(self.ejercicio)
-        recursos = [
-            '001', '002', '012', '022', '056', 
-            '057', '062', '141', '211', '212', 
-            '216', '218', '220', '222', '226', 
-            '228'
-        ]
-
-        funcionamiento = [
-            '005', '023', '024', '029', '031',
-            '032', '033', '036', '037', '040',
-            '043', '049', '059'
-        ]
-
-        inversion_obras = [
-            '018', '019', '020', '021', '027', '035', '041',
-            '052', '053', '065', '066', '072', '112', '142'
-            '143', '162', '210', '213', '217', '219', '221',
-            '225', '227'
-        ]
-
-        # df['clase'] = np.where(df['cod_imputacion'].isin(recursos), 'Recursos',
-        #                 np.where(df['cod_imputacion'].isin(funcionamiento), 'Gtos. Funcionamiento',
-        #                     np.where(df['cod_imputacion'].isin(inversion_obras), 'Inversión Obras',  
-        #                     'OTROS')))
-        df['clase'] = np.select(
-            [
-                df['cod_imputacion'].isin(recursos),
-                df['cod_imputacion'].isin(funcionamiento),
-                df['cod_imputacion'].isin(inversion_obras),
-            ], 
-            ['1 - Recursos', '2 - Gtos. Funcionamiento', '3 - Inversión Obras'], 
-            '4 - OTROS'
-        )
+        # Clase según utils/imputaciones.json (categórica)
+        df = super().import_banco_invico(self.ejercicio, clasificar=True)
+        df['clase'] = df['clase_flujo_caja']
         df.reset_index(drop=True, inplace=True)
         df = df.sort_values(by='clase')
         return df
@@ -99,10 +70,62 @@ class FlujoCaja(ImportDataFrame):
     def flujo_caja_anual(self):
         sscc = self.import_banco_invico()
         groupby_cols:list = ['ejercicio', 'clase']
-        sscc = sscc.groupby(groupby_cols)['importe'].sum()
+        sscc = sscc.groupby(groupby_cols, observed=True)['importe'].sum()
         sscc = sscc.reset_index()
         return sscc
 
+    # --------------------------------------------------
+    def import_movimientos(self, reload:bool = False) -> pd.DataFrame:
+        """
+        Movimientos clasificados, ordenados e indexados por fecha. Se leen
+        una sola vez por instancia para poder regenerar las series sin volver
+        a consultar la base.
+        """
+        if self.movimientos is None or reload:
+            df = self.import_banco_invico()
+            df = df.loc[:, ['fecha', 'ejercicio', 'cta_cte', 'clase', 'importe']]
+            df['fecha'] = pd.to_datetime(df['fecha'])
+            df['ingreso'] = df['importe'].clip(lower=0)
+            df['egreso'] = -df['importe'].clip(upper=0)
+            df = df.set_index('fecha').sort_index(kind='stable')
+            self.movimientos = df
+        return self.movimientos
+
+    # --------------------------------------------------
+    def flujo_caja_series(
+        self, freq:str = 'D', groupby_cols:List[str] = ['clase', 'cta_cte'],
+        window:int = None
+    ) -> pd.DataFrame:
+        """
+        Ingresos, egresos y neto por período (freq: 'D' diario, 'W' semanal,
+        'ME' mensual) para cada combinación de groupby_cols, con el neto
+        acumulado desde el primer movimiento importado (no es el saldo
+        bancario: no incluye el saldo previo al primer ejercicio) y, si se
+        indica window, el neto móvil de los últimos window períodos. Los
+        períodos sin movimientos se completan con cero.
+        """
+        df = self.import_movimientos()
+        df = df.groupby(
+            groupby_cols + [pd.Grouper(level='fecha', freq=freq)], observed=True
+        )[['ingreso', 'egreso', 'importe']].sum()
+        df = df.rename(columns={'importe': 'neto'})
+        # Cada combinación de groupby_cols recorre todos los períodos entre
+        # el primero y el último (los vacíos en cero), para que cumsum y
+        # rolling cuenten períodos calendario y no sólo filas con movimientos
+        if not df.empty:
+            fechas = df.index.get_level_values('fecha')
+            periodos = pd.date_range(fechas.min(), fechas.max(), freq=freq)
+            combos = df.index.droplevel('fecha').unique().to_frame(index=False)
+            full = combos.loc[combos.index.repeat(len(periodos))]
+            full['fecha'] = np.tile(periodos, len(combos))
+            df = df.reindex(pd.MultiIndex.from_frame(full), fill_value=0)
+        df['neto_acumulado'] = df.groupby(level=groupby_cols)['neto'].cumsum()
+        if window is not None:
+            df['neto_movil'] = df.groupby(level=groupby_cols)['neto'].transform(
+                lambda x: x.rolling(window, min_periods=1).sum()
+            )
+        df = df.reset_index()
+        return df
 
     # # --------------------------------------------------
     # def control_mes_grupo(self):
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Punto de entrada único de línea de comandos. Construye los controles
+    seleccionados sobre una DataSession compartida (cada tabla SQLite se lee
+    una sola vez), los ejecuta en paralelo y guarda un Excel por control y
+    ejercicio en la carpeta de salida.
+
+Ejemplo:
+    invicoctrlpy run retenciones honorarios banco --ejercicio 2024 2025 -j 8
+    invicoctrlpy profile retenciones --ejercicio 2024
+    invicoctrlpy serve --port 8765 (ver invicoctrlpy.service)
+"""
+
+import argparse
+import datetime as dt
+import importlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from invicoctrlpy.utils.copy_on_write import copy_on_write
+from invicoctrlpy.utils.instrumentation import (JsonLinesSink, MemorySink,
+                                                instrument_class, recording,
+                                                span)
+from invicoctrlpy.utils.hangling_path import HanglingPath
+from invicoctrlpy.utils.partitions import PARTITIONS, memory_budget
+from invicoctrlpy.utils.result_store import ResultStore
+from invicoctrlpy.utils.session import DataSession
+from invicoctrlpy.utils.snapshots import SnapshotStore
+from invicoctrlpy.utils.sql_engine import SqlEngine
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class Report():
+    """
+    Control ejecutable desde la línea de comandos. La clase se importa recién
+    al correr el control; per_year indica que la clase recibe un único
+    ejercicio (str) en lugar de una lista.
+    """
+    module:str
+    class_name:str
+    tables:Dict[str, Callable]
+    per_year:bool = False
+
+    # --------------------------------------------------
+    def load(self) -> type:
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+    # --------------------------------------------------
+    def build(self, ejercicio, db_path:str = None):
+        return self.load()(ejercicio=ejercicio, db_path=db_path)
+
+    # --------------------------------------------------
+    def run(self, ejercicio, db_path:str = None) -> Dict[str, pd.DataFrame]:
+        control = self.build(ejercicio, db_path=db_path)
+        return {sheet: table(control) for sheet, table in self.tables.items()}
+
+
+REPORTS:Dict[str, Report] = {
+    'retenciones': Report(
+        'invicoctrlpy.gastos.control_retenciones.control_retenciones',
+        'ControlRetenciones', {
+            'icaro_vs_siif': lambda c: c.icaro_vs_siif(),
+            'sgf_vs_sscc': lambda c: c.sgf_vs_sscc(),
+            'icaro_vs_sgf': lambda c: c.icaro_vs_sgf(),
+            'icaro_vs_sscc': lambda c: c.icaro_vs_sscc(),
+        }
+    ),
+    'honorarios': Report(
+        'invicoctrlpy.gastos.control_honorarios.control_honorarios',
+        'ControlHonorarios', {
+            'siif_vs_slave': lambda c: c.siif_vs_slave(),
+            'slave_vs_sgf': lambda c: c.slave_vs_sgf(),
+        }
+    ),
+    'escribanos': Report(
+        'invicoctrlpy.gastos.control_escribanos.control_escribanos',
+        'ControlEscribanos', {
+            'sgf_vs_sscc': lambda c: c.sgf_vs_sscc(),
+            'siif_vs_sgf': lambda c: c.siif_vs_sgf(),
+        }
+    ),
+    'debitos_bancarios': Report(
+        'invicoctrlpy.gastos.control_debitos_bancarios.control_debitos_bancarios',
+        'ControlDebitosBancarios', {
+            'siif_vs_sscc': lambda c: c.siif_vs_sscc(),
+        }
+    ),
+    'banco': Report(
+        'invicoctrlpy.contabilidad.banco.control_banco_siif',
+        'ControlBanco', {
+            'sldo_final_vs_acum': lambda c: c.banco_invico_sldo_final_vs_acum(),
+            'siif_vs_invico_sldo_final': lambda c: c.banco_siif_vs_invico_sldo_final(),
+            'siif_vs_invico_ajustes': lambda c: c.banco_siif_vs_invico_ajustes(),
+        }
+    ),
+    'pasivo': Report(
+        'invicoctrlpy.contabilidad.pasivo.control_pasivo_siif',
+        'ControlPasivo', {
+            'recursos': lambda c: c.control_recursos_siif(),
+            'obras': lambda c: c.control_obras_siif(),
+            'haberes': lambda c: c.control_haberes_siif(),
+            'honorarios': lambda c: c.control_honorarios_siif(),
+            'debitos_bancarios': lambda c: c.control_debitos_bancarios_siif(),
+            'escribanos': lambda c: c.control_escribanos_siif(),
+        }
+    ),
+    'haberes': Report(
+        'invicoctrlpy.gastos.control_haberes.control_haberes',
+        'ControlHaberes', {
+            'control_cruzado': lambda c: c.control_cruzado(),
+        }, per_year=True
+    ),
+    'recursos': Report(
+        'invicoctrlpy.recursos.control_recursos.control_recursos',
+        'ControlRecursos', {
+            'control_recursos': lambda c: c.control_recursos(),
+            'control_mes_grupo': lambda c: c.control_mes_grupo(),
+        }, per_year=True
+    ),
+    'obras': Report(
+        'invicoctrlpy.gastos.control_obras.control_obras',
+        'ControlObras', {
+            'control_completo': lambda c: c.control_completo(),
+        }, per_year=True
+    ),
+    'icaro_vs_siif': Report(
+        'invicoctrlpy.icaro.icaro_vs_siif.icaro_vs_siif',
+        'IcaroVsSIIF', {
+            'ejecucion_anual': lambda c: c.control_ejecucion_anual(),
+            'comprobantes': lambda c: c.control_comprobantes(),
+            'pa6': lambda c: c.control_pa6(),
+        }, per_year=True
+    ),
+    'remanente': Report(
+        'invicoctrlpy.remanente.remanente',
+        'Remanente', {
+            'HojaTrabajoFdoProv': lambda c: c.hoja_trabajo(),
+            'RemMet1': lambda c: c.remanente_met_1(),
+            'RemMet2': lambda c: c.remanente_met_2(),
+            'RemDifMet': lambda c: c.remanente_dif_met(),
+            'Rdeu': lambda c: c.deuda_flotante(),
+        }, per_year=True
+    ),
+    'sgf_vs_sscc': Report(
+        'invicoctrlpy.gastos.sgf_vs_sscc.sgf_vs_sscc',
+        'SGFVsSSCC', {
+            'mes_cta_cte': lambda c: c.control_mes_cta_cte(),
+        }, per_year=True
+    ),
+}
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class Task():
+    report:str
+    ejercicio:tuple
+
+    # --------------------------------------------------
+    @property
+    def label(self) -> str:
+        return f"{self.report} {'-'.join(self.ejercicio)}"
+
+
+# --------------------------------------------------
+def build_tasks(reports:List[str], ejercicios:List[str]) -> List[Task]:
+    """Un task por control (o por control y ejercicio si es per_year)"""
+    tasks = []
+    for name in reports:
+        if REPORTS[name].per_year:
+            tasks.extend(Task(name, (ejercicio,)) for ejercicio in ejercicios)
+        else:
+            tasks.append(Task(name, tuple(ejercicios)))
+    return tasks
+
+
+# --------------------------------------------------
+def run_task(task:Task, db_path:str = None) -> Dict[str, pd.DataFrame]:
+    report = REPORTS[task.report]
+    ejercicio = task.ejercicio[0] if report.per_year else list(task.ejercicio)
+    return report.run(ejercicio, db_path=db_path)
+
+
+# --------------------------------------------------
+def write_results(
+    task:Task, results:Dict[str, pd.DataFrame], output_path:str
+) -> str:
+    file_name = os.path.join(output_path, task.label + '.xlsx')
+    with pd.ExcelWriter(file_name) as writer:
+        for sheet, df in results.items():
+            df.to_excel(writer, sheet_name=sheet[:31], index=False)
+    return file_name
+
+
+# --------------------------------------------------
+def save_snapshots(
+    snapshots:SnapshotStore, task:Task, results:Dict[str, pd.DataFrame]
+):
+    for sheet, df in results.items():
+        snapshots.save(
+            f'{task.report}.{sheet}', df, params={'ejercicio': list(task.ejercicio)}
+        )
+
+
+# --------------------------------------------------
+def diff_report(
+    report:str, ejercicios:List[str], db_path:str = None,
+    output_path:str = None
+) -> pd.DataFrame:
+    """
+    Compara la última corrida guardada con run --snapshot de cada hoja del
+    control con la anterior. Devuelve el resumen por hoja y, si se indica
+    output_path, guarda las filas nuevas, resueltas y modificadas en Excel.
+    """
+    snapshots = SnapshotStore(db_path or HanglingPath().get_db_path())
+    rows, deltas = [], {}
+    for task in build_tasks([report], ejercicios):
+        for sheet in REPORTS[report].tables:
+            name = f'{report}.{sheet}'
+            try:
+                diff = snapshots.diff(name, params={'ejercicio': list(task.ejercicio)})
+            except KeyError as e:
+                rows.append({'task': task.label, 'hoja': sheet, 'error': e.args[0]})
+                continue
+            rows.append({'task': task.label, 'hoja': sheet, **diff.summary()})
+            deltas[f'{sheet} {task.label}'] = diff.to_frame()
+    if output_path is not None and deltas:
+        os.makedirs(output_path, exist_ok=True)
+        file_name = os.path.join(output_path, f'{report} diferencias.xlsx')
+        with pd.ExcelWriter(file_name) as writer:
+            for sheet, df in deltas.items():
+                df.to_excel(writer, sheet_name=sheet[:31], index=False)
+    return pd.DataFrame(rows)
+
+
+# --------------------------------------------------
+def run_reports(
+    reports:List[str], ejercicios:List[str], output_path:str,
+    db_path:str = None, jobs:int = 1, sql_engine:str = None,
+    memory_budget_partition:str = None, result_store:bool = False,
+    snapshot:bool = False
+) -> Dict[str, str]:
+    """
+    Corre los controles en paralelo sobre una DataSession compartida.
+    sql_engine ('duckdb' o 'sqlite') activa el motor SQL embebido para los
+    controles que lo soportan (ver utils.sql_engine); memory_budget_partition
+    ('ejercicio' o 'mes') lee las tablas grandes por partes (ver
+    utils.partitions); result_store guarda los resultados en disco y los
+    reutiliza mientras no cambien las bases (ver utils.result_store);
+    snapshot guarda cada hoja como una corrida '<control>.<hoja>' para
+    compararla luego con diff_report (ver utils.snapshots). Devuelve {task: archivo generado o mensaje de error}.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    tasks = build_tasks(reports, ejercicios)
+    snapshots = SnapshotStore(db_path or HanglingPath().get_db_path()) if snapshot else None
+    status = {}
+    with ExitStack() as stack:
+        session = stack.enter_context(DataSession())
+        if sql_engine is not None:
+            stack.enter_context(SqlEngine(
+                db_path or HanglingPath().get_db_path(), backend=sql_engine
+            ))
+        if memory_budget_partition is not None:
+            stack.enter_context(memory_budget(memory_budget_partition))
+        if result_store:
+            stack.enter_context(ResultStore(db_path or HanglingPath().get_db_path()))
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+            futures = {
+                executor.submit(run_task, task, db_path): task for task in tasks
+            }
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    results = future.result()
+                    file_name = write_results(task, results, output_path)
+                    if snapshots is not None:
+                        save_snapshots(snapshots, task, results)
+                except Exception as e:
+                    status[task.label] = f'ERROR: {e!r}'
+                else:
+                    status[task.label] = file_name
+                print(f'{task.label}: {status[task.label]}')
+        print(
+            f'Tablas leídas: {session.misses} '
+            f'(reutilizadas {session.hits} veces)'
+        )
+    return status
+
+
+# --------------------------------------------------
+def profile_report(
+    report:str, ejercicios:List[str], db_path:str = None,
+    jsonl:str = None
+) -> pd.DataFrame:
+    """
+    Corre un control con todos sus métodos instrumentados y devuelve el
+    ranking por tiempo propio (ver utils.instrumentation)
+    """
+    instrument_class(REPORTS[report].load())
+    sink = MemorySink()
+    with ExitStack() as stack:
+        stack.enter_context(DataSession())
+        stack.enter_context(recording(sink))
+        if jsonl is not None:
+            stack.enter_context(recording(JsonLinesSink(jsonl)))
+        for task in build_tasks([report], ejercicios):
+            with span(task.label):
+                run_task(task, db_path)
+    return sink.report()
+
+
+# --------------------------------------------------
+def get_args(argv:List[str] = None):
+    """Get command-line arguments"""
+
+    parser = argparse.ArgumentParser(
+        prog='invicoctrlpy',
+        description="Controles de ejecución presupuestaria INVICO",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser(
+        'run', help='Correr uno o más controles y guardar sus resultados',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    run.add_argument(
+        "reports",
+        metavar="control",
+        nargs='+',
+        choices=sorted(REPORTS) + ['all'],
+        help="Controles a correr (all = todos): " + ", ".join(sorted(REPORTS)),
+    )
+    run.add_argument(
+        "-e", "--ejercicio",
+        metavar="ejercicio",
+        nargs='+',
+        default=[dt.datetime.now().year],
+        type=int,
+        choices=range(2010, dt.datetime.now().year + 1),
+        help="Ejercicios a controlar",
+    )
+    run.add_argument(
+        "-o", "--output",
+        metavar="output",
+        default=os.getcwd(),
+        type=str,
+        help="Carpeta donde se guardan los Excel de resultados",
+    )
+    run.add_argument(
+        "-d", "--db-path",
+        metavar="db_path",
+        default=None,
+        type=str,
+        help="Carpeta de las bases SQLite (por defecto, la del paquete)",
+    )
+    run.add_argument(
+        "-j", "--jobs",
+        metavar="jobs",
+        default=os.cpu_count() or 1,
+        type=int,
+        help="Cantidad de controles a correr en paralelo",
+    )
+    run.add_argument(
+        "--sql-engine",
+        choices=['duckdb', 'sqlite'],
+        default=None,
+        help="Cruces y agregaciones en un motor SQL embebido sobre las bases SQLite",
+    )
+    run.add_argument(
+        "--memory-budget",
+        choices=PARTITIONS,
+        default=None,
+        help="Leer el mayor contable y el banco por ejercicio o por mes (menos memoria)",
+    )
+    run.add_argument(
+        "--result-store",
+        action="store_true",
+        help="Reutilizar resultados guardados en disco si las bases no cambiaron",
+    )
+    run.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Guardar cada resultado como una corrida para compararla con diff",
+    )
+
+    diff = subparsers.add_parser(
+        'diff', help='Comparar la última corrida de un control con la anterior',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    diff.add_argument(
+        "report",
+        metavar="control",
+        choices=sorted(REPORTS),
+        help="Control a comparar: " + ", ".join(sorted(REPORTS)),
+    )
+    diff.add_argument(
+        "-e", "--ejercicio",
+        metavar="ejercicio",
+        nargs='+',
+        default=[dt.datetime.now().year],
+        type=int,
+        choices=range(2010, dt.datetime.now().year + 1),
+        help="Ejercicios a comparar",
+    )
+    diff.add_argument(
+        "-d", "--db-path",
+        metavar="db_path",
+        default=None,
+        type=str,
+        help="Carpeta de las bases SQLite (por defecto, la del paquete)",
+    )
+    diff.add_argument(
+        "-o", "--output",
+        metavar="output",
+        default=None,
+        type=str,
+        help="Carpeta donde guardar el Excel con las diferencias",
+    )
+
+    profile = subparsers.add_parser(
+        'profile', help='Correr un control instrumentado y rankear sus métodos',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    profile.add_argument(
+        "report",
+        metavar="control",
+        choices=sorted(REPORTS),
+        help="Control a perfilar: " + ", ".join(sorted(REPORTS)),
+    )
+    profile.add_argument(
+        "-e", "--ejercicio",
+        metavar="ejercicio",
+        nargs='+',
+        default=[dt.datetime.now().year],
+        type=int,
+        choices=range(2010, dt.datetime.now().year + 1),
+        help="Ejercicios a controlar",
+    )
+    profile.add_argument(
+        "-d", "--db-path",
+        metavar="db_path",
+        default=None,
+        type=str,
+        help="Carpeta de las bases SQLite (por defecto, la del paquete)",
+    )
+    profile.add_argument(
+        "-n", "--top",
+        metavar="top",
+        default=25,
+        type=int,
+        help="Cantidad de métodos a mostrar",
+    )
+    profile.add_argument(
+        "--sort",
+        metavar="sort",
+        default='self_time',
+        choices=['self_time', 'wall_time', 'calls', 'rows_out', 'rss_delta_kb'],
+        help="Columna por la que se ordena el ranking",
+    )
+    profile.add_argument(
+        "--jsonl",
+        metavar="jsonl",
+        default=None,
+        type=str,
+        help="Guardar además cada evento en este archivo JSON lines",
+    )
+
+    serve = subparsers.add_parser(
+        'serve', help='Servir los controles como JSON por HTTP (localhost)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    serve.add_argument(
+        "--host",
+        metavar="host",
+        default='127.0.0.1',
+        type=str,
+        help="Dirección en la que escucha el servicio",
+    )
+    serve.add_argument(
+        "-p", "--port",
+        metavar="port",
+        default=8765,
+        type=int,
+        help="Puerto del servicio",
+    )
+    serve.add_argument(
+        "-d", "--db-path",
+        metavar="db_path",
+        default=None,
+        type=str,
+        help="Carpeta de las bases SQLite (por defecto, la del paquete)",
+    )
+
+    return parser.parse_args(argv)
+
+
+# --------------------------------------------------
+def main(argv:List[str] = None):
+    """Entry point de la consola: invicoctrlpy run ..."""
+
+    args = get_args(argv)
+    # Los controles asumen copy-on-write (ver utils/copy_on_write.py)
+    with copy_on_write():
+        return run_command(args)
+
+
+# --------------------------------------------------
+def run_command(args:argparse.Namespace) -> int:
+    """Ejecuta el subcomando de args; devuelve el código de salida"""
+    if args.command == 'run':
+        reports = sorted(REPORTS) if 'all' in args.reports else args.reports
+        ejercicios = [str(ejercicio) for ejercicio in sorted(set(args.ejercicio))]
+        start = time.perf_counter()
+        status = run_reports(
+            reports, ejercicios, args.output,
+            db_path=args.db_path, jobs=args.jobs, sql_engine=args.sql_engine,
+            memory_budget_partition=args.memory_budget,
+            result_store=args.result_store, snapshot=args.snapshot
+        )
+        print(f'Tiempo total: {time.perf_counter() - start:.1f} s')
+        if any(value.startswith('ERROR') for value in status.values()):
+            return 1
+    elif args.command == 'profile':
+        ejercicios = [str(ejercicio) for ejercicio in sorted(set(args.ejercicio))]
+        df = profile_report(
+            args.report, ejercicios, db_path=args.db_path, jsonl=args.jsonl
+        )
+        if not df.empty:
+            df = df.sort_values(by=args.sort, ascending=False)
+        with pd.option_context('display.width', 200, 'display.max_colwidth', 60):
+            print(df.head(args.top).to_string(index=False, float_format='{:.3f}'.format))
+    elif args.command == 'diff':
+        ejercicios = [str(ejercicio) for ejercicio in sorted(set(args.ejercicio))]
+        df = diff_report(
+            args.report, ejercicios, db_path=args.db_path, output_path=args.output
+        )
+        print(df.to_string(index=False))
+    elif args.command == 'serve':
+        from invicoctrlpy.service import serve
+        serve(host=args.host, port=args.port, db_path=args.db_path)
+    return 0
+
+
+# --------------------------------------------------
+if __name__ == "__main__":
+    raise SystemExit(main())
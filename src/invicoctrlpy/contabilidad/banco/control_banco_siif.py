@@ -21,13 +21,14 @@ from typing import List
 import pandas as pd
 import numpy as np
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.periods import mes_to_periodo
 from invicoctrlpy.recursos.control_recursos.control_recursos import ControlRecursos
 from invicoctrlpy.gastos.control_obras.control_obras import ControlObras
 from invicoctrlpy.gastos.control_haberes.control_haberes import ControlHaberes
 from invicoctrlpy.gastos.control_honorarios.control_honorarios import ControlHonorarios
 from invicoctrlpy.gastos.control_debitos_bancarios.control_debitos_bancarios import ControlDebitosBancarios
 from invicoctrlpy.gastos.control_escribanos.control_escribanos import ControlEscribanos
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
@@ -126,6 +127,8 @@ class ControlBanco(ImportDataFrame):
         update_sscc.update_ctas_ctes()
         update_sscc.update_sdo_final_banco_invico()
         update_sscc.update_banco_invico()
+        self.import_ctas_ctes()
+        self.update_banco_invico_saldo_mensual()
 
     # --------------------------------------------------
     def import_dfs(self):
@@ -139,12 +142,15 @@ class ControlBanco(ImportDataFrame):
         Returns:
             None
         """
-        self.control_recursos = ControlRecursos(ejercicio=self.ejercicio, update_db=self.update_db)
-        self.control_obras = ControlObras(ejercicio=self.ejercicio, update_db=self.update_db)
-        self.control_haberes = ControlHaberes(ejercicio=self.ejercicio, update_db=self.update_db)
-        self.control_honorarios = ControlHonorarios(ejercicio=self.ejercicio, update_db=self.update_db)
-        self.control_debitos_bancarios = ControlDebitosBancarios(ejercicio=self.ejercicio, update_db=self.update_db)
-        self.control_escribanos = ControlEscribanos(ejercicio=self.ejercicio, update_db=self.update_db)
+        # Los controles auxiliares leen las mismas bases (ControlRecursos no
+        # actualiza bases, por eso no recibe update_db)
+        paths = dict(input_path=self.input_path, db_path=self.db_path)
+        self.control_recursos = ControlRecursos(ejercicio=self.ejercicio, **paths)
+        self.control_obras = ControlObras(ejercicio=self.ejercicio, update_db=self.update_db, **paths)
+        self.control_haberes = ControlHaberes(ejercicio=self.ejercicio, update_db=self.update_db, **paths)
+        self.control_honorarios = ControlHonorarios(ejercicio=self.ejercicio, update_db=self.update_db, **paths)
+        self.control_debitos_bancarios = ControlDebitosBancarios(ejercicio=self.ejercicio, update_db=self.update_db, **paths)
+        self.control_escribanos = ControlEscribanos(ejercicio=self.ejercicio, update_db=self.update_db, **paths)
         self.import_ctas_ctes()
 
     # --------------------------------------------------
@@ -170,7 +176,7 @@ class ControlBanco(ImportDataFrame):
         self, groupby_cols:List[str] = ['ejercicio', 'mes', 'cta_cte']
     ) -> pd.DataFrame:
 
-        banco_siif = self.banco_siif().copy()
+        banco_siif = self.banco_siif()
         banco_siif = banco_siif.groupby(groupby_cols).sum(numeric_only=True)
         banco_siif = banco_siif.reset_index()
         df = banco_siif
@@ -234,20 +240,38 @@ class ControlBanco(ImportDataFrame):
     def banco_invico_saldo_acum(
         self, groupby_cols:List[str] = ['ejercicio', 'mes', 'cta_cte']
     ) -> pd.DataFrame:
-        df = super().import_banco_invico(ejercicio=None)
-        df = df.loc[df['ejercicio'].astype(int) <= int(self.ejercicio[-1])]
-        df = df.sort_values(by=['fecha'], ascending=True)
-        df['saldo'] = df.groupby('cta_cte')['importe'].cumsum()
-        df = df.loc[:,groupby_cols + ['saldo']]
-        df = df.fillna(0)
+        # Saldos de cierre mensuales persistidos (ver update_banco_invico_saldo_mensual)
+        df = self.import_banco_invico_saldo_mensual(ejercicio_to=self.ejercicio[-1])
+        df = df.assign(periodo=mes_to_periodo(df['mes']))
+        df = df.sort_values(by=['periodo'], ascending=True, kind='stable')
+        df = df.loc[:, groupby_cols + ['saldo']]
         df = df.groupby(groupby_cols).last().reset_index()
+        return df
 
-        # df = df.drop('importe', axis=1)
-        # if isinstance(self.ejercicio, list):
-        #     df = df.loc[df['ejercicio'].isin(self.ejercicio)]
-        # else:
-        #     df = df.loc[df['ejercicio'].isin([self.ejercicio])]
-        # df = df.reset_index(drop=True)
+    # --------------------------------------------------
+    def banco_invico_saldo_acum_ejercicio(self, ejercicio:str = None) -> pd.DataFrame:
+        """
+        Movimientos de ejercicio con su saldo acumulado por cta_cte. Parte del
+        saldo de cierre del último mes anterior al ejercicio, por lo que sólo
+        recorre los movimientos del año.
+        """
+        if ejercicio is None:
+            ejercicio = self.ejercicio[-1]
+        saldo_inicial = self.import_banco_invico_saldo_mensual(
+            ejercicio_to=str(int(ejercicio) - 1)
+        )
+        saldo_inicial = saldo_inicial.assign(
+            periodo=mes_to_periodo(saldo_inicial['mes'])
+        )
+        saldo_inicial = saldo_inicial.sort_values(by=['periodo'], kind='stable')
+        saldo_inicial = saldo_inicial.groupby('cta_cte')['saldo'].last()
+        df = super().import_banco_invico(ejercicio=ejercicio)
+        df = df.sort_values(by=['fecha'], ascending=True)
+        df['saldo'] = (
+            df.groupby('cta_cte')['importe'].cumsum()
+            + df['cta_cte'].map(saldo_inicial).fillna(0)
+        )
+        df.reset_index(drop=True, inplace=True)
         return df
 
     # --------------------------------------------------
@@ -255,12 +279,12 @@ class ControlBanco(ImportDataFrame):
         self, groupby_cols:List[str] = ['ejercicio', 'cta_cte'],
         only_diff = False
     ) -> pd.DataFrame:
-        sldo_final = self.banco_invico_saldo_final().copy()
+        sldo_final = self.banco_invico_saldo_final()
         sldo_final = sldo_final.rename(columns={
             'saldo': 'sldo_final'
         })
         sldo_final = sldo_final.set_index(groupby_cols)
-        sldo_acum = self.banco_invico_saldo_acum(groupby_cols=groupby_cols).copy()
+        sldo_acum = self.banco_invico_saldo_acum(groupby_cols=groupby_cols)
         sldo_acum = sldo_acum.rename(columns={
             'saldo': 'sldo_acum'
         })
@@ -291,13 +315,13 @@ class ControlBanco(ImportDataFrame):
         self, groupby_cols:List[str] = ['ejercicio', 'cta_cte'],
         only_diff = False
     ) -> pd.DataFrame:
-        banco_invico = self.banco_invico_saldo_final().copy()
+        banco_invico = self.banco_invico_saldo_final()
         banco_invico = banco_invico.loc[:, groupby_cols + ['saldo']]
         banco_invico = banco_invico.rename(columns={
             'saldo': 'sldo_invico'
         })
         banco_invico = banco_invico.set_index(groupby_cols)
-        banco_siif = self.banco_siif_summarize(groupby_cols=groupby_cols).copy()
+        banco_siif = self.banco_siif_summarize(groupby_cols=groupby_cols)
         banco_siif = banco_siif.rename(columns={
             'saldo': 'sldo_siif'
         })
@@ -327,24 +351,24 @@ class ControlBanco(ImportDataFrame):
     def banco_siif_vs_invico_ajustes(
         self, incluir_pa6 = True, incluir_honorarios = True, incluir_escribanos = True
     ) -> pd.DataFrame:
-        df = self.banco_siif_vs_invico_sldo_final().copy()
+        df = self.banco_siif_vs_invico_sldo_final()
         df = df.loc[:, ['ejercicio','sldo_siif', 'sldo_invico', 'dif_sldo']]
         df = df.groupby(['ejercicio']).sum()
         df = df.reset_index()
-        recursos = self.control_recursos_siif().copy()
+        recursos = self.control_recursos_siif()
         recursos = recursos.loc[:, ['ejercicio', 'diferencia']]
         recursos = recursos.groupby(['ejercicio']).sum(numeric_only=True)
         recursos['diferencia'] = recursos['diferencia'] * -1
         recursos = recursos.rename(columns={'diferencia':'recursos_dif'})
-        obras = self.control_obras_siif().copy()
+        obras = self.control_obras_siif()
         obras = obras.loc[:, ['ejercicio', 'diferencia']]
         obras = obras.groupby(['ejercicio']).sum(numeric_only=True)
         obras = obras.rename(columns={'diferencia':'obras_dif'})
-        haberes = self.control_haberes_siif().copy()
+        haberes = self.control_haberes_siif()
         haberes = haberes.loc[:, ['ejercicio', 'diferencia']]
         haberes = haberes.groupby(['ejercicio']).sum(numeric_only=True)
         haberes = haberes.rename(columns={'diferencia':'haberes_dif'})
-        debitos_bancarios = self.control_debitos_bancarios_siif().copy()
+        debitos_bancarios = self.control_debitos_bancarios_siif()
         debitos_bancarios = debitos_bancarios.loc[:, ['ejercicio', 'diferencia']]
         debitos_bancarios = debitos_bancarios.groupby(['ejercicio']).sum(numeric_only=True)
         debitos_bancarios = debitos_bancarios.rename(columns={'diferencia':'debitos_banca_dif'})
@@ -355,21 +379,21 @@ class ControlBanco(ImportDataFrame):
         df = df.merge(haberes, how='left', on='ejercicio', copy=False)
         df = df.merge(debitos_bancarios, how='left', on='ejercicio', copy=False)
         if incluir_pa6:
-            pa6 = self.pa6_siif().copy()
+            pa6 = self.pa6_siif()
             pa6 = pa6.loc[:, ['ejercicio', 'egresos']]
             pa6 = pa6.groupby(['ejercicio']).sum(numeric_only=True)
             pa6 = pa6.rename(columns={'egresos':'pa6_reg'})
             df = df.merge(pa6, how='left', on='ejercicio', copy=False)
 
         if incluir_honorarios:
-            honorarios = self.control_honorarios_siif().copy()
+            honorarios = self.control_honorarios_siif()
             honorarios = honorarios.loc[:, ['ejercicio', 'importe_bruto']]
             honorarios = honorarios.groupby(['ejercicio']).sum(numeric_only=True)
             honorarios = honorarios.rename(columns={'importe_bruto':'honorarios_dif'})
             df = df.merge(honorarios, how='left', on='ejercicio', copy=False)
 
         if incluir_escribanos:
-            escribanos = self.control_escribanos_siif().copy()
+            escribanos = self.control_escribanos_siif()
             escribanos = escribanos.loc[:, ['ejercicio', 'dif_pagos']]
             escribanos = escribanos.groupby(['ejercicio']).sum(numeric_only=True)
             escribanos = escribanos.rename(columns={'dif_pagos':'escribanos_dif'})
@@ -14,11 +14,26 @@ Data required:
 __all__ = ['BancoSSCCVsSIIF']
 
 from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
 
 import datetime as dt
 import pandas as pd
 from invicoctrlpy.utils import handle_path
+from invicoctrlpy.utils.copy_on_write import lazy_copy
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.partitions import align_partitions
+
+# Retenciones a Pagar en SIIF y su imputación en el SSCC
+CTA_CONTABLE_BANCO = '1112-2-6'
+CTA_CONTABLE_RETENCIONES = '2122-1-2'
+TIPOS_COMPROBANTE_PAGO = ['CAP', 'ANP', 'CAD']
+COD_IMPUTACION_RETENCIONES = '034'
+# Código de retención SIIF (auxiliar_1 de 2122-1-2) -> tipo de retención
+TIPOS_RETENCION = {
+    '110': 'iibb', '111': 'sellos', '112': 'lp',
+    '113': 'gcias', '114': 'suss', '337': 'invico',
+}
+TIPO_RETENCION_OTRAS = 'otras'
 
 # --------------------------------------------------
 @dataclass
@@ -28,6 +43,7 @@ class BancoSSCCVsSIIF():
     siif:pd.DataFrame = field(default_factory=pd.DataFrame, init=False)
     sscc:pd.DataFrame = field(default_factory=pd.DataFrame, init=False)
     sscc_imputacion:pd.DataFrame = field(default_factory=pd.DataFrame, init=False)
+    ctas_ctes_map:dict = field(default=None, init=False, repr=False)
 
     # --------------------------------------------------
     def __post_init__(self):
@@ -44,17 +60,20 @@ class BancoSSCCVsSIIF():
         import_df.db_path = self.db_path
         return import_df
 
+    # --------------------------------------------------
+    def sorted_ejercicios(self) -> List[str]:
+        return sorted([str(ejercicio) for ejercicio in self.ejercicios], key=lambda x: int(x))
+
     # --------------------------------------------------
     def banco_sscc_con_tipo_imputacion(self) -> pd.DataFrame:
-        ejercicios = sorted([str(ejercicio) for ejercicio in self.ejercicios], key=lambda x: int(x))
+        ejercicios = self.sorted_ejercicios()
         import_df = self.set_import_df_db_path()
         import_df.import_ctas_ctes()
-        self.sscc_imputacion = import_df.import_sscc_listado_imputaciones()
+        dim_imputacion = import_df.dimension('sscc_imputaciones')
+        # Copia: la tabla de la dimensión se comparte en todo el proceso
+        self.sscc_imputacion = lazy_copy(dim_imputacion.table)
         self.sscc = import_df.import_banco_invico(ejercicio=ejercicios)
-        self.sscc = self.sscc.merge(
-            self.sscc_imputacion.loc[:, ['cod_imputacion', 'tipo']],
-            on=['cod_imputacion'], how='left'
-        )
+        self.sscc = dim_imputacion.lookup(self.sscc, on='cod_imputacion', columns=['tipo'])
         return self.sscc
 
     # --------------------------------------------------
@@ -67,12 +86,123 @@ class BancoSSCCVsSIIF():
         return self.siif
 
     # --------------------------------------------------
-    def pago_retenciones_siif(self) -> pd.DataFrame:
-        pass
+    def siif_cta_cte_map(self) -> dict:
+        if self.ctas_ctes_map is None:
+            import_df = self.set_import_df_db_path()
+            ctas_ctes = import_df.import_ctas_ctes()
+            self.ctas_ctes_map = dict(
+                zip(ctas_ctes['siif_contabilidad_cta_cte'], ctas_ctes['map_to'])
+            )
+        return self.ctas_ctes_map
+
+    # --------------------------------------------------
+    def iter_ejercicios(self) -> Iterator[Tuple[str, pd.DataFrame, pd.DataFrame]]:
+        """
+        Recorre los ejercicios de a uno, devolviendo (ejercicio, siif, sscc)
+        con los asientos SIIF de Banco y Retenciones a Pagar y los débitos
+        SSCC de ese año. Las tablas de origen se reducen a las filas
+        relevantes apenas se leen y cada año se procesa y descarta antes de
+        pasar al siguiente.
+        """
+        ejercicios = self.sorted_ejercicios()
+        import_df = self.set_import_df_db_path()
+        import_df.import_ctas_ctes()
+
+        # Dentro de memory_budget() cada año se lee por separado del SQLite
+        for ejercicio, siif_ejercicio, sscc_ejercicio in align_partitions(
+            ejercicios,
+            import_df.iter_siif_rcocc31(ejercicio=ejercicios, partition='ejercicio'),
+            import_df.iter_banco_invico(ejercicio=ejercicios, partition='ejercicio')
+        ):
+            if siif_ejercicio is not None:
+                siif_ejercicio = siif_ejercicio.loc[siif_ejercicio['cta_contable'].isin(
+                    [CTA_CONTABLE_BANCO, CTA_CONTABLE_RETENCIONES]
+                )]
+            if sscc_ejercicio is not None:
+                sscc_ejercicio = sscc_ejercicio.loc[sscc_ejercicio['movimiento'] != 'DEPOSITO']
+            if siif_ejercicio is None:
+                siif_ejercicio = pd.DataFrame(columns=['ejercicio', 'mes', 'nro_entrada',
+                    'cta_contable', 'tipo_comprobante', 'debitos', 'auxiliar_1'])
+            if sscc_ejercicio is None:
+                sscc_ejercicio = pd.DataFrame(columns=['ejercicio', 'mes', 'cta_cte',
+                    'cod_imputacion', 'importe'])
+            yield ejercicio, siif_ejercicio, sscc_ejercicio
+
+    # --------------------------------------------------
+    def pago_retenciones_siif(self, siif:pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Pagos de retenciones registrados en el mayor de Banco SIIF: débitos
+        de Retenciones a Pagar (CAP, ANP, CAD) con la cuenta bancaria del
+        mismo asiento. Si no se indica siif se procesan todos los ejercicios.
+        """
+        if siif is None:
+            return pd.concat(
+                [self.pago_retenciones_siif(siif) for _, siif, _ in self.iter_ejercicios()],
+                ignore_index=True
+            )
+        banco = siif.loc[siif['cta_contable'] == CTA_CONTABLE_BANCO, ['nro_entrada', 'auxiliar_1']]
+        banco = banco.drop_duplicates(subset=['nro_entrada'])
+        banco = banco.rename(columns={'auxiliar_1': 'cta_cte'})
+        df = siif.loc[
+            (siif['cta_contable'] == CTA_CONTABLE_RETENCIONES)
+            & (siif['tipo_comprobante'].isin(TIPOS_COMPROBANTE_PAGO)),
+            ['ejercicio', 'mes', 'nro_entrada', 'tipo_comprobante', 'debitos', 'auxiliar_1']
+        ]
+        df = df.rename(columns={'debitos': 'importe', 'auxiliar_1': 'cod_ret'})
+        df['tipo_retencion'] = df['cod_ret'].map(TIPOS_RETENCION).fillna(TIPO_RETENCION_OTRAS)
+        df = df.merge(banco, how='left', on='nro_entrada')
+        df['cta_cte'] = df['cta_cte'].map(self.siif_cta_cte_map()).fillna(df['cta_cte'])
+        df.reset_index(drop=True, inplace=True)
+        return df
+
+    # --------------------------------------------------
+    @staticmethod
+    def sum_by(
+        df:pd.DataFrame, groupby_cols:List[str], col:str, prefix:str
+    ) -> pd.DataFrame:
+        """Importe por groupby_cols, con una columna por valor de col"""
+        df = df.groupby(groupby_cols + [col])['importe'].sum().unstack(col, fill_value=0)
+        df.columns = [prefix + str(value) for value in df.columns]
+        return df
 
     # --------------------------------------------------
-    def retenciones_siif_vs_sscc(self) -> pd.DataFrame:
-        pass
+    def retenciones_siif_vs_sscc(
+        self, groupby_cols:List[str] = ['ejercicio'],
+        cods_imputacion:List[str] = [COD_IMPUTACION_RETENCIONES],
+        only_diff = False
+    ) -> pd.DataFrame:
+        """
+        Compara, ejercicio por ejercicio, los pagos de retenciones SIIF con
+        los débitos SSCC imputados a cods_imputacion, agrupados por
+        groupby_cols. Cada lado se abre según su propia clasificación: SIIF
+        por tipo de retención (auxiliar_1 de 2122-1-2, columnas siif_*) y
+        SSCC por código de imputación (columnas sscc_*). Como el SSCC no
+        distingue el tipo de retención, la diferencia se calcula sobre los
+        totales de cada grupo.
+        """
+        resumenes = []
+        for ejercicio, siif, sscc in self.iter_ejercicios():
+            siif = self.sum_by(
+                self.pago_retenciones_siif(siif), groupby_cols, 'tipo_retencion', 'siif_'
+            )
+            sscc = sscc.loc[sscc['cod_imputacion'].isin(cods_imputacion)]
+            # Los débitos del SSCC tienen importe negativo
+            sscc = sscc.assign(importe=sscc['importe'] * -1)
+            sscc = self.sum_by(sscc, groupby_cols, 'cod_imputacion', 'sscc_')
+            resumenes.append(pd.concat([siif, sscc], axis=1).reset_index())
+        df = pd.concat(resumenes, ignore_index=True)
+        siif_cols = sorted(col for col in df.columns if col.startswith('siif_'))
+        sscc_cols = sorted(col for col in df.columns if col.startswith('sscc_'))
+        df[siif_cols + sscc_cols] = df[siif_cols + sscc_cols].fillna(0)
+        df['retenciones_siif'] = df[siif_cols].sum(axis=1)
+        df['debitos_sscc'] = df[sscc_cols].sum(axis=1)
+        df['diferencia'] = df['retenciones_siif'] - df['debitos_sscc']
+        df = df.loc[:, groupby_cols + siif_cols + ['retenciones_siif']
+                    + sscc_cols + ['debitos_sscc', 'diferencia']]
+        if only_diff:
+            df = df.loc[df['diferencia'].abs() > 0.1]
+            df = df.reset_index(drop=True)
+        return df
 
 # --------------------------------------------------
 if __name__ == '__main__':
@@ -81,5 +211,6 @@ if __name__ == '__main__':
     siif_vs_sscc.banco_sscc_con_tipo_imputacion()
     siif_vs_sscc.banco_siif()
     print(siif_vs_sscc.sscc)
+    print(siif_vs_sscc.retenciones_siif_vs_sscc())
 
 # python -m invicoctrlpy.contabilidad.banco.sscc_vs_siif
\ No newline at end of file
@@ -18,6 +18,7 @@ import pandas as pd
 from dataclasses import dataclass, field
 
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.periods import mes_to_periodo
 from invicoctrlpy.utils import handle_path
 
 
@@ -41,13 +42,9 @@ class ControlDeudaFlotante():
     # --------------------------------------------------
     def import_siif_last_rdeu012(self, ejercicio:str = None):
         df = self.import_df.import_siif_rdeu012()
-        df = df.loc[df['mes_hasta'].str.endswith(ejercicio), :]
-        months = df['mes_hasta'].tolist()
-        # Convertir cada elemento de la lista a un objeto datetime
-        dates = [dt.datetime.strptime(month, '%m/%Y') for month in months]
-        # Obtener la fecha más reciente y Convertir la fecha mayor a un string en el formato 'MM/YYYY'
-        gt_month = max(dates).strftime('%m/%Y')
-        df = df.loc[df['mes_hasta'] == gt_month, :]
+        periodo_hasta = mes_to_periodo(df['mes_hasta'])
+        periodo_hasta = periodo_hasta.loc[periodo_hasta // 100 == int(ejercicio)]
+        df = df.loc[periodo_hasta.index[periodo_hasta == periodo_hasta.max()], :]
         df = df.rename(
             columns={'nro_origen': 'nro_original', 'saldo': 'saldo_rdeu'},
         )
@@ -11,7 +11,7 @@ Packages:
  - invicoctrlpy (pip install -e '/home/kanou/IT/R Apps/R Gestion INVICO/invicoctrlpy')
 """
 
-__all__ = ["rdeu012_with_accounting"]
+__all__ = ["rdeu012_with_accounting", "rdeu012_with_accounting_batch"]
 
 import datetime as dt
 
@@ -19,7 +19,10 @@ import pandas as pd
 from pydantic import BaseModel, ConfigDict
 
 from invicoctrlpy.utils import handle_path
+from invicoctrlpy.utils.exclusions import apply_exclusions, keep_mask
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.periods import (last_periodo, mes_to_periodo,
+                                       periodo_to_ejercicio)
 
 
 # --------------------------------------------------
@@ -95,6 +98,76 @@ def rdeu012_with_accounting(
     return ctrl_rdeu
 
 
+# --------------------------------------------------
+def rdeu012_with_accounting_batch(
+    ejercicios: [str] = None, db_path: str = None
+) -> ControlDeudaFlotante:
+    """
+    Mismo resultado que rdeu012_with_accounting pero procesando todos los
+    ejercicios de una vez: rdeu012, rcocc31 y rvicon03 se leen una sola vez
+    y cada salida se arma con un único concat.
+    """
+    if not ejercicios:
+        ejercicios = str(dt.datetime.now().year)
+    if not isinstance(ejercicios, list):
+        ejercicios = [ejercicios]
+    if not db_path:
+        db_path = handle_path.get_db_path()
+    ejercicios = sorted(
+        [str(ejercicio) for ejercicio in ejercicios], key=lambda x: int(x)
+    )
+    ctrl_rdeu = ControlDeudaFlotante(ejercicios=ejercicios)
+    import_df = set_import_df_db_path(db_path=db_path)
+
+    # rdeu012: último mes_hasta de cada ejercicio
+    rdeu = import_siif_last_rdeu012_batch(ejercicios=ejercicios, import_df=import_df)
+    ctrl_rdeu.rdeu012 = rdeu
+
+    # rcocc31: una sola lectura para todos los ejercicios
+    rcocc31 = import_siif_rcocc31_liabilities(ejercicio=ejercicios, import_df=import_df)
+    rcocc31 = rcocc31_in_rdue012_batch(rdeu=rdeu, rcocc31=rcocc31)
+    ctrl_rdeu.rcocc31 = rcocc31
+
+    rdeu = rdeu.loc[
+        :,
+        [
+            "ejercicio_contable",
+            "ejercicio",
+            "fuente",
+            "cta_cte",
+            "nro_original",
+            "saldo_rdeu",
+            "cuit",
+            "glosa",
+            "nro_expte",
+        ],
+    ]
+    # En la versión iterativa cada ejercicio_contable sólo ve el rcocc31
+    # acumulado hasta ese año, por lo que las deudas de ejercicios
+    # posteriores quedan sin cruzar.
+    cruzable = rdeu["ejercicio"].astype(int) <= rdeu["ejercicio_contable"].astype(int)
+    rdeu_cruzado = rdeu.loc[cruzable].merge(
+        rcocc31, how="left", on=["ejercicio", "nro_original"]
+    )
+    aju = aju_not_in_rdue012_batch(
+        filter_rdeu=rdeu, rcocc31=rcocc31, ejercicios=ejercicios
+    )
+    df = pd.concat(
+        [
+            rdeu_cruzado.assign(_parte=0),
+            rdeu.loc[~cruzable].assign(_parte=0),
+            aju.assign(_parte=1),
+        ]
+    )
+    df = df.sort_values(by=["ejercicio_contable", "_parte"], kind="stable")
+    ctrl_rdeu.rdeu_cta_contable = df.drop(columns=["_parte"])
+
+    rvicon03 = import_df.import_siif_rvicon03(ejercicio=ejercicios)
+    ctrl_rdeu.rvicon03 = rvicon03.sort_values(by=["ejercicio"], kind="stable")
+
+    return ctrl_rdeu
+
+
 # --------------------------------------------------
 def set_import_df_db_path(db_path: str) -> ImportDataFrame:
     import_df = ImportDataFrame()
@@ -107,20 +180,39 @@ def import_siif_last_rdeu012(
     ejercicio: str, import_df: ImportDataFrame
 ) -> pd.DataFrame:
     df = import_df.import_siif_rdeu012()
-    df = df.loc[df["mes_hasta"].str.endswith(ejercicio), :]
-    months = df["mes_hasta"].tolist()
-    # Convertir cada elemento de la lista a un objeto datetime
-    dates = [dt.datetime.strptime(month, "%m/%Y") for month in months]
-    # Obtener la fecha más reciente y Convertir la fecha mayor a un string en el formato 'MM/YYYY'
-    gt_month = max(dates).strftime("%m/%Y")
-    df = df.loc[df["mes_hasta"] == gt_month, :]
+    periodo_hasta = mes_to_periodo(df["mes_hasta"])
+    periodo_hasta = periodo_hasta.loc[periodo_hasta // 100 == int(ejercicio)]
+    df = df.loc[periodo_hasta.index[periodo_hasta == periodo_hasta.max()], :]
+    df = df.rename(
+        columns={"nro_origen": "nro_original", "saldo": "saldo_rdeu"},
+    )
+    # Elimino comprobantes específicos (error en SIIF), ver utils/exclusiones.json
+    df = apply_exclusions(df, "siif_rdeu012")
+    return df
+
+
+# --------------------------------------------------
+def import_siif_last_rdeu012_batch(
+    ejercicios: list[str], import_df: ImportDataFrame
+) -> pd.DataFrame:
+    df = import_df.import_siif_rdeu012()
+    periodo_hasta = mes_to_periodo(df["mes_hasta"])
+    year = periodo_hasta // 100
+    periodo_hasta = periodo_hasta.loc[
+        year.isin([int(ejercicio) for ejercicio in ejercicios])
+    ]
+    last = last_periodo(periodo_hasta, by=periodo_hasta // 100)
+    periodo_hasta = periodo_hasta.loc[periodo_hasta == last]
+    df = df.loc[periodo_hasta.index, :]
     df = df.rename(
         columns={"nro_origen": "nro_original", "saldo": "saldo_rdeu"},
     )
-    # Elimino comprobantes específicos (error en SIIF)
-    df = df.loc[
-        ~df["nro_comprobante"].isin(["02749/11"])
-    ]  # No debería estar en la RDEU
+    # Elimino comprobantes específicos (error en SIIF), ver utils/exclusiones.json
+    df = apply_exclusions(df, "siif_rdeu012")
+    df.insert(
+        0, "ejercicio_contable", periodo_to_ejercicio(periodo_hasta.loc[df.index])
+    )
+    df = df.sort_values(by=["ejercicio_contable"], kind="stable")
     return df
 
 
@@ -147,6 +239,21 @@ def rcocc31_in_rdue012(
     return df
 
 
+# --------------------------------------------------
+def rcocc31_in_rdue012_batch(rdeu: pd.DataFrame, rcocc31: pd.DataFrame) -> pd.DataFrame:
+    # Comprobantes de cada ejercicio que figuran en la RDEU de ese mismo año
+    rdeu = rdeu.loc[rdeu["ejercicio"] == rdeu["ejercicio_contable"], :]
+    cyo = pd.MultiIndex.from_arrays(
+        [rdeu["ejercicio"], rdeu["nro_comprobante"].str[:-3].astype(int).astype(str)]
+    )
+    keys = pd.MultiIndex.from_arrays([rcocc31["ejercicio"], rcocc31["nro_original"]])
+    df = rcocc31.loc[keys.isin(cyo)]
+    aju = rcocc31.loc[rcocc31["tipo_comprobante"].isin(["AJU"])]
+    df = pd.concat([df.assign(_parte=0), aju.assign(_parte=1)])
+    df = df.sort_values(by=["ejercicio", "_parte"], kind="stable")
+    return df.drop(columns=["_parte"])
+
+
 # --------------------------------------------------
 def aju_not_in_rdue012(
     filter_rdeu: pd.DataFrame, rcocc31: pd.DataFrame, ejercicio: str
@@ -154,43 +261,15 @@ def aju_not_in_rdue012(
     aju = rcocc31.loc[rcocc31["tipo_comprobante"].isin(["AJU"])]
     aju["nro_comprobante"] = aju["nro_entrada"] + "/" + aju["ejercicio"].str[2:]
 
-    # Elimino Amortizaciones Acum. del Pasivo (cta. contable empieza con 2241)
-    aju = aju.loc[~aju["cta_contable"].str.startswith("2241")]
-
-    # Elimino Otros Fondos de Terceros a Pagar (cta. contable 2113-2-9)
-    aju = aju.loc[~aju["cta_contable"].isin(["2113-2-9"])]
-
-    # Elimino comprobantes específicos (error en SIIF)
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["16535/11"])
-    ]  # AJUSTE DE SUELDOS Y SALARIOS A PAGAR
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["15793/12"])
-    ]  # AJUSTES RETENCIONES. COMPROB.225/2012
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["17773/16"])
-    ]  # ERROR PAGO COMPROBANTE GTOS. 2749/2011
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["17096/13"])
-    ]  # REGISTROS PAGOS A.R.T. ENERO Y FEBRERO/2013
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["17097/13"])
-    ]  # PAGO COMPR. CAO 5413/13. MAP 5429/13. ERROR SISTEMA
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["19897/17"])
-    ]  # AJUSTES DE LOS DRI DEL AÑO 2017. DEVOLUCIÓN RETENCIÓN IMP. GCIAS. 245
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["15142/21"])
-    ]  # AJU SALIDA DE BANCO DEL DRI 497-10-09-2021
-    aju = aju.loc[
-        ~aju["nro_comprobante"].isin(["16986/24"])
-    ]  # DEV RET INDEBIDAS IIBB- DRI 1348.AJUSTE CTA OTROS ANTICIPOS.
+    # Elimino Amortizaciones Acum. del Pasivo, Otros Fondos de Terceros a
+    # Pagar y comprobantes específicos (error en SIIF), ver utils/exclusiones.json
+    aju = apply_exclusions(aju, "siif_rcocc31_aju")
 
     # Conservo los AJU con saldo mayor a 0.1 y el 16536/11
-    aju_keep = aju.loc[aju["nro_comprobante"].isin(["16536/11"])]
+    aju_keep = aju.loc[keep_mask(aju, "siif_rcocc31_aju")]
     # aju_keep = aju_keep.append(aju[aju['tipo_comprobante'] == 'DRI'])
     aju_keep = aju_keep.drop(columns=["nro_comprobante"])
-    filtered_aju = aju.groupby("nro_original").sum()["saldo_contable"]
+    filtered_aju = aju.groupby("nro_original")["saldo_contable"].sum()
     filtered_aju = filtered_aju[abs(filtered_aju) > 0.1]
     aju = aju.merge(
         filtered_aju.reset_index()["nro_original"], on="nro_original", how="right"
@@ -205,10 +284,60 @@ def aju_not_in_rdue012(
     return df
 
 
+# --------------------------------------------------
+def aju_not_in_rdue012_batch(
+    filter_rdeu: pd.DataFrame, rcocc31: pd.DataFrame, ejercicios: list[str]
+) -> pd.DataFrame:
+    aju = rcocc31.loc[rcocc31["tipo_comprobante"].isin(["AJU"])]
+    aju = aju.assign(
+        nro_comprobante=aju["nro_entrada"] + "/" + aju["ejercicio"].str[2:]
+    )
+    # Elimino Amortizaciones Acum. del Pasivo, Otros Fondos de Terceros a
+    # Pagar y comprobantes específicos (error en SIIF), ver utils/exclusiones.json
+    aju = apply_exclusions(aju, "siif_rcocc31_aju")
+    # Cada ejercicio_contable acumula los AJU de los ejercicios anteriores
+    aju = aju.merge(
+        pd.DataFrame({"ejercicio_contable": ejercicios}), how="cross"
+    )
+    aju = aju.loc[
+        aju["ejercicio"].astype(int) <= aju["ejercicio_contable"].astype(int)
+    ]
+
+    # Conservo los AJU con saldo mayor a 0.1 y el 16536/11
+    aju_keep = aju.loc[keep_mask(aju, "siif_rcocc31_aju")]
+    aju_keep = aju_keep.drop(columns=["nro_comprobante"])
+    filtered_aju = aju.groupby(["ejercicio_contable", "nro_original"])[
+        "saldo_contable"
+    ].sum()
+    filtered_aju = filtered_aju[abs(filtered_aju) > 0.1]
+    aju = aju.merge(
+        filtered_aju.reset_index()[["ejercicio_contable", "nro_original"]],
+        on=["ejercicio_contable", "nro_original"],
+        how="right",
+    )
+    aju = pd.concat([aju.assign(_parte=0), aju_keep.assign(_parte=1)], axis=0)
+    aju = aju.sort_values(by=["ejercicio_contable", "_parte"], kind="stable")
+    aju = aju.drop(columns=["_parte"])
+
+    columns = [
+        col
+        for col in filter_rdeu.columns
+        if col not in ["ejercicio", "nro_original", "ejercicio_contable"]
+    ]
+    df = aju.reindex(
+        columns=["ejercicio_contable"]
+        + [col for col in columns if col not in aju.columns]
+        + [col for col in aju.columns if col != "ejercicio_contable"]
+    )
+    df["fuente"] = "11"
+    df["saldo_rdeu"] = df["saldo_contable"] * (-1)
+    return df
+
+
 # --------------------------------------------------
 if __name__ == "__main__":
     ejercicios = [str(x) for x in range(2010, 2025)]
-    ctrl_rdeu = rdeu012_with_accounting(ejercicios=["2012"])
+    ctrl_rdeu = rdeu012_with_accounting_batch(ejercicios=ejercicios)
     print(ctrl_rdeu.rdeu_cta_contable)
 
 # python -m invicoctrlpy.contabilidad.deuda_flotante.control_deuda_flotante_fct
@@ -22,7 +22,7 @@ from invicoctrlpy.gastos.control_haberes.control_haberes import ControlHaberes
 from invicoctrlpy.gastos.control_honorarios.control_honorarios import ControlHonorarios
 from invicoctrlpy.gastos.control_debitos_bancarios.control_debitos_bancarios import ControlDebitosBancarios
 from invicoctrlpy.gastos.control_escribanos.control_escribanos import ControlEscribanos
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
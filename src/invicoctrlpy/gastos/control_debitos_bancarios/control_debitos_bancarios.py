@@ -20,7 +20,7 @@ from typing import List
 import pandas as pd
 import numpy as np
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
@@ -168,7 +168,7 @@ class ControlDebitosBancarios(ImportDataFrame):
             siif_summary = control.siif_summarize(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        siif = self.import_siif_debitos().copy()
+        siif = self.import_siif_debitos()
         siif = siif.groupby(groupby_cols).sum(numeric_only=True)
         siif = siif.reset_index()
         df = siif
@@ -212,7 +212,7 @@ class ControlDebitosBancarios(ImportDataFrame):
         provided groupby columns. The resulting DataFrame contains the summarized and
         filtered bank data for further analysis.
         """
-        df = self.import_banco_invico().copy()
+        df = self.import_banco_invico()
         df = df.drop(['es_cheque'], axis=1)
         df = df.groupby(groupby_cols).sum(numeric_only=True)
         df = df.reset_index()
@@ -249,10 +249,10 @@ class ControlDebitosBancarios(ImportDataFrame):
             result = control.siif_vs_sscc(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        siif = self.siif_summarize(groupby_cols=groupby_cols).copy()
+        siif = self.siif_summarize(groupby_cols=groupby_cols)
         siif = siif.rename(columns={'importe': 'ejecutado_siif'})
         siif = siif.set_index(groupby_cols)
-        sscc = self.sscc_summarize(groupby_cols=groupby_cols).copy()
+        sscc = self.sscc_summarize(groupby_cols=groupby_cols)
         sscc = sscc.rename(columns={'importe': 'debitos_sscc'})
         sscc = sscc.set_index(groupby_cols)
         # Obtener los índices faltantes en siif
@@ -21,7 +21,7 @@ from typing import List
 import pandas as pd
 import numpy as np
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
@@ -190,7 +190,7 @@ class ControlEscribanos(ImportDataFrame):
             siif_summary = control.siif_summarize(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        siif = self.import_siif_escribanos().copy()
+        siif = self.import_siif_escribanos()
         siif = siif.drop([
             'tipo_comprobante', 'fecha', 'fecha_aprobado', 'cta_contable',
             'auxiliar_2', 'saldo', 'nro_entrada'
@@ -240,7 +240,7 @@ class ControlEscribanos(ImportDataFrame):
         data based on the specified grouping columns. The resulting DataFrame contains the summary
         of renditions data related to the SGF for further analysis.
         """
-        df = self.import_resumen_rend_cuit().copy()
+        df = self.import_resumen_rend_cuit()
         df = df.drop(
             ['origen', 'fecha','destino', 'libramiento_sgf',
             'seguro', 'salud', 'mutual', 'otras', 'importe_bruto',
@@ -289,7 +289,7 @@ class ControlEscribanos(ImportDataFrame):
         provided groupby columns. The resulting DataFrame contains the summarized and
         filtered bank data for further analysis.
         """
-        df = self.import_banco_invico().copy()
+        df = self.import_banco_invico()
         filtrar = [
             '004', '034', '213', '102' 
         ]
@@ -334,9 +334,9 @@ class ControlEscribanos(ImportDataFrame):
             result = control.sgf_vs_sscc(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        sgf =  self.sgf_summarize(groupby_cols=groupby_cols).copy()
+        sgf =  self.sgf_summarize(groupby_cols=groupby_cols)
         sgf = sgf.set_index(groupby_cols)
-        sscc = self.sscc_summarize(groupby_cols=groupby_cols).copy()
+        sscc = self.sscc_summarize(groupby_cols=groupby_cols)
         sscc = sscc.set_index(groupby_cols)
         # Obtener los índices faltantes en sgf
         missing_indices = sscc.index.difference(sgf.index)
@@ -390,9 +390,9 @@ class ControlEscribanos(ImportDataFrame):
             result = control.siif_vs_sgf(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        siif = self.siif_summarize(groupby_cols=groupby_cols).copy()
+        siif = self.siif_summarize(groupby_cols=groupby_cols)
         siif = siif.set_index(groupby_cols)
-        sgf = self.sgf_summarize(groupby_cols=groupby_cols).copy()
+        sgf = self.sgf_summarize(groupby_cols=groupby_cols)
         sgf = sgf.rename(columns={'importe_neto': 'pagos_sgf'})
         sgf = sgf.set_index(groupby_cols)
         # Obtener los índices faltantes en siif
@@ -18,8 +18,10 @@ import datetime as dt
 from dataclasses import dataclass
 
 import pandas as pd
+from invicoctrlpy.utils.exclusions import apply_exclusions
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.sql_engine import active_engine
+from invicoctrlpy.utils.registry import update_db
 
 
 @dataclass
@@ -77,24 +79,31 @@ class ControlHaberes(ImportDataFrame):
 
     # --------------------------------------------------
     def import_banco_invico(self):
-        df = super().import_banco_invico(self.ejercicio)
+        df = super().import_banco_invico(self.ejercicio, clasificar=True)
         df = df.loc[df['movimiento'] != 'DEPOSITO']
         df = df.loc[df['cta_cte'] == '130832-04']
         keep = ['GCIAS', 'GANANCIAS']
         df = df.loc[~df.concepto.str.contains('|'.join(keep))]
         df['importe'] = df['importe'] * (-1)
-        dep_transf_int = ['034', '004']
-        dep_otros = ['003', '055', '005', '013']
-        df = df.loc[~df['cod_imputacion'].isin(
-            dep_transf_int + dep_otros
-            )]
+        # Transferencias internas, plazos fijos, etc. (ver utils/exclusiones.json)
+        df = apply_exclusions(df, 'sscc_banco_invico_haberes')
         df.reset_index(drop=True, inplace=True)
         self.sscc_banco_invico = df
         return self.sscc_banco_invico
 
     # --------------------------------------------------
     def control_cruzado(self, groupby_cols:list = ['ejercicio', 'mes']):
-        siif = self.siif_comprobantes_haberes_neto_rdeu.copy()
+        engine = active_engine()
+        if engine is not None:
+            df = engine.compare_sums(
+                groupby_cols,
+                self.siif_comprobantes_haberes_neto_rdeu, 'importe', 'ejecutado_siif',
+                self.sscc_banco_invico, 'importe', 'pagado_sscc'
+            )
+            df = df.sort_values(by=['ejercicio','mes']).reset_index(drop=True)
+            df['dif_acum'] = df['diferencia'].cumsum()
+            return df
+        siif = self.siif_comprobantes_haberes_neto_rdeu
         siif = siif.loc[:, groupby_cols + ['importe']]
         siif = siif.groupby(groupby_cols)['importe'].sum()
         siif = siif.reset_index()
@@ -104,7 +113,7 @@ class ControlHaberes(ImportDataFrame):
         #     dplyr.group_by(f.mes) >> \
         #     dplyr.summarise(ejecutado_siif = base.sum_(f.importe),
         #                     _groups = 'drop')
-        sscc = self.sscc_banco_invico.copy()
+        sscc = self.sscc_banco_invico
         sscc = sscc.loc[:, groupby_cols + ['importe']]
         sscc = sscc.groupby(groupby_cols)['importe'].sum()
         sscc = sscc.reset_index()
@@ -21,7 +21,9 @@ from typing import List
 import numpy as np
 import pandas as pd
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.result_store import cached_result
+from invicoctrlpy.utils.snapshots import snapshot_result
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
@@ -192,7 +194,7 @@ class ControlHonorarios(ImportDataFrame):
             - Optional column selection: Allows including only the 'importe_bruto' column if 'only_importe_bruto' is True.
             - Missing values: Fills missing values with 0.
         """
-        slave = self.import_slave().copy()
+        slave = self.import_slave()
         slave = slave.rename(columns={'otras_retenciones': 'otras'})
         slave['otras'] = slave['otras'] + slave['anticipo'] + slave['descuento'] + slave['embargo'] + slave['mutual']
         slave['sellos'] = slave['sellos'] + slave['lp'] 
@@ -258,7 +260,7 @@ class ControlHonorarios(ImportDataFrame):
             the sum of numeric columns.
             - Reset index: Resets the DataFrame index for consistency.
         """
-        siif = self.import_siif_comprobantes().copy()
+        siif = self.import_siif_comprobantes()
         # siif = siif.loc[:, ['nro_comprobante', 'importe', 'mes', 'cta_cte']]
         siif = siif.groupby(groupby_cols).sum(numeric_only=True)
         siif = siif.reset_index()
@@ -317,7 +319,7 @@ class ControlHonorarios(ImportDataFrame):
             - DataFrame transformation: Groups the data by the specified columns and calculates the sum for numeric
             columns. If 'only_importe_bruto' is True, the DataFrame is filtered to include only 'importe_bruto'.
         """
-        df = self.import_resumen_rend_honorarios().copy()
+        df = self.import_resumen_rend_honorarios()
         df['otras'] = df['otras'] + df['gcias'] + df['suss'] + df['invico'] + df['salud'] + df['mutual']
         df = df.drop(['gcias', 'suss', 'invico', 'salud', 'mutual'], axis=1)
         if only_importe_bruto:
@@ -327,6 +329,7 @@ class ControlHonorarios(ImportDataFrame):
         return df
 
     # --------------------------------------------------
+    @snapshot_result
     def siif_vs_slave(self) -> pd.DataFrame:
         """
         Compare SIIF (Sistema Integrado de Información Financiera) and Slave financial data.
@@ -348,7 +351,7 @@ class ControlHonorarios(ImportDataFrame):
             ('err_nro', 'err_importe', 'err_cta_cte', 'err_mes').
         """
         groupby_cols = ['ejercicio', 'mes', 'nro_comprobante', 'cta_cte']
-        siif = self.siif_summarize(groupby_cols = groupby_cols).copy()
+        siif = self.siif_summarize(groupby_cols = groupby_cols)
         siif = siif.rename(columns={
             'importe':'siif_importe',
             'nro_comprobante':'siif_nro',
@@ -358,7 +361,7 @@ class ControlHonorarios(ImportDataFrame):
         slave = self.slave_summarize(
             groupby_cols = groupby_cols, 
             only_importe_bruto=True
-        ).copy()
+        )
         slave = slave.rename(columns={
             'importe_bruto':'slave_importe',
             'nro_comprobante':'slave_nro',
@@ -392,6 +395,8 @@ class ControlHonorarios(ImportDataFrame):
         return df
 
     # --------------------------------------------------
+    @snapshot_result
+    @cached_result
     def slave_vs_sgf(
         self, groupby_cols:List[str] = [
             'ejercicio', 'mes',
@@ -427,10 +432,10 @@ class ControlHonorarios(ImportDataFrame):
         """
         slave = self.slave_summarize(
             groupby_cols = groupby_cols, only_importe_bruto=only_importe_bruto
-        ).copy()
+        )
         sgf = self.sgf_summarize(
             groupby_cols = groupby_cols, only_importe_bruto=only_importe_bruto
-        ).copy()
+        )
         slave = slave.set_index(groupby_cols)
         sgf = sgf.set_index(groupby_cols)   
         # Obtener los índices faltantes en slave
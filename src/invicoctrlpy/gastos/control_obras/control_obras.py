@@ -20,7 +20,8 @@ from dataclasses import dataclass
 
 import pandas as pd
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.sql_engine import active_engine
+from invicoctrlpy.utils.registry import update_db
 
 
 @dataclass
@@ -97,7 +98,7 @@ class ControlObras(ImportDataFrame):
             self.ejercicio, neto_cert_neg=True)
         df = df.loc[df['origen'] != 'FUNCIONAMIENTO']
         #Filtramos los registros de honorarios en EPAM
-        df_epam = df.copy()
+        df_epam = df
         keep = ['HONORARIOS']
         df_epam = df_epam.loc[df_epam['origen'] == 'EPAM']
         df_epam = df_epam.loc[~df_epam.destino.str.contains('|'.join(keep))]
@@ -110,7 +111,15 @@ class ControlObras(ImportDataFrame):
     def control_cruzado(
         self, groupby_cols:list = ['ejercicio', 'mes', 'cta_cte']
     ) -> pd.DataFrame:
-        icaro = self.import_icaro_carga_neto_rdeu(self.ejercicio).copy()
+        engine = active_engine()
+        if engine is not None:
+            return engine.compare_sums(
+                groupby_cols,
+                self.import_icaro_carga_neto_rdeu(self.ejercicio),
+                'importe', 'ejecutado_icaro',
+                self.sgf_resumen_rend_cuit, 'importe_bruto', 'bruto_sgf'
+            )
+        icaro = self.import_icaro_carga_neto_rdeu(self.ejercicio)
         icaro = icaro.loc[:, groupby_cols + ['importe']]
         icaro = icaro.groupby(groupby_cols)['importe'].sum()
         icaro = icaro.reset_index()
@@ -120,7 +129,7 @@ class ControlObras(ImportDataFrame):
         #     dplyr.group_by(f.mes, f.cta_cte) >> \
         #     dplyr.summarise(ejecutado_icaro = base.sum_(f.importe),
         #                     _groups = 'drop')
-        sgf = self.sgf_resumen_rend_cuit.copy()
+        sgf = self.sgf_resumen_rend_cuit
         sgf = sgf.loc[:, groupby_cols + ['importe_bruto']]
         sgf = sgf.groupby(groupby_cols)['importe_bruto'].sum()
         sgf = sgf.reset_index()
@@ -154,7 +163,7 @@ class ControlObras(ImportDataFrame):
 
     # --------------------------------------------------
     def control_completo(self):
-        icaro = self.import_icaro_carga_neto_rdeu(self.ejercicio).copy()
+        icaro = self.import_icaro_carga_neto_rdeu(self.ejercicio)
         icaro = icaro.add_prefix('icaro_')
         icaro = icaro.rename(columns={
             'icaro_ejercicio':'ejercicio',
@@ -170,7 +179,7 @@ class ControlObras(ImportDataFrame):
         #         cta_cte = f.icaro_cta_cte,
         #         cuit = f.icaro_cuit,
         #     )
-        sgf = self.sgf_resumen_rend_cuit.copy()
+        sgf = self.sgf_resumen_rend_cuit
         sgf = sgf.add_prefix('sgf_')
         sgf = sgf.rename(columns={
             'sgf_ejercicio':'ejercicio',
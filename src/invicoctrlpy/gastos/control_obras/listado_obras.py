@@ -17,7 +17,7 @@ from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 
 @dataclass
@@ -83,10 +83,10 @@ class ListadoObras(ImportDataFrame):
         return df
 
     def icaroObrasConCodObras(self) -> pd.DataFrame:
-        icaro = self.importIcaroObras().copy()
+        icaro = self.importIcaroObras()
         # "CONSTRUCCION 2 VIV. Y OBRAS COMP. PROP. DEL CONJUNTO - MERCEDES" denominación incompleta en SGF
         # print(icaro.loc[icaro['obra'] =='PROG. LOTE PROPIO - SR. SANCHEZ GUILLERMO FRANCISCO']['obra'])
-        sgo = self.importSGOListadoObras().copy()
+        sgo = self.importSGOListadoObras()
         sgo = sgo.loc[:, ['cod_obra', 'obra']]
         # print(sgo.loc[sgo['obra'] =='PROG. LOTE PROPIO - SR. SANCHEZ GUILLERMO FRANCISCO']['obra'])
         df = icaro.merge(sgo, on='obra', how='left')
@@ -99,9 +99,9 @@ class ListadoObras(ImportDataFrame):
         return df
     
     def sgoObrasConImputacion(self) -> pd.DataFrame:
-        icaro = self.importIcaroObras().copy()
+        icaro = self.importIcaroObras()
         icaro = icaro.loc[:, ['imputacion', 'obra']]
-        sgo = self.importSGOListadoObras().copy()
+        sgo = self.importSGOListadoObras()
         df = sgo.merge(icaro, on='obra', how='left')
         df = df[['imputacion'] + [col for col in df.columns if col != 'imputacion']]
         return df
@@ -24,8 +24,12 @@ from typing import List
 
 import pandas as pd
 import numpy as np
+from invicoctrlpy.utils.copy_on_write import lazy_copy
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.result_store import cached_result
+from invicoctrlpy.utils.snapshots import snapshot_result
+from invicoctrlpy.utils.sql_engine import active_engine, in_params
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
@@ -173,7 +177,7 @@ class ControlRetenciones(ImportDataFrame):
         Returns:
             pd.DataFrame: Pandas DataFrame containing aggregated retention data.
         """
-        icaro_carga = self.icaro_carga.copy()
+        icaro_carga = self.icaro_carga
         icaro_retenciones = super().import_icaro_retenciones()
         icaro_retenciones = icaro_retenciones.loc[
             icaro_retenciones['id_carga'].isin(icaro_carga['id'].values.tolist())]
@@ -200,7 +204,7 @@ class ControlRetenciones(ImportDataFrame):
             pd.DataFrame: Pandas DataFrame containing "Icaro Carga" data
             with retentions calculated.
         """
-        icaro_carga = self.icaro_carga.copy()
+        icaro_carga = self.icaro_carga
         icaro_retenciones = self.import_icaro_retenciones()
         df = icaro_carga.merge(
             icaro_retenciones, how='left', 
@@ -245,7 +249,7 @@ class ControlRetenciones(ImportDataFrame):
         Returns:
             pd.DataFrame: Pandas DataFrame containing the cross-controlled data.
         """
-        df = self.import_icaro_carga_con_retenciones().copy()
+        df = self.import_icaro_carga_con_retenciones()
         df = df.drop(
             ['fondo_reparo', 'avance', 'certificado', 'origen', 'obra'], 
             axis=1
@@ -274,7 +278,27 @@ class ControlRetenciones(ImportDataFrame):
             ```python
             contractor_payments = control.import_siif_pagos_contratistas()
             ```
-        """
+
+            With an active SqlEngine the filters and joins run in SQL over
+            siif.sqlite and sscc.sqlite.
+        """
+        engine = active_engine()
+        if engine is not None:
+            ejercicios, params = in_params(self.ejercicio)
+            return engine.query(f"""
+                SELECT c.ejercicio, c.mes, c.nro_entrada, c.tipo_comprobante,
+                    c.debitos AS importe_neto, c.auxiliar_1 AS cuit,
+                    m.map_to AS cta_cte
+                FROM {{rcocc31}} c
+                LEFT JOIN (
+                    SELECT ejercicio, nro_entrada, auxiliar_1 FROM {{rcocc31}}
+                    WHERE cta_contable = '1112-2-6' AND ejercicio IN ({ejercicios})
+                ) b ON c.ejercicio = b.ejercicio AND c.nro_entrada = b.nro_entrada
+                LEFT JOIN {{ctas_ctes}} m ON b.auxiliar_1 = m.siif_contabilidad_cta_cte
+                WHERE c.cta_contable = '2111-1-2'
+                    AND c.tipo_comprobante IN ('CAP', 'ANP', 'CAD')
+                    AND c.ejercicio IN ({ejercicios})
+            """, params + params)
         siif_banco = self.import_siif_rcocc31(
             ejercicio = self.ejercicio, cta_contable = '1112-2-6'
         )
@@ -323,7 +347,33 @@ class ControlRetenciones(ImportDataFrame):
             ```python
             retention_payments = control.import_siif_pagos_retenciones()
             ```
-        """
+
+            With an active SqlEngine the filters and joins run in SQL over
+            siif.sqlite and sscc.sqlite.
+        """
+        engine = active_engine()
+        if engine is not None:
+            ejercicios, params = in_params(self.ejercicio)
+            return engine.query(f"""
+                SELECT r.ejercicio, r.mes, r.nro_entrada, r.tipo_comprobante,
+                    r.debitos AS importe,
+                    CASE r.auxiliar_1
+                        WHEN '110' THEN 'iibb' WHEN '111' THEN 'sellos'
+                        WHEN '112' THEN 'lp' WHEN '113' THEN 'gcias'
+                        WHEN '114' THEN 'suss' WHEN '337' THEN 'invico'
+                    END AS cod_ret,
+                    m.map_to AS cta_cte
+                FROM {{rcocc31}} r
+                LEFT JOIN (
+                    SELECT nro_entrada, auxiliar_1 FROM {{rcocc31}}
+                    WHERE cta_contable = '1112-2-6' AND ejercicio IN ({ejercicios})
+                ) b ON r.nro_entrada = b.nro_entrada
+                LEFT JOIN {{ctas_ctes}} m ON b.auxiliar_1 = m.siif_contabilidad_cta_cte
+                WHERE r.cta_contable = '2122-1-2'
+                    AND r.tipo_comprobante IN ('CAP', 'ANP', 'CAD')
+                    AND r.auxiliar_1 IN ('110', '111', '112', '113', '114', '337')
+                    AND r.ejercicio IN ({ejercicios})
+            """, params + params)
         siif_banco = self.import_siif_rcocc31(
             ejercicio = self.ejercicio, cta_contable = '1112-2-6'
         )
@@ -347,17 +397,10 @@ class ControlRetenciones(ImportDataFrame):
         df = siif_retenciones.merge(siif_banco, how='left', on='nro_entrada')
         retenciones_obras = ['110', '111', '112', '113', '114', '337']
         df = df.loc[df['cod_ret'].isin(retenciones_obras)]
-        df['cod_ret'] = np.select(
-            [
-                df['cod_ret'] == '110',
-                df['cod_ret'] == '111',
-                df['cod_ret'] == '112',
-                df['cod_ret'] == '113',
-                df['cod_ret'] == '114',
-                df['cod_ret'] == '337'
-            ],
-            ['iibb', 'sellos', 'lp', 'gcias', 'suss', 'invico']
-        )
+        df['cod_ret'] = df['cod_ret'].map({
+            '110': 'iibb', '111': 'sellos', '112': 'lp',
+            '113': 'gcias', '114': 'suss', '337': 'invico'
+        })
         map_to = self.ctas_ctes.loc[:,['map_to', 'siif_contabilidad_cta_cte']]
         df = pd.merge(
             df, map_to, how='left',
@@ -392,10 +435,10 @@ class ControlRetenciones(ImportDataFrame):
             siif_summary = control.siif_summarize(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        contratistas = self.import_siif_pagos_contratistas().copy()
+        contratistas = self.import_siif_pagos_contratistas()
         contratistas = contratistas.groupby(groupby_cols).sum(numeric_only=True)
         contratistas = contratistas.reset_index()
-        retenciones = self.import_siif_pagos_retenciones().copy()
+        retenciones = self.import_siif_pagos_retenciones()
         retenciones.reset_index(drop=True, inplace=True)
         retenciones = retenciones.pivot_table(
             index = groupby_cols, columns='cod_ret', values='importe', 
@@ -412,6 +455,8 @@ class ControlRetenciones(ImportDataFrame):
         return df
 
     # --------------------------------------------------
+    @snapshot_result
+    @cached_result
     def icaro_vs_siif(
         self, groupby_cols:List[str] = ['ejercicio', 'mes', 'cta_cte'],
         only_diff = False
@@ -442,9 +487,9 @@ class ControlRetenciones(ImportDataFrame):
             diff_data = control.icaro_vs_siif(groupby_cols=['ejercicio', 'mes'], only_diff=True)
             ```
         """
-        icaro = self.icaro_summarize(groupby_cols=groupby_cols).copy()
+        icaro = self.icaro_summarize(groupby_cols=groupby_cols)
         icaro = icaro.set_index(groupby_cols)
-        siif = self.siif_summarize(groupby_cols=groupby_cols).copy()
+        siif = self.siif_summarize(groupby_cols=groupby_cols)
         siif = siif.set_index(groupby_cols)
         # Obtener los índices faltantes en icaro
         missing_indices = siif.index.difference(siif.index)
@@ -497,7 +542,7 @@ class ControlRetenciones(ImportDataFrame):
         Returns:
             pd.DataFrame: Pandas DataFrame containing the cross-controlled data.
         """
-        df = self.import_resumen_rend_cuit().copy()
+        df = self.import_resumen_rend_cuit()
         df = df.drop(
             ['origen', 'fecha', 'beneficiario', 'destino', 'libramiento_sgf',
             'seguro', 'salud', 'mutual', 'otras'], 
@@ -518,7 +563,7 @@ class ControlRetenciones(ImportDataFrame):
         Returns:
             pd.DataFrame: Pandas DataFrame containing Banco Invico data.
         """
-        return super().import_banco_invico(ejercicio = self.ejercicio)
+        return super().import_banco_invico(ejercicio = self.ejercicio, clasificar = True)
 
     # --------------------------------------------------
     def sscc_summarize(
@@ -536,15 +581,11 @@ class ControlRetenciones(ImportDataFrame):
         Returns:
             pd.DataFrame: Pandas DataFrame containing the cross-controlled data.
         """
-        df = self.import_banco_invico().copy()
-        inversion_obras = [
-            '018', '019', '020', '021', '027', '035', '041',
-            '052', '053', '065', '066', '072', '112', '142'
-            '143', '162', '210', '213', '217', '219', '221',
-            '225', '227','034'
-        ]
+        df = lazy_copy(self.import_banco_invico())
+        # Inversión Obras (ver utils/imputaciones.json) más las retenciones (034)
         df = df.loc[
-            df['cod_imputacion'].isin(inversion_obras)
+            (df['clase_flujo_caja'] == '3 - Inversión Obras')
+            | (df['cod_imputacion'] == '034')
         ]
         df['retenciones'] = df.loc[df['cod_imputacion'] == '034']['importe'] * -1
         # Filtrar los registros que cumplan ambas condiciones
@@ -558,7 +599,8 @@ class ControlRetenciones(ImportDataFrame):
         df['importe'] = df.loc[df['cod_imputacion'] != '034']['importe']
         df = df.drop(
             ['fecha', 'es_cheque','beneficiario', 'concepto', 'moneda',
-            'libramiento', 'cod_imputacion', 'imputacion'], 
+            'libramiento', 'cod_imputacion', 'imputacion',
+            'clase_flujo_caja', 'grupo_imputacion'], 
             axis=1
         )
         df = df.fillna(0)
@@ -570,6 +612,7 @@ class ControlRetenciones(ImportDataFrame):
         return df
 
     # --------------------------------------------------
+    @snapshot_result
     def sgf_vs_sscc(
         self, groupby_cols:List[str] = ['ejercicio', 'mes', 'cta_cte'],
         only_diff = False
@@ -599,9 +642,9 @@ class ControlRetenciones(ImportDataFrame):
             result = control.sgf_vs_sscc(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        sgf =  self.sgf_summarize(groupby_cols=groupby_cols).copy()
+        sgf =  self.sgf_summarize(groupby_cols=groupby_cols)
         sgf = sgf.set_index(groupby_cols)
-        sscc = self.sscc_summarize(groupby_cols=groupby_cols).copy()
+        sscc = self.sscc_summarize(groupby_cols=groupby_cols)
         sscc = sscc.set_index(groupby_cols)
         # Obtener los índices faltantes en sgf
         missing_indices = sscc.index.difference(sscc.index)
@@ -625,6 +668,7 @@ class ControlRetenciones(ImportDataFrame):
         return df
 
     # --------------------------------------------------
+    @snapshot_result
     def icaro_vs_sgf(
         self, groupby_cols:List[str] = ['ejercicio', 'mes', 'cta_cte'],
         only_diff = False
@@ -653,11 +697,11 @@ class ControlRetenciones(ImportDataFrame):
             result = control.icaro_vs_invico(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        icaro = self.icaro_summarize(groupby_cols=groupby_cols).copy()
+        icaro = self.icaro_summarize(groupby_cols=groupby_cols)
         icaro['sellos'] = icaro['sellos'] + icaro['lp']
         icaro = icaro.drop(columns=['lp'])
         icaro = icaro.set_index(groupby_cols)
-        invico = self.sgf_summarize(groupby_cols=groupby_cols).copy()
+        invico = self.sgf_summarize(groupby_cols=groupby_cols)
         invico = invico.set_index(groupby_cols)
         # Obtener los índices faltantes en icaro
         missing_indices = invico.index.difference(icaro.index)
@@ -681,6 +725,7 @@ class ControlRetenciones(ImportDataFrame):
         return df
 
     # --------------------------------------------------
+    @snapshot_result
     def icaro_vs_sscc(
         self, groupby_cols:List[str] = ['ejercicio', 'mes', 'cta_cte'],
         only_diff = False
@@ -712,11 +757,11 @@ class ControlRetenciones(ImportDataFrame):
             result = control.icaro_vs_sscc(groupby_cols=['ejercicio', 'mes'])
             ```
         """
-        icaro = self.icaro_summarize(groupby_cols=groupby_cols).copy()
+        icaro = self.icaro_summarize(groupby_cols=groupby_cols)
         icaro['sellos'] = icaro['sellos'] + icaro['lp']
         icaro = icaro.drop(columns=['lp'])
         icaro = icaro.set_index(groupby_cols)
-        sscc = self.sscc_summarize(groupby_cols=groupby_cols).copy()
+        sscc = self.sscc_summarize(groupby_cols=groupby_cols)
         sscc = sscc.set_index(groupby_cols)
         # Obtener los índices faltantes en icaro
         missing_indices = sscc.index.difference(icaro.index)
@@ -19,6 +19,7 @@ import datetime as dt
 from dataclasses import dataclass, field
 
 import pandas as pd
+from ...utils.copy_on_write import lazy_copy
 from ...utils.import_dataframe import ImportDataFrame
 # from invicodb.update import update_db
 
@@ -65,7 +66,9 @@ class EjecucionGastos(ImportDataFrame):
     # --------------------------------------------------
     def import_dfs(self):
         self.import_ctas_ctes()
-        self.siif_desc_pres = self.import_siif_desc_pres(ejercicio_to=self.ejercicio)
+        # Copia: la tabla de la dimensión se comparte en todo el proceso
+        self.siif_desc_pres = lazy_copy(self.dimension(
+            'siif_desc_pres', ejercicio_to=self.ejercicio).table)
 
     # --------------------------------------------------
     def import_siif_rfp_p605b(self):
@@ -78,7 +81,8 @@ class EjecucionGastos(ImportDataFrame):
         df = super().import_siif_rf602(self.ejercicio)
         #df = df.loc[df['ordenado'] > 0]
         df.sort_values(by=['ejercicio', 'estructura'], ascending=[False, True],inplace=True)
-        df = df.merge(self.siif_desc_pres, how='left', on='estructura', copy=False)
+        df = self.dimension(
+            'siif_desc_pres', ejercicio_to=self.ejercicio).lookup(df, on='estructura')
         df.drop(
             labels=['org', 'pendiente', 
             'subprograma', 'proyecto', 'actividad'], 
@@ -22,9 +22,17 @@ import pandas as pd
 import numpy as np
 import argparse
 
+from invicoctrlpy.utils.copy_on_write import lazy_copy
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.local_store import LocalStore, file_hash
+from invicoctrlpy.utils.result_store import cached_result
+from invicoctrlpy.utils.report_export import SIDECAR_FORMATS, export_report
+from invicoctrlpy.utils.session import DataSession
 # from invicodb.update import update_db
 
+ACUM_2008_FILE_NAME = 'Obras 2008 Unificado para Exportar (Depurado).xlsx'
+ACUM_2008_TABLE = 'siif_obras_acum_2008'
+
 # --------------------------------------------------
 def get_args():
     """Get command-line arguments"""
@@ -43,6 +51,15 @@ def get_args():
         help="Ejercicio Remamente",
     )
 
+    parser.add_argument(
+        "-s", "--sidecar",
+        metavar="sidecar",
+        nargs="*",
+        default=[],
+        choices=SIDECAR_FORMATS,
+        help="Guardar además cada hoja como csv y/o parquet",
+    )
+
     return parser.parse_args()
 
 @dataclass
@@ -64,20 +81,45 @@ class EjecucionObras(ImportDataFrame):
     # --------------------------------------------------
     def import_dfs(self):
         self.import_ctas_ctes()
-        self.siif_desc_pres = self.import_siif_desc_pres(ejercicio_to=self.ejercicio)
+        # Copia: la tabla de la dimensión se comparte en todo el proceso
+        self.siif_desc_pres = lazy_copy(self.siif_desc_pres_dim().table)
 
     # --------------------------------------------------
-    def import_acum_2008(self):
+    def siif_desc_pres_dim(self):
+        return self.dimension('siif_desc_pres', ejercicio_to=self.ejercicio)
+
+    # --------------------------------------------------
+    def acum_2008_path(self) -> str:
         if self.input_path == None:
-            file_path = os.path.join(
+            return os.path.join(
                 self.get_update_path_input(), 
-                'Reportes SIIF', 'Obras 2008 Unificado para Exportar (Depurado).xlsx'
+                'Reportes SIIF', ACUM_2008_FILE_NAME
             )
-        else:
-            file_path = os.path.join(
-                self.input_path, 
-                'Reportes SIIF', 'Obras 2008 Unificado para Exportar (Depurado).xlsx')
+        return os.path.join(
+            self.input_path, 
+            'Reportes SIIF', ACUM_2008_FILE_NAME)
 
+    # --------------------------------------------------
+    def import_acum_2008(self):
+        """
+        Ejecución acumulada al 2008 (planilla legada). La planilla se convierte
+        una única vez a una tabla tipada del almacén local y se vuelve a leer
+        del Excel sólo cuando cambia su hash.
+        """
+        file_path = self.acum_2008_path()
+        fingerprint = file_hash(file_path)
+        store = LocalStore(self.db_path)
+        df = store.read_table(ACUM_2008_TABLE, fingerprint=fingerprint)
+        if df is None:
+            df = self.read_acum_2008_excel(file_path)
+            store.write_table(
+                df, ACUM_2008_TABLE, fingerprint=fingerprint,
+                dtype={'acum_2008': 'REAL'}, index_cols=['estructura']
+            )
+        return df
+
+    # --------------------------------------------------
+    def read_acum_2008_excel(self, file_path:str) -> pd.DataFrame:
         df = pd.read_excel(file_path, dtype=str)
         df['desc_prog'] = np.where(
             df['proy'].isna(), 
@@ -103,6 +145,7 @@ class EjecucionObras(ImportDataFrame):
             'desc_prog', 'desc_subprog', 'desc_proy', 'desc_act', 
             'actividad', 'partida', 'estructura', 'alta', 'acum_2008'
         ]]
+        df.reset_index(drop=True, inplace=True)
         return df
 
     # --------------------------------------------------
@@ -111,7 +154,7 @@ class EjecucionObras(ImportDataFrame):
         df = df.loc[df['partida'].isin(['421', '422'])]
         #df = df.loc[df['ordenado'] > 0]
         df = df.sort_values(by=['ejercicio', 'estructura'], ascending=[False, True])
-        df = df.merge(self.siif_desc_pres, how='left', on='estructura', copy=False)
+        df = self.siif_desc_pres_dim().lookup(df, on='estructura')
         df.drop(
             labels=['org', 'pendiente', 'programa', 
             'subprograma', 'proyecto', 'actividad', 
@@ -140,7 +183,7 @@ class EjecucionObras(ImportDataFrame):
             )
         df['actividad'] = df['estructura'].str[0:11]
         df.sort_values(by=['ejercicio', 'estructura'], ascending=[False, True],inplace=True)
-        df = df.merge(self.import_icaro_desc_pres(), how='left', on='actividad', copy=False)
+        df = self.dimension('icaro_desc_pres').lookup(df, on='actividad')
         df['estructura'] = df['actividad']
         df.drop(
             labels=['ejercicio', 'actividad', 'desc_subprog'], 
@@ -184,19 +227,14 @@ class EjecucionObras(ImportDataFrame):
         df = df.loc[df['partida'].isin(['421', '422'])]
         if es_desc_siif:
             df['estructura'] = df['actividad'] + '-' + df['partida']
-            df = df.merge(self.siif_desc_pres, how='left', on='estructura', copy=False)
+            df = self.siif_desc_pres_dim().lookup(df, on='estructura')
             df.drop(labels=['estructura'], axis='columns', inplace=True)
         else:
-            df = df.merge(
-                self.import_icaro_desc_pres(), how='left', 
-                on='actividad', copy=False
-            )
+            df = self.dimension('icaro_desc_pres').lookup(df, on='actividad')
         df.reset_index(drop=True, inplace=True)
-        prov = super().import_icaro_proveedores()
-        prov = prov.loc[:, ['cuit', 'desc_prov']]
-        prov.drop_duplicates(subset=['cuit'], inplace=True)
-        prov.rename(columns={'desc_prov':'proveedor'}, inplace=True)
-        df = df.merge(prov, how='left', on='cuit', copy=False)
+        df = self.dimension('icaro_proveedores').lookup(
+            df, on='cuit', rename={'desc_prov':'proveedor'}
+        )
         return df
 
     # --------------------------------------------------
@@ -212,18 +250,13 @@ class EjecucionObras(ImportDataFrame):
         df = df.merge(df_obras, how='left', on='obra', copy=False)
         if es_desc_siif:
             df['estructura'] = df['actividad'] + '-' + df['partida']
-            df = df.merge(self.siif_desc_pres, how='left', on='estructura', copy=False)
+            df = self.siif_desc_pres_dim().lookup(df, on='estructura')
             df.drop(labels=['estructura'], axis='columns', inplace=True)
         else:
-            df = df.merge(
-                self.import_icaro_desc_pres(), how='left', 
-                on='actividad', copy=False
-            )
-        prov = super().import_icaro_proveedores()
-        prov = prov.loc[:, ['cuit', 'desc_prov']]
-        prov.drop_duplicates(subset=['cuit'], inplace=True)
-        prov.rename(columns={'desc_prov':'proveedor'}, inplace=True)
-        df = df.merge(prov, how='left', on='cuit', copy=False)
+            df = self.dimension('icaro_desc_pres').lookup(df, on='actividad')
+        df = self.dimension('icaro_proveedores').lookup(
+            df, on='cuit', rename={'desc_prov':'proveedor'}
+        )
         df.reset_index(drop=True, inplace=True)
         return df
 
@@ -397,6 +430,7 @@ class EjecucionObras(ImportDataFrame):
         return df
 
    # --------------------------------------------------
+    @cached_result(inputs=lambda self: [self.acum_2008_path()])
     def reporte_planillometro_contabilidad(
         self, es_desc_siif:bool = True,
         incluir_desc_subprog:bool = False,
@@ -472,24 +506,22 @@ class EjecucionObras(ImportDataFrame):
         df_alta = df.groupby(group_cols).ejercicio.min().reset_index()
         df_alta.rename(columns={'ejercicio':'alta'}, inplace=True)
 
-        df_ejercicios = df.copy()
         if ultimos_ejercicios != 'All':
             ejercicios = int(ultimos_ejercicios)
-            ejercicios = df_ejercicios.sort_values('ejercicio', ascending=False).ejercicio.unique()[0:ejercicios]
+            ejercicios = df.sort_values('ejercicio', ascending=False).ejercicio.unique()[0:ejercicios]
             # df_anos = df_anos.loc[df_anos.ejercicio.isin(ejercicios)]
         else:
-            ejercicios = df_ejercicios.sort_values('ejercicio', ascending=False).ejercicio.unique()
+            ejercicios = df.sort_values('ejercicio', ascending=False).ejercicio.unique()
 
         # Ejercicio actual
-        df_ejec_actual = df.copy()
-        df_ejec_actual = df_ejec_actual.loc[df_ejec_actual.ejercicio.isin(ejercicios)]
+        df_ejec_actual = df.loc[df.ejercicio.isin(ejercicios)]
         df_ejec_actual = df_ejec_actual.groupby(group_cols + ['ejercicio']).importe.sum().reset_index()
         df_ejec_actual.rename(columns={'importe':'ejecucion'}, inplace=True)
 
         # Ejecucion Acumulada
         df_acum = pd.DataFrame()
         for ejercicio in ejercicios:
-            df_ejercicio = df.copy()
+            df_ejercicio = lazy_copy(df)
             df_ejercicio = df_ejercicio.loc[df_ejercicio.ejercicio.astype(int) <= int(ejercicio)]
             df_ejercicio['ejercicio'] = ejercicio
             df_ejercicio = df_ejercicio.groupby(group_cols + ['ejercicio']).importe.sum().reset_index()
@@ -499,7 +531,7 @@ class EjecucionObras(ImportDataFrame):
         # Obras en curso
         df_curso = pd.DataFrame()
         for ejercicio in ejercicios:
-            df_ejercicio = df.copy()
+            df_ejercicio = lazy_copy(df)
             df_ejercicio = df_ejercicio.loc[df_ejercicio.ejercicio.astype(int) <= int(ejercicio)]
             df_ejercicio['ejercicio'] = ejercicio
             obras_curso = df_ejercicio.groupby(["obra"]).avance.max().to_frame()
@@ -513,7 +545,7 @@ class EjecucionObras(ImportDataFrame):
         # Obras terminadas anterior
         df_term_ant = pd.DataFrame()
         for ejercicio in ejercicios:
-            df_ejercicio = df.copy()
+            df_ejercicio = lazy_copy(df)
             df_ejercicio = df_ejercicio.loc[df_ejercicio.ejercicio.astype(int) < int(ejercicio)]
             df_ejercicio['ejercicio'] = ejercicio
             obras_term_ant = df_ejercicio.groupby(["obra"]).avance.max().to_frame()
@@ -548,47 +580,39 @@ def main():
 
     print(f'Ejercicio = "{ejercicio}"')
 
-    ejecucion_obras = EjecucionObras(ejercicio=ejercicio)
-
     save_path = os.path.dirname(
         os.path.abspath(inspect.getfile(inspect.currentframe()))
     )
 
-    file_name = os.path.join(save_path, "Planillometro al " + ejercicio + ".xlsx")
-    with pd.ExcelWriter(file_name) as writer:
-        ejecucion_obras.reporte_siif_ejec_obras_actual().to_excel(
-            writer, sheet_name='EjecuccionSIIF' + ejercicio, index=False
-            )
-        ejecucion_obras.import_siif_obras_desc_icaro().to_excel(
-            writer, sheet_name='EjecuccionSIIFDescICARO' + ejercicio, index=False
-            )
-        ejecucion_obras.reporte_planillometro().to_excel(
-            writer, sheet_name='Planillometro', index=False
-            )
-        ejecucion_obras.reporte_planillometro(full_icaro=True, es_desc_siif=False).to_excel(
-            writer, sheet_name='PlanillometroFullIcaro', index=False
-            )
-        ejecucion_obras.reporte_planillometro_contabilidad(
-            ultimos_ejercicios=5, es_desc_siif=False, 
-            desagregar_partida=True, agregar_acum_2008=True,
-            date_up_to = dt.datetime(2024, 8, 31)).to_excel(
-                writer, sheet_name='PlanillometroResumido', index=False
-            )
-
-    file_name = os.path.join(save_path, "Módulos Básicos Ejecutados Hasta el " + ejercicio + ".xlsx")
-    with pd.ExcelWriter(file_name) as writer:
-        siif_ejec_mod_basicos = ejecucion_obras.reporte_siif_ejec_obras_actual()
-        siif_ejec_mod_basicos = siif_ejec_mod_basicos.loc[siif_ejec_mod_basicos['estructura'].str.startswith('29')]
-        siif_ejec_mod_basicos.to_excel(
-            writer, sheet_name='EjecuccionSIIF' + ejercicio, index=False
-            )
-        ejecucion_obras.reporte_icaro_mod_basicos().to_excel(
-            writer, sheet_name='ModBasicosPorConvFte11', index=False
-            )
-        icaro_mod_basicos_ejercicios = ejecucion_obras.reporte_icaro_mod_basicos(por_convenio=False)
-        icaro_mod_basicos_ejercicios.to_excel(
-            writer, sheet_name='ModBasicosPorEjercicio', index=False
-            )
+    with DataSession():
+        ejecucion_obras = EjecucionObras(ejercicio=ejercicio)
+        # Se usa en ambos libros: se calcula una sola vez
+        siif_ejec_obras = ejecucion_obras.reporte_siif_ejec_obras_actual()
+
+        file_name = os.path.join(save_path, "Planillometro al " + ejercicio + ".xlsx")
+        export_report(file_name, {
+            'EjecuccionSIIF' + ejercicio: siif_ejec_obras,
+            'EjecuccionSIIFDescICARO' + ejercicio: ejecucion_obras.import_siif_obras_desc_icaro,
+            'Planillometro': ejecucion_obras.reporte_planillometro,
+            'PlanillometroFullIcaro': lambda: ejecucion_obras.reporte_planillometro(
+                full_icaro=True, es_desc_siif=False
+            ),
+            'PlanillometroResumido': lambda: ejecucion_obras.reporte_planillometro_contabilidad(
+                ultimos_ejercicios=5, es_desc_siif=False,
+                desagregar_partida=True, agregar_acum_2008=True,
+                date_up_to = dt.datetime(2024, 8, 31)
+            ),
+        }, sidecars=args.sidecar)
+
+        file_name = os.path.join(save_path, "Módulos Básicos Ejecutados Hasta el " + ejercicio + ".xlsx")
+        siif_ejec_mod_basicos = siif_ejec_obras.loc[siif_ejec_obras['estructura'].str.startswith('29')]
+        export_report(file_name, {
+            'EjecuccionSIIF' + ejercicio: siif_ejec_mod_basicos,
+            'ModBasicosPorConvFte11': ejecucion_obras.reporte_icaro_mod_basicos,
+            'ModBasicosPorEjercicio': lambda: ejecucion_obras.reporte_icaro_mod_basicos(
+                por_convenio=False
+            ),
+        }, sidecars=args.sidecar)
 
 
 # --------------------------------------------------
@@ -17,7 +17,7 @@ from dataclasses import dataclass
 
 
 import pandas as pd
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
 
@@ -60,7 +60,7 @@ class SGFVsSSCC(ImportDataFrame):
 
     # --------------------------------------------------
     def import_banco_invico(self):
-        df = super().import_banco_invico(self.ejercicio)
+        df = super().import_banco_invico(self.ejercicio, clasificar=True)
         df = df.loc[df['movimiento'] != 'DEPOSITO']
         df['importe'] = df['importe'] * (-1)
         df.reset_index(drop=True, inplace=True)
@@ -69,8 +69,8 @@ class SGFVsSSCC(ImportDataFrame):
 
     # --------------------------------------------------
     def control_mes_cta_cte(self):
-        sscc_mes_cta_cte = self.sscc_banco_invico.copy()
-        sscc_mes_cta_cte = sscc_mes_cta_cte[(sscc_mes_cta_cte["cod_imputacion"] != "031")]
+        sscc_mes_cta_cte = self.sscc_banco_invico
+        sscc_mes_cta_cte = sscc_mes_cta_cte[(sscc_mes_cta_cte["grupo_imputacion"] != "Débito bancario")]
         sscc_mes_cta_cte = sscc_mes_cta_cte[['mes', 'cta_cte', 'importe']]
         sscc_mes_cta_cte = sscc_mes_cta_cte.groupby(['mes', 'cta_cte'], as_index=False).agg({'importe': 'sum'})
         sscc_mes_cta_cte.rename(columns={'importe': 'debitos_sscc'}, inplace=True)
@@ -80,7 +80,7 @@ class SGFVsSSCC(ImportDataFrame):
         #     dplyr.group_by(f.mes, f.cta_cte) >> \
         #     dplyr.summarise(debitos_sscc = base.sum_(f.importe),
         #                     _groups = 'drop')
-        sgf_mes_cta_cte = self.sgf_resumen_rend.copy()
+        sgf_mes_cta_cte = self.sgf_resumen_rend
         sgf_mes_cta_cte = sgf_mes_cta_cte.groupby(['mes', 'cta_cte'])[['importe_neto', 'retenciones']].sum().reset_index()
         sgf_mes_cta_cte.rename(columns={
             'importe_neto': 'neto_sgf', 'retenciones': 'retenciones_sgf'
@@ -20,7 +20,10 @@ from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
+from invicoctrlpy.utils.copy_on_write import lazy_copy
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.result_store import cached_result
+from invicoctrlpy.utils.snapshots import snapshot_result
 # from invicodb.update import update_db
 
 
@@ -70,7 +73,9 @@ class IcaroVsSIIF(ImportDataFrame):
     # --------------------------------------------------
     def import_dfs(self):
         self.import_ctas_ctes()
-        self.siif_desc_pres = self.import_siif_desc_pres(ejercicio_to=self.ejercicio)
+        # Copia: la tabla de la dimensión se comparte en todo el proceso
+        self.siif_desc_pres = lazy_copy(self.dimension(
+            'siif_desc_pres', ejercicio_to=self.ejercicio).table)
         self.import_icaro_carga(self.ejercicio)
         self.import_siif_rfondo07tp_pa6(self.ejercicio)
         self.import_siif_rf602()
@@ -99,31 +104,34 @@ class IcaroVsSIIF(ImportDataFrame):
     # --------------------------------------------------
     def control_ejecucion_anual(self):
         group_by = ['ejercicio','estructura', 'fuente']
-        icaro = self.icaro_carga.copy()
+        icaro = lazy_copy(self.icaro_carga)
         icaro = icaro.loc[icaro['tipo'] != 'PA6']
         icaro['estructura'] = icaro.actividad + '-' + icaro.partida
         icaro = icaro.groupby(group_by)['importe'].sum()
         icaro = icaro.reset_index(drop=False)
         icaro = icaro.rename(columns={'importe':'ejecucion_icaro'})
-        siif = self.import_siif_rf602().copy()
+        siif = self.import_siif_rf602()
         siif = siif.loc[:, group_by + ['ordenado']]
         siif = siif.rename(columns={'ordenado':'ejecucion_siif'})
         print(siif.head())
         df = pd.merge(siif, icaro, how='outer', on = group_by, copy=False)
         df = df.fillna(0)
         df['diferencia'] = df['ejecucion_siif'] - df['ejecucion_icaro']
-        df = df.merge(self.siif_desc_pres, how='left', on='estructura', copy=False)
+        df = self.dimension(
+            'siif_desc_pres', ejercicio_to=self.ejercicio).lookup(df, on='estructura')
         df = df.loc[(df['diferencia'] < -0.1) | (df['diferencia'] > 0.1)]
         df = df.reset_index(drop=True)
         return df
 
     # --------------------------------------------------
+    @snapshot_result(key_cols=['ejercicio', 'siif_nro', 'icaro_nro'])
+    @cached_result
     def control_comprobantes(self):
         select = [
             'ejercicio', 'nro_comprobante', 'fuente', 'importe',
             'mes', 'cta_cte', 'cuit', 'partida'
         ]
-        siif = self.import_siif_comprobantes().copy()
+        siif = lazy_copy(self.import_siif_comprobantes())
         # En ICARO limito los REG para regularizaciones de PA6
         siif.loc[(siif.clase_reg == 'REG') & (siif.nro_fondo.isnull()), 'clase_reg'] = 'CYO'
         siif = siif.loc[:, select + ['clase_reg']]
@@ -137,7 +145,7 @@ class IcaroVsSIIF(ImportDataFrame):
                 'cuit':'siif_cuit',
                 'partida':'siif_partida'
         })
-        icaro = self.icaro_carga.copy()
+        icaro = self.icaro_carga
         icaro = icaro.loc[:, select + ['tipo']]
         icaro = icaro.loc[icaro['tipo'] != 'PA6']
         icaro = icaro.rename(columns={
@@ -190,7 +198,7 @@ class IcaroVsSIIF(ImportDataFrame):
 
     # --------------------------------------------------
     def control_pa6(self):
-        siif_fdos = self.siif_rfondo07tp.copy()
+        siif_fdos = lazy_copy(self.siif_rfondo07tp)
         siif_fdos = siif_fdos.loc[
             :, ['ejercicio', 'nro_fondo', 'mes', 'ingresos', 'saldo']
         ]
@@ -207,7 +215,7 @@ class IcaroVsSIIF(ImportDataFrame):
             'mes', 'cta_cte', 'cuit'
         ]
 
-        siif_gtos = self.import_siif_comprobantes().copy()
+        siif_gtos = lazy_copy(self.import_siif_comprobantes())
         siif_gtos = siif_gtos.loc[siif_gtos['clase_reg'] == 'REG']
         siif_gtos = siif_gtos.loc[:, select + ['nro_fondo', 'clase_reg']]
         siif_gtos['nro_fondo'] = siif_gtos['nro_fondo'].str.zfill(5) + '/' + siif_gtos.ejercicio.str[-2:]
@@ -222,7 +230,7 @@ class IcaroVsSIIF(ImportDataFrame):
                 'mes':'siif_mes_reg',
         })
         
-        icaro = self.icaro_carga.copy()
+        icaro = self.icaro_carga
         icaro = icaro.loc[:, select + ['tipo']]
         icaro = icaro.rename(columns={
                 'mes':'icaro_mes',
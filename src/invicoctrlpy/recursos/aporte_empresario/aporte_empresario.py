@@ -22,7 +22,8 @@ from typing import List
 import pandas as pd
 import numpy as np
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-from invicodb.update import update_db
+from invicoctrlpy.utils.sql_engine import active_engine, in_params
+from invicoctrlpy.utils.registry import update_db
 
 
 def default_ejercicio():
@@ -174,7 +175,7 @@ class ControlAporteEmpresario(ImportDataFrame):
             )
             ```
         """
-        siif = self.import_siif_recurso_3_percent().copy()
+        siif = self.import_siif_recurso_3_percent()
         siif = siif.drop(['es_remanente', 'es_verificado', 'es_invico'], axis=1)
         siif = siif.groupby(groupby_cols).sum(numeric_only=True)
         siif = siif.reset_index()
@@ -194,8 +195,25 @@ class ControlAporteEmpresario(ImportDataFrame):
         This method retrieves SIIF data associated with specific account codes related to retentions under code 337.
         It processes this data, filtering transactions and merging relevant details, such as financial amounts and
         transaction types. The resulting DataFrame includes processed SIIF data pertinent to retentions under code 337
-        for further analysis or usage.
+        for further analysis or usage. With an active SqlEngine the filters and joins run in SQL.
         """
+        engine = active_engine()
+        if engine is not None:
+            ejercicios, params = in_params(self.ejercicio)
+            return engine.query(f"""
+                SELECT r.ejercicio, r.mes, r.fecha, r.nro_entrada, r.tipo_comprobante,
+                    r.debitos AS pagos_337_siif, r.creditos AS gastos_337_siif,
+                    m.map_to AS cta_cte
+                FROM {{rcocc31}} r
+                LEFT JOIN (
+                    SELECT ejercicio, nro_entrada, auxiliar_1 FROM {{rcocc31}}
+                    WHERE cta_contable = '1112-2-6' AND tipo_comprobante <> 'APE'
+                        AND ejercicio IN ({ejercicios})
+                ) b ON r.ejercicio = b.ejercicio AND r.nro_entrada = b.nro_entrada
+                LEFT JOIN {{ctas_ctes}} m ON b.auxiliar_1 = m.siif_contabilidad_cta_cte
+                WHERE r.cta_contable = '2122-1-2' AND r.tipo_comprobante <> 'APE'
+                    AND r.auxiliar_1 = '337' AND r.ejercicio IN ({ejercicios})
+            """, params + params)
         siif_banco = self.import_siif_rcocc31(
             ejercicio = self.ejercicio, cta_contable = '1112-2-6'
         )
@@ -247,7 +265,7 @@ class ControlAporteEmpresario(ImportDataFrame):
         presents the summarized SIIF data specifically related to retentions under code 337, organized according
         to the specified grouping for further analysis or utilization.
         """
-        siif = self.import_siif_retencion_337().copy()
+        siif = self.import_siif_retencion_337()
         siif = siif.groupby(groupby_cols).sum(numeric_only=True)
         siif = siif.reset_index()
         df = siif
@@ -278,9 +296,9 @@ class ControlAporteEmpresario(ImportDataFrame):
         two datasets when 'only_diff' is True. If 'only_diff' is False, it returns a DataFrame with the merged
         data, suitable for further analysis or review.
         """
-        siif_recurso = self.siif_summarize_recurso_3_percent(groupby_cols=groupby_cols).copy()
+        siif_recurso = self.siif_summarize_recurso_3_percent(groupby_cols=groupby_cols)
         siif_recurso = siif_recurso.set_index(groupby_cols)
-        siif_retencion = self.siif_summarize_retencion_337(groupby_cols=groupby_cols).copy()
+        siif_retencion = self.siif_summarize_retencion_337(groupby_cols=groupby_cols)
         siif_retencion.drop(['gastos_337_siif'], axis='columns', inplace=True)
         siif_retencion = siif_retencion.set_index(groupby_cols)
         # Obtener los índices faltantes en siif
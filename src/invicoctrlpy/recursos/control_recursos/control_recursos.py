@@ -21,6 +21,7 @@ import pandas as pd
 # from invicodb.update import update_db
 from typing import List
 
+from invicoctrlpy.utils.exclusions import apply_exclusions
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
 
 
@@ -66,15 +67,10 @@ class ControlRecursos(ImportDataFrame):
 
     # --------------------------------------------------
     def import_banco_invico(self):
-        df = super().import_banco_invico(self.ejercicio)
+        df = super().import_banco_invico(self.ejercicio, clasificar=True)
         df = df.loc[df['movimiento'] == 'DEPOSITO']
-        dep_transf_int = ['034', '004']
-        dep_pf = ['214', '215']
-        dep_otros = ['003', '055', '005', '013']
-        dep_cert_neg = ['18']
-        df = df.loc[~df['cod_imputacion'].isin(
-            dep_transf_int + dep_pf + dep_otros + dep_cert_neg
-            )]
+        # Transferencias internas, plazos fijos, etc. (ver utils/exclusiones.json)
+        df = apply_exclusions(df, 'sscc_banco_invico_depositos')
         df['grupo'] = np.where(df['cta_cte'] == '10270', 'FONAVI',
                         np.where(df['cta_cte'].isin([
                             "130832-12", "334", "Macro", "Patagonia"]), 'RECUPEROS', 
@@ -89,7 +85,7 @@ class ControlRecursos(ImportDataFrame):
         # df = df.loc[df['es_remanente'] == False]
         df = df.loc[df['es_verificado'] == True]
         keep = ['MACRO']
-        df['cta_cte'].loc[df.glosa.str.contains('|'.join(keep))] = 'Macro'
+        df.loc[df.glosa.str.contains('|'.join(keep)), 'cta_cte'] = 'Macro'
         df['grupo'] = np.where(df['cta_cte'] == '10270', 'FONAVI',
                     np.where(df['cta_cte'].isin([
                         "130832-12", "334", "Macro", "Patagonia"]), 'RECUPEROS', 
@@ -22,17 +22,92 @@ Packages:
  - invicoctrlpy (pip install -e '/home/kanou/IT/R Apps/R Gestion INVICO/invicoctrlpy')
 """
 
+import argparse
 import datetime as dt
-from dataclasses import dataclass
+import inspect
+import os
+from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
-from invicodb.update import update_db
+from invicoctrlpy.utils.registry import update_db
 
+from invicoctrlpy.utils.copy_on_write import lazy_copy
+from invicoctrlpy.utils.exclusions import apply_exclusions
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
-import plotly.express as px
-import seaborn as sns
-sns.set_theme(style='ticks')
+from invicoctrlpy.utils.lazy_import import lazy_import
+
+# Sólo los métodos graficar* necesitan el stack de visualización
+px = lazy_import('plotly.express', install_hint='plotly')
+sns = lazy_import(
+    'seaborn', on_import=lambda module: module.set_theme(style='ticks')
+)
+
+
+# --------------------------------------------------
+@dataclass
+class RecuperosCubo():
+    """
+    Agregados de los informes SGV hasta un ejercicio, calculados una sola vez.
+    Las claves son (ejercicio, cod_barrio, cod_motivo) o un prefijo de ellas.
+    saldo_barrio_variacion es el informe sin agregar y banco_mes, los
+    depósitos de Recuperos en Banco INVICO (desde 2018) por (ejercicio, mes).
+    """
+    saldo_motivo:pd.DataFrame
+    saldo_motivo_barrio:pd.DataFrame
+    barrios_nuevos:pd.DataFrame
+    recaudado:pd.DataFrame
+    recaudado_mes:pd.DataFrame
+    facturado:pd.DataFrame
+    saldo_barrio:pd.DataFrame
+    saldo_barrio_variacion:pd.DataFrame
+    banco_mes:pd.DataFrame
+
+    # --------------------------------------------------
+    @classmethod
+    def from_import_df(cls, import_df:'Recuperos', ejercicio:str):
+        recaudado_mes = import_df.import_resumen_recaudado(ejercicio=ejercicio)
+        recaudado_mes = recaudado_mes.groupby(['ejercicio', 'mes']).sum(numeric_only=True)
+        recaudado = recaudado_mes.groupby(level='ejercicio').sum()
+        # Saldo por motivo más la amortización del ejercicio (cod_motivo 'AM')
+        amort = recaudado.loc[:, ['amortizacion']].reset_index(drop=False)
+        amort['cod_motivo'] = 'AM'
+        amort['motivo'] = 'AMORTIZACION'
+        amort.rename(columns={'amortizacion':'importe'}, inplace=True, copy=False)
+        saldo_motivo = pd.concat(
+            [import_df.import_saldo_motivo(ejercicio=ejercicio), amort], axis=0
+        )
+        saldo_motivo_barrio = import_df.import_saldo_motivo_por_barrio(ejercicio=ejercicio)
+        saldo_motivo_barrio = saldo_motivo_barrio.groupby(
+            ['ejercicio', 'cod_barrio', 'cod_motivo']
+        )[['importe']].sum()
+        barrios_nuevos = import_df.import_barrios_nuevos(ejercicio=ejercicio)
+        barrios_nuevos = barrios_nuevos.groupby(
+            ['ejercicio', 'cod_barrio']
+        )[['importe_total']].sum()
+        facturado = import_df.import_resumen_facturado(ejercicio=ejercicio)
+        facturado = facturado.groupby('ejercicio').sum(numeric_only=True)
+        saldo_barrio = import_df.import_saldo_barrio(ejercicio=ejercicio)
+        saldo_barrio = saldo_barrio.groupby('ejercicio')[['saldo_actual']].sum()
+        saldo_barrio_variacion = import_df.import_saldo_barrio_variacion(
+            ejercicio=ejercicio
+        )
+        # Depósitos de los ejercicios informados por el Sist. Recuperos
+        ejercicios = recaudado.index.unique().tolist()
+        ejercicios = [e for e in ejercicios if int(e) > 2017]
+        banco_mes = import_df.import_banco_invico(ejercicio=ejercicios)
+        banco_mes = banco_mes.groupby(['ejercicio', 'mes'])[['importe']].sum()
+        return cls(
+            saldo_motivo=saldo_motivo,
+            saldo_motivo_barrio=saldo_motivo_barrio,
+            barrios_nuevos=barrios_nuevos,
+            recaudado=recaudado,
+            recaudado_mes=recaudado_mes,
+            facturado=facturado,
+            saldo_barrio=saldo_barrio,
+            saldo_barrio_variacion=saldo_barrio_variacion,
+            banco_mes=banco_mes,
+        )
 
 
 @dataclass
@@ -42,6 +117,7 @@ class Recuperos(ImportDataFrame):
     input_path:str = None
     db_path:str = None
     update_db:bool = False
+    cubo:RecuperosCubo = field(init=False, repr=False, default=None)
 
     # --------------------------------------------------
     def __post_init__(self):
@@ -75,12 +151,21 @@ class Recuperos(ImportDataFrame):
             self.db_path + '/sscc.sqlite')
         update_sscc.update_ctas_ctes()
         update_sscc.update_banco_invico()
+        # Los agregados SGV deben recalcularse con las tablas nuevas
+        self.cubo = None
 
 
     # --------------------------------------------------
     def import_dfs(self):
         self.import_ctas_ctes()
 
+    # --------------------------------------------------
+    def import_cubo(self, reload:bool = False) -> RecuperosCubo:
+        """Agregados SGV del ejercicio, calculados una vez por instancia"""
+        if self.cubo is None or reload:
+            self.cubo = RecuperosCubo.from_import_df(self, self.ejercicio)
+        return self.cubo
+
     # --------------------------------------------------
     def importBarriosNuevos(self):
         df = super().import_barrios_nuevos(
@@ -139,15 +224,10 @@ class Recuperos(ImportDataFrame):
 
     # --------------------------------------------------
     def import_banco_invico(self, ejercicio):
-        df = super().import_banco_invico(ejercicio)
+        df = super().import_banco_invico(ejercicio, clasificar=True)
         df = df.loc[df['movimiento'] == 'DEPOSITO']
-        dep_transf_int = ['034', '004']
-        dep_pf = ['214', '215']
-        dep_otros = ['003', '055', '005', '013']
-        dep_cert_neg = ['18']
-        df = df.loc[~df['cod_imputacion'].isin(
-            dep_transf_int + dep_pf + dep_otros + dep_cert_neg
-            )]
+        # Transferencias internas, plazos fijos, etc. (ver utils/exclusiones.json)
+        df = apply_exclusions(df, 'sscc_banco_invico_depositos')
         df['grupo'] = np.where(df['cta_cte'] == '10270', 'FONAVI',
                         np.where(df['cta_cte'].isin([
                             "130832-12", "334", "Macro", "Patagonia"]), 'RECUPEROS', 
@@ -162,10 +242,8 @@ class Recuperos(ImportDataFrame):
         df = df.loc[df['concepto'].isin(['SALDO AL INICIO:', 'SALDO AL FINAL:'])]
         return df
 
-    def graficarSaldosBarrio(self):
-        df = self.importSaldoBarrio()
-        df = df.groupby(['ejercicio']).saldo_actual.sum().to_frame()
-        df.reset_index(drop=False, inplace=True) 
+    def graficarSaldosBarrio(self, show:bool = True):
+        df = self.import_cubo().saldo_barrio.reset_index(drop=False)
         df['saldo_actual'] = df['saldo_actual'] / 1000000000
         # sns.barplot(data=df, x='ejercicio', y='saldo_actual')
         fig = px.bar(
@@ -174,7 +252,9 @@ class Recuperos(ImportDataFrame):
             labels={'x':'Ejercicio','y':'miles de millones de $'}
         )
         fig.update_layout(showlegend = False)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
         # fig = px.area(
         #     y=df["saldo_actual"],x=df['ejercicio'],
         #     title = 'Recuperos',
@@ -193,7 +273,7 @@ class Recuperos(ImportDataFrame):
         return df
 
     # --------------------------------------------------
-    def graficar_dif_saldo_final_evolucion_de_saldos(self):
+    def graficar_dif_saldo_final_evolucion_de_saldos(self, show:bool = True):
         df = self.control_suma_saldo_barrio_variacion()
         df = df.groupby(['ejercicio']).dif_saldo_final.sum().to_frame()
         df.reset_index(drop=False, inplace=True) 
@@ -204,25 +284,14 @@ class Recuperos(ImportDataFrame):
             labels={'x':'Ejercicio','y':'miles de $'}
         )
         fig.update_layout(showlegend = False)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
     # --------------------------------------------------
     def saldoMotivoMasAmort(self) -> pd.DataFrame:
-        df = self.importSaldoMotivo()
-        # amort = self.control_suma_saldo_barrio_variacion()
-        # amort.reset_index(drop=False, inplace=True)
-        # amort = amort.loc[:, ['ejercicio', 'amortizacion']]
-        # amort['cod_motivo'] = '-'
-        # amort['motivo'] = 'AMORTIZACION'
-        # amort.rename(columns={'amortizacion':'importe'}, inplace=True, copy=False)
-        amort = self.importResumenRecaudado()
-        amort = amort.groupby(["ejercicio"])[["amortizacion"]].sum()
-        amort.reset_index(drop=False, inplace=True) 
-        amort['cod_motivo'] = 'AM'
-        amort['motivo'] = 'AMORTIZACION'
-        amort.rename(columns={'amortizacion':'importe'}, inplace=True, copy=False)
-        df = pd.concat([df, amort], axis=0)
-        return df
+        # Saldo por motivo más amortización (ver RecuperosCubo)
+        return lazy_copy(self.import_cubo().saldo_motivo)
     
     def rankingSaldoMotivos(self, ejercicio:str = None) -> pd.DataFrame:
         df = self.saldoMotivoMasAmort()
@@ -239,7 +308,10 @@ class Recuperos(ImportDataFrame):
         df['importe'] = df['importe'].abs()
         df['participacion'] = df['importe'] / df.groupby('ejercicio')['importe'].transform('sum')
         df['participacion'] = df['participacion'] * 100
-        motivos_act = self.rankingSaldoMotivos().head(nro_rank)['cod_motivo'].values.tolist()
+        # El ranking del ejercicio es una porción del mismo cubo
+        ranking = df.loc[df['ejercicio'] == self.ejercicio]
+        ranking = ranking.sort_values(by='importe', ascending=False)
+        motivos_act = ranking.head(nro_rank)['cod_motivo'].values.tolist()
         df_motivos = df.loc[df['cod_motivo'].isin(motivos_act)]
         df_otros = df.loc[~df['cod_motivo'].isin(motivos_act)].groupby('ejercicio')[['importe', 'participacion']].sum()
         df_otros.reset_index(drop=False, inplace=True)
@@ -249,7 +321,7 @@ class Recuperos(ImportDataFrame):
         df.sort_values(by=['ejercicio', 'participacion'], ascending=[False, False], inplace=True)
         return df
 
-    def graficarPartMotivosBaseOtrosEjercicio(self):
+    def graficarPartMotivosBaseOtrosEjercicio(self, show:bool = True):
         df = self.partMotivosBaseOtrosEjercicio()
         df = df.loc[df['ejercicio'] > '2013']
         df.sort_values(by=['ejercicio', 'participacion'], ascending=[True, True], inplace=True)
@@ -259,15 +331,17 @@ class Recuperos(ImportDataFrame):
             labels={'x':'Ejercicio','y':'%'}
         )
         fig.update_layout(showlegend = True)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
     # --------------------------------------------------
     def barriosNuevosVsEntregaDeViviendas(self):
-        barrios_nuevos = self.importBarriosNuevos()
-        barrios_nuevos = barrios_nuevos.groupby(['ejercicio'])[['importe_total']].sum()
+        cubo = self.import_cubo()
+        barrios_nuevos = cubo.barrios_nuevos.groupby(level='ejercicio')[['importe_total']].sum()
         barrios_nuevos = barrios_nuevos.reset_index(drop=False)
         barrios_nuevos = barrios_nuevos.rename(columns={'importe_total':'barrios_nuevos'}, copy=False)
-        entrega_viviendas = self.importSaldoMotivo()
+        entrega_viviendas = cubo.saldo_motivo
         entrega_viviendas = entrega_viviendas.loc[entrega_viviendas['cod_motivo'] == '1']
         entrega_viviendas = entrega_viviendas.loc[:, ['ejercicio', 'importe']]
         entrega_viviendas = entrega_viviendas.rename(columns={'importe':'entrega_viviendas'}, copy=False)
@@ -278,13 +352,15 @@ class Recuperos(ImportDataFrame):
 
     # --------------------------------------------------
     def barriosNuevosVsEntregaDeViviendasPorBarrio(self):
-        barrios_nuevos = self.importBarriosNuevos()
-        barrios_nuevos = barrios_nuevos.groupby(['cod_barrio'])[['importe_total']].sum()
+        cubo = self.import_cubo()
+        barrios_nuevos = cubo.barrios_nuevos.groupby(level='cod_barrio')[['importe_total']].sum()
         barrios_nuevos = barrios_nuevos.reset_index(drop=False)
         barrios_nuevos = barrios_nuevos.rename(columns={'importe_total':'barrios_nuevos'}, copy=False)
-        entrega_viviendas = self.importSaldoMotivoPorBarrio()
-        entrega_viviendas = entrega_viviendas.loc[entrega_viviendas['cod_motivo'] == '001']
-        entrega_viviendas = entrega_viviendas.groupby(['cod_barrio'])[['importe']].sum()
+        entrega_viviendas = cubo.saldo_motivo_barrio
+        entrega_viviendas = entrega_viviendas.loc[
+            entrega_viviendas.index.get_level_values('cod_motivo') == '001'
+        ]
+        entrega_viviendas = entrega_viviendas.groupby(level='cod_barrio')[['importe']].sum()
         entrega_viviendas = entrega_viviendas.reset_index(drop=False)
         entrega_viviendas = entrega_viviendas.rename(columns={'importe':'entrega_viviendas'}, copy=False)
         # Obtener los índices faltantes en barrios_nuevos
@@ -324,10 +400,11 @@ class Recuperos(ImportDataFrame):
 
     # --------------------------------------------------
     def recaudadoSistRecuperosVsRecaudadoReal(self, group_by_month:bool = False):
-        recaudado_recuperos = self.importResumenRecaudado()
+        cubo = self.import_cubo()
+        recaudado_recuperos = cubo.recaudado_mes.loc[:, ['recaudado_total']]
+        recaudado_recuperos = recaudado_recuperos.reset_index(drop=False)
         recaudado_recuperos = recaudado_recuperos.loc[recaudado_recuperos['ejercicio'].astype(int) > 2017]
-        ejercicios = recaudado_recuperos['ejercicio'].unique().tolist()
-        recaudado_banco = self.import_banco_invico(ejercicio = ejercicios)
+        recaudado_banco = cubo.banco_mes.reset_index(drop=False)
 
         if group_by_month:
             group_by = 'mes'
@@ -349,7 +426,9 @@ class Recuperos(ImportDataFrame):
         return df
 
     # --------------------------------------------------
-    def graficarRecaudadoSistRecuperosVsRecaudadoReal(self, group_by_month:bool = False):
+    def graficarRecaudadoSistRecuperosVsRecaudadoReal(
+        self, group_by_month:bool = False, show:bool = True
+    ):
         df = self.recaudadoSistRecuperosVsRecaudadoReal(group_by_month = group_by_month)
         if group_by_month:
             group_by = 'mes'
@@ -361,24 +440,23 @@ class Recuperos(ImportDataFrame):
             labels={'x':group_by,'y':'%'}
         )
         fig.update_layout(showlegend = False)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
     # --------------------------------------------------
-    def graficarFacturadoVsRecaudado(self):
-        facturado = self.importResumenFacturado()
-        facturado = facturado.groupby('ejercicio')['facturado_total'].sum().to_frame()
+    def graficarFacturadoVsRecaudado(self, show:bool = True):
+        cubo = self.import_cubo()
+        facturado = cubo.facturado.loc[:, ['facturado_total']]
         facturado['concepto'] = 'facturado'
         facturado.rename(columns={'facturado_total':'importe'}, inplace=True)
-        recaudado = self.importResumenRecaudado()
-        recaudado = recaudado.groupby('ejercicio')['recaudado_total'].sum().to_frame()
+        recaudado = cubo.recaudado.loc[:, ['recaudado_total']]
         recaudado['concepto'] = 'recaudado'
         recaudado.rename(columns={'recaudado_total':'importe'}, inplace=True)
         df = pd.concat([facturado, recaudado], axis=0)
         df.reset_index(drop=False, inplace=True)
         # Add saldo recuperos a cobrar
-        saldo = self.importSaldoBarrio()
-        saldo = saldo.groupby(['ejercicio']).saldo_actual.sum().to_frame()
-        saldo.reset_index(drop=False, inplace=True) 
+        saldo = cubo.saldo_barrio.reset_index(drop=False)
         df = df.merge(saldo, on='ejercicio', copy=False)
         df.reset_index(drop=False, inplace=True)
         df['participacion'] = (df['importe'] / df['saldo_actual']) * 100
@@ -389,13 +467,14 @@ class Recuperos(ImportDataFrame):
             labels={'x':'Ejercicio','y':'%'}
         )
         fig.update_layout(showlegend = True)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
     # --------------------------------------------------
-    def graficarPendAcreditacionRecaudado(self):
-        recaudado = self.importResumenRecaudado()
-        recaudado = recaudado.groupby('ejercicio')[['pend_acreditacion', 'recaudado_total']].sum()
-        recaudado.reset_index(drop=False, inplace=True)
+    def graficarPendAcreditacionRecaudado(self, show:bool = True):
+        recaudado = self.import_cubo().recaudado.loc[:, ['pend_acreditacion', 'recaudado_total']]
+        recaudado = recaudado.reset_index(drop=False)
         df = recaudado
         df['participacion'] = df['pend_acreditacion'].abs() / df['recaudado_total'] *100
         df = recaudado
@@ -406,13 +485,14 @@ class Recuperos(ImportDataFrame):
             labels={'x':'Ejercicio','y':'%'}
         )
         fig.update_layout(showlegend = False)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
     # --------------------------------------------------
-    def graficarAmortizacionRecaudado(self):
-        recaudado = self.importResumenRecaudado()
-        recaudado = recaudado.groupby('ejercicio')[['amortizacion', 'recaudado_total']].sum()
-        recaudado.reset_index(drop=False, inplace=True)
+    def graficarAmortizacionRecaudado(self, show:bool = True):
+        recaudado = self.import_cubo().recaudado.loc[:, ['amortizacion', 'recaudado_total']]
+        recaudado = recaudado.reset_index(drop=False)
         df = recaudado
         df['participacion'] = df['amortizacion'].abs() / df['recaudado_total'] *100
         df = recaudado
@@ -423,19 +503,20 @@ class Recuperos(ImportDataFrame):
             labels={'x':'Ejercicio','y':'%'}
         )
         fig.update_layout(showlegend = False)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
 
     # --------------------------------------------------
-    def graficarComposicionRecaudadoActual(self, nro_rank:int = 5):
-        recaudado = self.importResumenRecaudado()
-        recaudado = recaudado.groupby('ejercicio')[[
+    def graficarComposicionRecaudadoActual(self, nro_rank:int = 5, show:bool = True):
+        recaudado = self.import_cubo().recaudado.loc[:, [
             'amortizacion', 'int_financiero', 'int_mora', 
             'gtos_adm', 'seg_incendio', 'seg_vida', 
             'subsidio', 'pago_amigable', 'escritura',
             'pend_acreditacion'
-        ]].sum()
-        recaudado.reset_index(drop=False, inplace=True)
+        ]]
+        recaudado = recaudado.reset_index(drop=False)
         recaudado = recaudado.loc[recaudado['ejercicio'] == self.ejercicio]
         recaudado.drop(columns=['ejercicio'], inplace=True)
         concepto_list=list(recaudado.columns)
@@ -445,8 +526,7 @@ class Recuperos(ImportDataFrame):
         )
         recaudado['importe'] = recaudado['importe'].abs()
         recaudado['participacion'] = (recaudado['importe'] / recaudado['importe'].sum()) *100
-        df = recaudado.copy()
-        df.sort_values(by='participacion', ascending=False, inplace=True)
+        df = recaudado.sort_values(by='participacion', ascending=False)
         df = df.head(nro_rank)
         df_otros = pd.DataFrame([{
             'concepto':'otros', 
@@ -459,19 +539,20 @@ class Recuperos(ImportDataFrame):
             title = 'Composición Recaudado del Ejercicio (Sist. Recuperos)',
         )
         fig.update_layout(showlegend = True)
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
     # --------------------------------------------------
     def altaBarriosSinAmort(self):
-        df = self.importSaldoBarrioVariacion()
+        df = self.import_cubo().saldo_barrio_variacion
         # Nos limitamos a aquellos barrios que aún tienen saldo
         df = df.loc[df['saldo_final'] > 0]
         # Nos limitamos a aquellos barrios dados de alta hasta el ejercicio anterior
-        df_ant = df.copy()
-        df_ant = df_ant.loc[df_ant['ejercicio'].astype(int) < int(self.ejercicio)]
+        df_ant = df.loc[df['ejercicio'].astype(int) < int(self.ejercicio)]
         df_ant = df_ant.groupby('barrio').amortizacion.sum().to_frame()
         df_ant = df_ant.reset_index(drop=False)
-        df_actual = df.loc[df['ejercicio'] == self.ejercicio].copy()
+        df_actual = df.loc[df['ejercicio'] == self.ejercicio]
         df_actual = df_actual.drop(columns=['amortizacion'])
         df_actual = df_actual.merge(df_ant, on='barrio', copy=False)
         df_actual['amortizacion'] = df_actual['amortizacion'] * (-1)
@@ -479,8 +560,8 @@ class Recuperos(ImportDataFrame):
         return df_actual
 
     # --------------------------------------------------
-    def graficarAltaBarriosSinAmort(self, base_saldo:bool = False):
-        df_actual = self.importSaldoBarrioVariacion()
+    def graficarAltaBarriosSinAmort(self, base_saldo:bool = False, show:bool = True):
+        df_actual = self.import_cubo().saldo_barrio_variacion
         df_actual = df_actual.loc[df_actual['ejercicio'] == self.ejercicio]
         df_alta = self.altaBarriosSinAmort()
         if base_saldo:
@@ -502,4 +583,124 @@ class Recuperos(ImportDataFrame):
             title = title,
         )
         fig.update_layout(showlegend = True)
-        fig.show()
\ No newline at end of file
+        if show:
+            fig.show()
+        return fig
+
+    # --------------------------------------------------
+    def graficos(self) -> dict:
+        """Todos los gráficos del informe, {nombre: fig}, sin mostrarlos"""
+        # Un único pase de agregación compartido por todos los gráficos
+        self.import_cubo()
+        return {
+            'saldos_barrio': self.graficarSaldosBarrio(show=False),
+            'part_motivos_base_otros_ejercicio': (
+                self.graficarPartMotivosBaseOtrosEjercicio(show=False)
+            ),
+            'recaudado_recuperos_vs_banco': (
+                self.graficarRecaudadoSistRecuperosVsRecaudadoReal(show=False)
+            ),
+            'recaudado_recuperos_vs_banco_mensual': (
+                self.graficarRecaudadoSistRecuperosVsRecaudadoReal(
+                    group_by_month=True, show=False
+                )
+            ),
+            'facturado_vs_recaudado': self.graficarFacturadoVsRecaudado(show=False),
+            'pend_acreditacion_recaudado': (
+                self.graficarPendAcreditacionRecaudado(show=False)
+            ),
+            'amortizacion_recaudado': self.graficarAmortizacionRecaudado(show=False),
+            'composicion_recaudado_actual': (
+                self.graficarComposicionRecaudadoActual(show=False)
+            ),
+            'alta_barrios_sin_amort': self.graficarAltaBarriosSinAmort(show=False),
+            'alta_barrios_sin_amort_saldo': (
+                self.graficarAltaBarriosSinAmort(base_saldo=True, show=False)
+            ),
+        }
+
+    # --------------------------------------------------
+    def exportar_graficos(self, output_path:str, formato:str = 'html') -> list:
+        """
+        Escribe cada gráfico como HTML autocontenido (formato='html') o como
+        especificación JSON de plotly (formato='json') en output_path.
+        Devuelve la lista de archivos generados.
+        """
+        if formato not in ('html', 'json'):
+            raise ValueError("formato debe ser 'html' o 'json'")
+        os.makedirs(output_path, exist_ok=True)
+        files = []
+        for nombre, fig in self.graficos().items():
+            file_name = os.path.join(
+                output_path, f'Recuperos {self.ejercicio} - {nombre}.{formato}'
+            )
+            if formato == 'html':
+                fig.write_html(file_name, include_plotlyjs=True, full_html=True)
+            else:
+                fig.write_json(file_name)
+            files.append(file_name)
+        return files
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+
+    parser = argparse.ArgumentParser(
+        description="Exportar gráficos del Sistema de Recuperos",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "ejercicio",
+        metavar="ejercicio",
+        default=[dt.datetime.now().year],
+        type=int,
+        choices=range(2010, dt.datetime.now().year + 1),
+        help="Ejercicio base de los gráficos",
+    )
+
+    parser.add_argument(
+        "-o", "--output",
+        metavar="output",
+        default=None,
+        type=str,
+        help="Carpeta de salida (por defecto, la carpeta de este módulo)",
+    )
+
+    parser.add_argument(
+        "-f", "--formato",
+        metavar="formato",
+        default="html",
+        type=str,
+        choices=["html", "json"],
+        help="Formato de los gráficos exportados",
+    )
+
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+def main():
+    """Exportar todos los gráficos de Recuperos en un solo paso"""
+
+    args = get_args()
+    ejercicio = str(args.ejercicio)
+
+    print(f'Ejercicio = "{ejercicio}"')
+
+    output_path = args.output
+    if output_path is None:
+        output_path = os.path.dirname(
+            os.path.abspath(inspect.getfile(inspect.currentframe()))
+        )
+    recuperos = Recuperos(ejercicio=ejercicio)
+    for file_name in recuperos.exportar_graficos(output_path, formato=args.formato):
+        print(file_name)
+
+
+# --------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+# python -m src.invicoctrlpy.recursos.recuperos.recuperos 2023 -o ./graficos
@@ -24,6 +24,9 @@ from dataclasses import dataclass
 
 from invicoctrlpy.utils import handle_path
 from invicoctrlpy.utils.import_dataframe import ImportDataFrame
+from invicoctrlpy.utils.periods import mes_to_periodo
+from invicoctrlpy.utils.report_export import SIDECAR_FORMATS, export_report
+from invicoctrlpy.utils.session import DataSession
 
 
 # --------------------------------------------------
@@ -44,6 +47,15 @@ def get_args():
         help="Ejercicio Remamente",
     )
 
+    parser.add_argument(
+        "-s", "--sidecar",
+        metavar="sidecar",
+        nargs="*",
+        default=[],
+        choices=SIDECAR_FORMATS,
+        help="Guardar además cada hoja como csv y/o parquet",
+    )
+
     return parser.parse_args()
 
 @dataclass
@@ -74,18 +86,16 @@ class Remanente():
         df = df.loc[df["partida"].isin(["421", "422"])]
         df = df.loc[df["fuente"] != "11"]
         df["estructura"] = df["estructura"].str[:-4]
-        df_desc = self.import_df.import_icaro_desc_pres()
-        df_desc.rename(
-            columns={
-                "actividad": "estructura",
+        df = self.import_df.dimension("icaro_desc_pres").lookup(
+            df,
+            on="estructura",
+            rename={
                 "desc_prog": "prog_con_desc",
                 "desc_subprog": "subprog_con_desc",
                 "desc_proy": "proy_con_desc",
                 "desc_act": "act_con_desc",
             },
-            inplace=True,
         )
-        df = df.merge(df_desc, how="left", on="estructura", copy=False)
         df.drop(
             [
                 "grupo",
@@ -111,12 +121,8 @@ class Remanente():
     # --------------------------------------------------
     def deuda_flotante(self) -> pd.DataFrame:
         rdeu = self.import_df.import_siif_rdeu012(ejercicio=self.ejercicio)
-        months = rdeu["mes_hasta"].tolist()
-        # Convertir cada elemento de la lista a un objeto datetime
-        dates = [dt.datetime.strptime(month, "%m/%Y") for month in months]
-        # Obtener la fecha más reciente y Convertir la fecha mayor a un string en el formato 'MM/YYYY'
-        gt_month = max(dates).strftime("%m/%Y")
-        rdeu = rdeu.loc[rdeu["mes_hasta"] == gt_month, :]
+        periodo_hasta = mes_to_periodo(rdeu["mes_hasta"])
+        rdeu = rdeu.loc[periodo_hasta == periodo_hasta.max(), :]
         return rdeu
 
     # --------------------------------------------------
@@ -251,25 +257,18 @@ def main():
         os.path.abspath(inspect.getfile(inspect.currentframe()))
     )
     file_name = os.path.join(save_path, "Remanente " + ejercicio + ".xlsx")
-    with pd.ExcelWriter(file_name) as writer:
+    with DataSession():
         remanente = Remanente(ejercicio=ejercicio)
-        remanente.hoja_trabajo().to_excel(
-            writer, sheet_name="HojaTrabajoFdoProv", index=False
-        )
-        remanente.remanente_met_1().to_excel(
-            writer, sheet_name="RemMet1", index=False
-        )
-        remanente.remanente_met_2().to_excel(
-            writer, sheet_name="RemMet2", index=False
-        )
-        remanente.remanente_met_2_hist().to_excel(writer, sheet_name="RemMet2Hist", index=False)
-        remanente.remanente_dif_met().to_excel(writer, sheet_name="RemDifMet", index=False)
-        remanente.deuda_flotante().to_excel(writer, sheet_name="Rdeu", index=False)
-        remanente.deuda_flotante_tg().to_excel(writer, sheet_name="RdeuTG", index=False)
-        remanente.import_sdo_final_banco_invico().to_excel(
-            writer, sheet_name="SldBcoCierre", index=False
-        )
-        # siif_ppto_con_desc.to_excel(writer, sheet_name='HojaTrabajoFdoProv', index=False)
+        export_report(file_name, {
+            "HojaTrabajoFdoProv": remanente.hoja_trabajo,
+            "RemMet1": remanente.remanente_met_1,
+            "RemMet2": remanente.remanente_met_2,
+            "RemMet2Hist": remanente.remanente_met_2_hist,
+            "RemDifMet": remanente.remanente_dif_met,
+            "Rdeu": remanente.deuda_flotante,
+            "RdeuTG": remanente.deuda_flotante_tg,
+            "SldBcoCierre": remanente.import_sdo_final_banco_invico,
+        }, sidecars=args.sidecar)
 
 
 # --------------------------------------------------
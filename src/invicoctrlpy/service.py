@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Modo servicio. Un único proceso mantiene en memoria las tablas
+    SQLite (DataSession), los controles ya construidos y sus resultados, y
+    los expone como JSON por HTTP en localhost:
+
+        GET  /reports                                -> controles y tablas
+        GET  /<control>/<tabla>?ejercicio=2024&...   -> tabla (orient=split)
+        POST /reload                                 -> descarta todo lo cacheado
+
+    Pedidos simultáneos por el mismo resultado se resuelven con un único
+    cálculo. Cuando cambia un archivo SQLite, sólo se vuelven a leer las
+    tablas de ese archivo.
+
+Ejemplo:
+    invicoctrlpy serve --port 8765
+    >>> from invicoctrlpy.service import fetch
+    >>> fetch('retenciones', 'icaro_vs_siif', ejercicio=['2024'])
+"""
+
+__all__ = ['ControlService', 'serve', 'fetch']
+
+import json
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from invicoctrlpy.cli import REPORTS, Task
+from invicoctrlpy.utils.copy_on_write import lazy_copy
+from invicoctrlpy.utils.hangling_path import HanglingPath
+from invicoctrlpy.utils.local_store import db_fingerprint
+from invicoctrlpy.utils.session import DataSession
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+# --------------------------------------------------
+class ControlService():
+    """
+    Controles y resultados residentes en memoria, con coalescencia. Las
+    lecturas pasan por self.session mientras esté activa (ver serve).
+    """
+
+    # --------------------------------------------------
+    def __init__(self, db_path:str = None):
+        if db_path is None:
+            db_path = HanglingPath().get_db_path()
+        self.db_path = db_path
+        self.session = DataSession()
+        self._fingerprint = None
+        self._controls:Dict[Tuple, Future] = {}
+        self._results:Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    def _coalesce(self, key:Tuple, cache:dict, compute):
+        """
+        Devuelve el resultado de compute() para key. Si otro hilo ya lo está
+        calculando, espera ese mismo cálculo en lugar de repetirlo.
+        """
+        with self._lock:
+            future = cache.get(key)
+            owner = future is None
+            if owner:
+                future = cache[key] = Future()
+        if owner:
+            try:
+                future.set_result(compute())
+            except Exception as e:
+                with self._lock:
+                    cache.pop(key, None)
+                future.set_exception(e)
+        return future.result()
+
+    # --------------------------------------------------
+    def fingerprint(self) -> Tuple:
+        """
+        Huella actual de las bases. Si cambió algún SQLite se descartan los
+        controles y resultados; la DataSession vuelve a leer sólo las tablas
+        de los archivos modificados.
+        """
+        fingerprint = db_fingerprint(self.db_path)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._controls.clear()
+                self._results.clear()
+                self._fingerprint = fingerprint
+        return fingerprint
+
+    # --------------------------------------------------
+    def table(self, report:str, table:str, ejercicios:List[str]) -> pd.DataFrame:
+        if report not in REPORTS or table not in REPORTS[report].tables:
+            raise KeyError(f'{report}/{table}')
+        spec = REPORTS[report]
+        if spec.per_year and len(ejercicios) != 1:
+            raise ValueError(f"'{report}' recibe un único ejercicio")
+        task = Task(report, tuple(sorted(ejercicios)))
+        ejercicio = task.ejercicio[0] if spec.per_year else list(task.ejercicio)
+        fingerprint = self.fingerprint()
+        control = self._coalesce(
+            (task, fingerprint), self._controls,
+            lambda: spec.build(ejercicio, db_path=self.db_path)
+        )
+        df = self._coalesce(
+            (task, table, fingerprint), self._results,
+            lambda: spec.tables[table](control)
+        )
+        return lazy_copy(df)
+
+    # --------------------------------------------------
+    def reload(self):
+        with self._lock:
+            self._controls.clear()
+            self._results.clear()
+            self._fingerprint = None
+        self.session.clear()
+
+
+# --------------------------------------------------
+def make_handler(service:ControlService):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        # --------------------------------------------------
+        def send_json(self, status:int, body:str):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        # --------------------------------------------------
+        def send_error_json(self, status:int, message:str):
+            self.send_json(status, json.dumps({'error': message}))
+
+        # --------------------------------------------------
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            parts = [part for part in url.path.split('/') if part]
+            if parts == ['reports']:
+                return self.send_json(200, json.dumps({
+                    name: {
+                        'tables': list(report.tables),
+                        'per_year': report.per_year,
+                    } for name, report in REPORTS.items()
+                }))
+            if len(parts) != 2:
+                return self.send_error_json(404, 'ruta inválida')
+            ejercicios = urllib.parse.parse_qs(url.query).get('ejercicio', [])
+            if not ejercicios:
+                return self.send_error_json(400, 'falta ejercicio')
+            report, table = parts
+            if report not in REPORTS or table not in REPORTS[report].tables:
+                return self.send_error_json(404, f'no existe {report}/{table}')
+            try:
+                df = service.table(report, table, ejercicios)
+            except ValueError as e:
+                return self.send_error_json(400, str(e))
+            except Exception as e:
+                return self.send_error_json(500, repr(e))
+            self.send_json(
+                200, df.to_json(orient='split', index=False, date_format='iso')
+            )
+
+        # --------------------------------------------------
+        def do_POST(self):
+            if self.path.rstrip('/') != '/reload':
+                return self.send_error_json(404, 'ruta inválida')
+            service.reload()
+            self.send_json(200, json.dumps({'reload': True}))
+
+    return Handler
+
+
+# --------------------------------------------------
+def serve(
+    host:str = DEFAULT_HOST, port:int = DEFAULT_PORT, db_path:str = None
+):
+    """Levanta el servicio hasta que se interrumpa (Ctrl+C)"""
+    service = ControlService(db_path=db_path)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f'invicoctrlpy sirviendo en http://{host}:{port}')
+    try:
+        # La sesión queda activa para todos los hilos del servidor
+        with service.session:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# --------------------------------------------------
+def fetch(
+    report:str, table:str, ejercicio:List[str],
+    url:str = f'http://{DEFAULT_HOST}:{DEFAULT_PORT}'
+) -> pd.DataFrame:
+    """Cliente mínimo para notebooks: pide una tabla al servicio"""
+    query = urllib.parse.urlencode({'ejercicio': ejercicio}, doseq=True)
+    with urllib.request.urlopen(f'{url}/{report}/{table}?{query}') as response:
+        data = json.loads(response.read().decode('utf-8'))
+    return pd.DataFrame(data['data'], columns=data['columns'])
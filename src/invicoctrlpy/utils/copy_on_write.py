@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Copy-on-write de pandas para los controles. Con copy-on-write,
+    filtrar, renombrar o tomar columnas devuelve vistas, y lazy_copy() no
+    copia datos hasta que alguno de los dos DataFrames se modifica, por lo
+    que las tablas en caché (DataSession, atributos de los controles) quedan
+    protegidas sin copias completas por cada método. Importar el paquete no
+    cambia las opciones de pandas: copy-on-write se activa sólo dentro de
+    copy_on_write() (DataSession, la consola y el servicio lo usan).
+"""
+
+__all__ = [
+    'copy_on_write', 'enable_copy_on_write', 'copy_on_write_enabled', 'lazy_copy'
+]
+
+from contextlib import contextmanager
+
+import pandas as pd
+
+PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+
+# --------------------------------------------------
+@contextmanager
+def copy_on_write():
+    """
+    Copy-on-write dentro del bloque (pandas 2; en pandas >= 3 siempre está
+    activo). Al salir, la opción vuelve a su valor anterior.
+    """
+    if PANDAS_MAJOR != 2:
+        yield
+        return
+    with pd.option_context('mode.copy_on_write', True):
+        yield
+
+
+# --------------------------------------------------
+def enable_copy_on_write() -> bool:
+    """
+    Activa copy-on-write (pandas >= 2; en pandas >= 3 siempre está activo).
+    Devuelve si quedó activo.
+    """
+    if PANDAS_MAJOR == 2:
+        pd.set_option('mode.copy_on_write', True)
+    return copy_on_write_enabled()
+
+
+# --------------------------------------------------
+def copy_on_write_enabled() -> bool:
+    # pandas 1.5 tiene la opción, pero su implementación es parcial: ahí se
+    # siguen usando copias completas
+    if PANDAS_MAJOR >= 3:
+        return True
+    if PANDAS_MAJOR == 2:
+        return bool(pd.get_option('mode.copy_on_write'))
+    return False
+
+
+# --------------------------------------------------
+def lazy_copy(df:pd.DataFrame) -> pd.DataFrame:
+    """
+    Copia de df que puede modificarse sin afectar al original. Con
+    copy-on-write los datos se copian recién al escribir (y sólo las columnas
+    escritas); sin él, es una copia completa.
+    """
+    if copy_on_write_enabled():
+        return df.copy(deep=False)
+    return df.copy()
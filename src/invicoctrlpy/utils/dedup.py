@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Eliminación de duplicados por partición. Cada regla indica, para
+    ciertos valores de una columna (p.ej. las cuentas 106 y 2210178150 de
+    SGF), qué columnas identifican un registro; las filas repetidas se
+    marcan con una pasada de hash por regla y se filtran una sola vez, sin
+    copiar ni reconcatenar la tabla.
+
+Ejemplo:
+    df = DEDUP_RULES['sgf_resumen_rend_cuit'].apply(df)
+"""
+
+__all__ = ['KeyedDedup', 'DEDUP_RULES', 'SGF_RENDICION']
+
+from dataclasses import dataclass
+from typing import Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Columnas que identifican una rendición de SGF
+SGF_RENDICION = ('mes', 'fecha', 'beneficiario', 'libramiento_sgf', 'importe_bruto')
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class KeyedDedup():
+    """
+    rules: {valor o tupla de valores de partition: columnas clave}. Las
+    filas de otras particiones no se tocan.
+    """
+    partition:str
+    rules:Dict[Union[str, Tuple[str, ...]], Tuple[str, ...]]
+    keep:str = 'first'
+
+    # --------------------------------------------------
+    def mask(self, df:pd.DataFrame) -> np.ndarray:
+        """True en las filas repetidas (según la regla de su partición)"""
+        duplicated = np.zeros(len(df), dtype=bool)
+        # Particiones con la misma clave se resuelven en una única pasada
+        by_subset:Dict[Tuple[str, ...], list] = {}
+        for values, subset in self.rules.items():
+            values = values if isinstance(values, tuple) else (values,)
+            by_subset.setdefault(tuple(subset), []).extend(values)
+        for subset, values in by_subset.items():
+            scope = df[self.partition].isin(values).to_numpy()
+            if not scope.any():
+                continue
+            cols = list(dict.fromkeys((self.partition,) + subset))
+            duplicated[scope] = df.loc[scope, cols].duplicated(keep=self.keep).to_numpy()
+        return duplicated
+
+    # --------------------------------------------------
+    def apply(self, df:pd.DataFrame) -> pd.DataFrame:
+        duplicated = self.mask(df)
+        if not duplicated.any():
+            return df
+        return df.loc[~duplicated]
+
+
+DEDUP_RULES:Dict[str, KeyedDedup] = {
+    'sgf_resumen_rend': KeyedDedup('cta_cte', {'106': SGF_RENDICION}),
+    'sgf_resumen_rend_cuit': KeyedDedup(
+        'cta_cte', {('106', '2210178150'): SGF_RENDICION}
+    ),
+}
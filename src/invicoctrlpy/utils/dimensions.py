@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Registro en memoria de tablas de dimensión (descripciones
+    presupuestarias, proveedores, imputaciones SSCC) que cambian poco y se
+    usan para enriquecer casi todos los informes. Cada dimensión se materializa una única vez por
+    proceso (hasta que cambie su archivo SQLite de origen) y sus claves quedan
+    codificadas en un pd.Index, de modo que enriquecer un DataFrame es una
+    búsqueda vectorizada por posición en lugar de un merge.
+"""
+
+__all__ = ['Dimension', 'DimensionRegistry', 'DIMENSIONS']
+
+import os
+import threading
+import warnings
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .imputaciones import build_sscc_imputaciones
+
+
+# --------------------------------------------------
+@dataclass
+class Dimension():
+    name:str
+    key:str
+    table:pd.DataFrame
+    index:pd.Index = field(init=False, repr=False)
+
+    # --------------------------------------------------
+    def __post_init__(self):
+        duplicated = self.table.duplicated(subset=[self.key], keep='first')
+        if duplicated.any():
+            # Un merge repetiría las filas; lookup se queda con la primera
+            keys = self.table.loc[duplicated, self.key].unique()
+            warnings.warn(
+                f'Dimensión {self.name}: {len(keys)} valores de {self.key} '
+                f'repetidos (se usa la primera fila), p.ej. {list(keys[:5])}',
+                stacklevel=3
+            )
+            self.table = self.table.loc[~duplicated]
+        self.table = self.table.reset_index(drop=True)
+        self.index = pd.Index(self.table[self.key])
+
+    # --------------------------------------------------
+    def codes(self, values) -> np.ndarray:
+        """Posición de cada valor en la dimensión (-1 si no existe)"""
+        return self.index.get_indexer(values)
+
+    # --------------------------------------------------
+    def lookup(
+        self, df:pd.DataFrame, on:str = None,
+        columns:List[str] = None, rename:Dict[str, str] = None
+    ) -> pd.DataFrame:
+        """
+        Equivalente a df.merge(dimension, how='left', on=key) con clave única
+        en la dimensión: agrega las columnas de la dimensión al final de df.
+        """
+        on = self.key if on is None else on
+        if columns is None:
+            columns = [col for col in self.table.columns if col != self.key]
+        rename = {} if rename is None else rename
+        codes = self.codes(df[on])
+        df = df.copy(deep=False)
+        for col in columns:
+            serie = self.table[col]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                # Se trasladan los códigos de categoría (-1 = sin categoría)
+                cat_codes = np.append(serie.cat.codes.to_numpy(), -1).take(codes)
+                df[rename.get(col, col)] = pd.Categorical.from_codes(
+                    cat_codes, dtype=serie.dtype
+                )
+                continue
+            values = serie.to_numpy()
+            # El código -1 (sin coincidencia) apunta al centinela NaN del final
+            values = np.append(values.astype(object), np.nan)
+            df[rename.get(col, col)] = values.take(codes)
+        return df
+
+
+# --------------------------------------------------
+@dataclass
+class DimensionRegistry():
+    builders:Dict[str, tuple] = field(default_factory=dict)
+    _cache:dict = field(default_factory=dict, init=False, repr=False)
+    _lock:threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    # --------------------------------------------------
+    def register(
+        self, name:str, key:str, sources:List[str],
+        builder:Callable[..., pd.DataFrame]
+    ) -> None:
+        self.builders[name] = (key, sources, builder)
+
+    # --------------------------------------------------
+    def get(self, import_df, name:str, **kwargs) -> Dimension:
+        key, sources, builder = self.builders[name]
+        fingerprint = tuple(
+            self.source_fingerprint(os.path.join(import_df.db_path, source))
+            for source in sources
+        )
+        params = tuple(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in sorted(kwargs.items())
+        )
+        cache_key = (import_df.db_path, name, params)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+        dimension = Dimension(name=name, key=key, table=builder(import_df, **kwargs))
+        with self._lock:
+            self._cache[cache_key] = (fingerprint, dimension)
+        return dimension
+
+    # --------------------------------------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # --------------------------------------------------
+    @staticmethod
+    def source_fingerprint(file_path:str) -> tuple:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+# --------------------------------------------------
+def build_icaro_proveedores(import_df) -> pd.DataFrame:
+    df = import_df.import_icaro_proveedores()
+    df = df.loc[:, ['cuit', 'desc_prov']]
+    df = df.drop_duplicates(subset=['cuit'])
+    return df
+
+
+DIMENSIONS = DimensionRegistry()
+DIMENSIONS.register(
+    'icaro_desc_pres', key='actividad', sources=['icaro.sqlite'],
+    builder=lambda import_df: import_df.import_icaro_desc_pres()
+)
+DIMENSIONS.register(
+    'siif_desc_pres', key='estructura', sources=['siif.sqlite'],
+    builder=lambda import_df, ejercicio_to=None: import_df.import_siif_desc_pres(
+        ejercicio_to=ejercicio_to
+    )
+)
+DIMENSIONS.register(
+    'icaro_proveedores', key='cuit', sources=['icaro.sqlite'],
+    builder=build_icaro_proveedores
+)
+DIMENSIONS.register(
+    'sscc_imputaciones', key='cod_imputacion', sources=['sscc.sqlite'],
+    builder=build_sscc_imputaciones
+)
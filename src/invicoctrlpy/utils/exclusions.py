@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Registro central de comprobantes, cuentas e imputaciones que se
+    excluyen (o se conservan a la fuerza) en los controles. Los casos se
+    cargan desde exclusiones.json y se compilan en un frozenset por
+    (origen, campo), de modo que se aplican con una única máscara.
+"""
+
+__all__ = [
+    'EXCLUSIONES_FILE', 'load_exclusions', 'exclusion_mask',
+    'apply_exclusions', 'keep_mask'
+]
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict
+
+import pandas as pd
+
+EXCLUSIONES_FILE = os.path.join(os.path.dirname(__file__), 'exclusiones.json')
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class FieldRule():
+    values:frozenset = frozenset()
+    prefixes:tuple = ()
+
+    # --------------------------------------------------
+    def mask(self, serie:pd.Series) -> pd.Series:
+        mask = serie.isin(self.values)
+        if self.prefixes:
+            mask = mask | serie.astype(str).str.startswith(self.prefixes)
+        return mask
+
+
+# --------------------------------------------------
+def compile_rules(section:dict) -> Dict[str, Dict[str, FieldRule]]:
+    rules = {}
+    for source, fields in section.items():
+        rules[source] = {}
+        for field_name, items in fields.items():
+            rules[source][field_name] = FieldRule(
+                values=frozenset(
+                    item['valor'] for item in items if 'valor' in item
+                ),
+                prefixes=tuple(
+                    item['prefijo'] for item in items if 'prefijo' in item
+                ),
+            )
+    return rules
+
+
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def load_exclusions(file_path:str = EXCLUSIONES_FILE) -> dict:
+    """
+    Devuelve {'excluir': {origen: {campo: FieldRule}}, 'conservar': {...}}
+    """
+    with open(file_path, encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        'excluir': compile_rules(data.get('excluir', {})),
+        'conservar': compile_rules(data.get('conservar', {})),
+    }
+
+
+# --------------------------------------------------
+def _mask(
+    df:pd.DataFrame, source:str, section:str, file_path:str
+) -> pd.Series:
+    rules = load_exclusions(file_path)[section].get(source, {})
+    mask = pd.Series(False, index=df.index)
+    for field_name, rule in rules.items():
+        # Un campo faltante no puede ignorarse: dejaría pasar los casos
+        # registrados sin aviso (p. ej. si se renombra la columna)
+        if field_name not in df.columns:
+            raise KeyError(
+                f"exclusiones ({section}): '{source}' filtra por "
+                f"'{field_name}', que no está entre las columnas del DataFrame"
+            )
+        mask = mask | rule.mask(df[field_name])
+    return mask
+
+
+# --------------------------------------------------
+def exclusion_mask(
+    df:pd.DataFrame, source:str, file_path:str = EXCLUSIONES_FILE
+) -> pd.Series:
+    """True en las filas de df que el registro manda excluir para source"""
+    return _mask(df, source, 'excluir', file_path)
+
+
+# --------------------------------------------------
+def keep_mask(
+    df:pd.DataFrame, source:str, file_path:str = EXCLUSIONES_FILE
+) -> pd.Series:
+    """True en las filas de df que el registro manda conservar para source"""
+    return _mask(df, source, 'conservar', file_path)
+
+
+# --------------------------------------------------
+def apply_exclusions(
+    df:pd.DataFrame, source:str, file_path:str = EXCLUSIONES_FILE
+) -> pd.DataFrame:
+    return df.loc[~exclusion_mask(df, source, file_path)]
@@ -1,30 +1,25 @@
 from dataclasses import dataclass, field
+from typing import Iterator, Tuple
 
 import numpy as np
 import pandas as pd
 
-from invicodatpy.icaro.migrate_icaro import MigrateIcaro
-from invicodatpy.sgf.all import JoinResumenRendProvCuit, ResumenRendProv
-from invicodatpy.sgv.all import (ResumenFacturado, ResumenRecaudado,
-                                 SaldoBarrio, SaldoBarrioVariacion,
-                                 SaldoMotivo, BarriosNuevos,
-                                 SaldoMotivoPorBarrio,
-                                 SaldoRecuperosCobrarVariacion)
-from invicodatpy.siif.all import (ComprobantesGtosRcg01Uejp,
-                                  ComprobantesRecRci02, DeudaFlotanteRdeu012,
-                                  DeudaFlotanteRdeu012b2C,
-                                  JoinComprobantesGtosGpoPart,
-                                  JoinPptoGtosFteDesc, MayorContableRcocc31,
-                                  PptoGtosDescRf610, PptoGtosFteRf602,
-                                  PptoRecRi102, ResumenFdosRfondo07tp, FormGtoRfpP605b, 
-                                  ResumenContableCtaRvicon03)
-from invicodatpy.slave.migrate_slave import MigrateSlave
-from invicodatpy.sscc.all import BancoINVICO, CtasCtes, SdoFinalBancoINVICO, ListadoImputaciones
-from invicodatpy.sgo.all import ListadoObras
-
+from .copy_on_write import lazy_copy
+from .dedup import DEDUP_RULES
+from .dimensions import DIMENSIONS, Dimension
 from .hangling_path import HanglingPath
+from .imputaciones import CLASE_OTROS, CLASIFICACION_COLS
+from .instrumentation import instrument_methods
+from .local_store import LocalStore, file_fingerprint
+from .partitions import active_partition, iter_partitions, split_partitions
+from .periods import add_months, mes_to_periodo, periodo_to_ejercicio, periodo_to_mes
+from .quality import validate
+from .session import read_sql
+
+BANCO_INVICO_SALDO_MENSUAL_TABLE = 'sscc_banco_invico_saldo_mensual'
 
 
+@instrument_methods('import_')
 @dataclass
 class ImportDataFrame(HanglingPath):
     db_path:str = field(init=False, repr=False)
@@ -46,23 +41,38 @@ class ImportDataFrame(HanglingPath):
     sscc_banco_invico:pd.DataFrame = field(init=False, repr=False)
 
 
+    # --------------------------------------------------
+    def dimension(self, name:str, **kwargs) -> Dimension:
+        """
+        Dimensión materializada (ver utils.dimensions). Se construye una sola
+        vez por proceso y se reutiliza mientras no cambie su SQLite de origen.
+        """
+        return DIMENSIONS.get(self, name, **kwargs)
+
+    # --------------------------------------------------
+    def check_quality(self, table:str, df:pd.DataFrame) -> pd.DataFrame:
+        """
+        Evalúa las reglas de calidad de table (ver utils.quality) si hay un
+        data_quality activo
+        """
+        return validate(table, df)
+
     # --------------------------------------------------
     def import_ctas_ctes(self) -> pd.DataFrame:
-        df = CtasCtes().from_sql(self.db_path + '/sscc.sqlite') 
+        df = read_sql('CtasCtes', self.db_path + '/sscc.sqlite') 
         self.ctas_ctes = df
         return self.ctas_ctes
 
     # --------------------------------------------------
     def import_sscc_listado_imputaciones(self) -> pd.DataFrame:
-        df = ListadoImputaciones().from_sql(self.db_path + '/sscc.sqlite') 
+        df = read_sql('ListadoImputaciones', self.db_path + '/sscc.sqlite') 
         # self.ctas_ctes = df
         # return self.ctas_ctes
         return df
 
     # --------------------------------------------------
     def import_slave(self, ejercicio:str = None) -> pd.DataFrame:
-        df = MigrateSlave().from_sql(
-            self.db_path + '/slave.sqlite', 'honorarios_factureros')
+        df = read_sql('MigrateSlave', self.db_path + '/slave.sqlite', 'honorarios_factureros')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -74,10 +84,10 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_icaro_desc_pres(self) -> pd.DataFrame:
-        df_prog = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'programas')
-        df_subprog = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'subprogramas')
-        df_proy = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'proyectos')
-        df_act = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'actividades')
+        df_prog = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'programas')
+        df_subprog = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'subprogramas')
+        df_proy = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'proyectos')
+        df_act = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'actividades')
         # Merge all
         df = df_act.merge(df_proy, how='left', on='proyecto', copy=False)
         df = df.merge(df_subprog, how='left', on=['subprograma'], copy=False)
@@ -96,7 +106,7 @@ class ImportDataFrame(HanglingPath):
     def import_icaro_carga(self, ejercicio:str = None, 
                         neto_pa6:bool = False,
                         neto_reg:bool = False) -> pd.DataFrame:
-        df = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'carga')  
+        df = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'carga')  
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -112,6 +122,7 @@ class ImportDataFrame(HanglingPath):
             left_on='cta_cte', right_on='icaro_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'icaro_cta_cte'], axis='columns', inplace=True)
+        self.check_quality('icaro_carga', df)
         if neto_pa6:
             df = df.loc[df['tipo'] != 'PA6']
         if neto_reg:
@@ -121,7 +132,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_icaro_obras(self) -> pd.DataFrame:
-        df = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'obras')  
+        df = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'obras')  
         return df
 
     # --------------------------------------------------
@@ -164,8 +175,9 @@ class ImportDataFrame(HanglingPath):
         rdeu = rdeu.drop_duplicates(subset=['nro_comprobante'], keep='last')
         rdeu['fecha_hasta'] = (rdeu['fecha_hasta']
             + pd.tseries.offsets.DateOffset(months=1))
-        rdeu['mes_hasta'] = rdeu['fecha_hasta'].dt.strftime('%m/%Y')
-        rdeu['ejercicio'] = rdeu['mes_hasta'].str[-4:]
+        # mes_hasta como entero YYYYMM (ver utils.periods), corrido un mes
+        periodo_hasta = add_months(mes_to_periodo(rdeu['mes_hasta']), 1)
+        rdeu['ejercicio'] = periodo_to_ejercicio(periodo_hasta)
 
         # Incorporamos los comprobantes de gastos pagados 
         # en periodos posteriores (Deuda Flotante)
@@ -174,6 +186,7 @@ class ImportDataFrame(HanglingPath):
                 rdeu = rdeu.loc[rdeu['ejercicio'].isin(ejercicio)]
             else:
                 rdeu = rdeu.loc[rdeu['ejercicio'].isin([ejercicio])]
+        rdeu['mes_hasta'] = periodo_to_mes(periodo_hasta.loc[rdeu.index])
         icaro = self.import_icaro_carga(neto_pa6=True, neto_reg=True)
         icaro = icaro.loc[:, [
             'nro_comprobante', 'actividad', 'partida', 
@@ -235,7 +248,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_icaro_retenciones(self) -> pd.DataFrame:
-        df = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'retenciones')  
+        df = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'retenciones')  
         # df = df.loc[df['tipo'] != 'REG']
         df.reset_index(drop=True, inplace=True)
         # if neto_pa6:
@@ -244,17 +257,17 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_icaro_obras(self) -> pd.DataFrame:
-        df = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'obras')  
+        df = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'obras')  
         return df
 
     # --------------------------------------------------
     def import_icaro_proveedores(self) -> pd.DataFrame:
-        df = MigrateIcaro().from_sql(self.db_path + '/icaro.sqlite', 'proveedores')  
+        df = read_sql('MigrateIcaro', self.db_path + '/icaro.sqlite', 'proveedores')  
         return df
 
     # --------------------------------------------------
     def import_siif_rdeu012(self, ejercicio:str = None) -> pd.DataFrame:
-        df = DeudaFlotanteRdeu012().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('DeudaFlotanteRdeu012', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -267,6 +280,7 @@ class ImportDataFrame(HanglingPath):
             left_on='cta_cte', right_on='siif_contabilidad_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'siif_contabilidad_cta_cte'], axis='columns', inplace=True)
+        self.check_quality('siif_rdeu012', df)
         # No estoy seguro del orden Desc o Asc
         df.sort_values(by=['fecha_hasta'], inplace=True, ascending=True)
         self.siif_rdeu012 = df
@@ -274,7 +288,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_rdeu012b2_c(self, mes_hasta:str = None) -> pd.DataFrame:
-        df = DeudaFlotanteRdeu012b2C().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('DeudaFlotanteRdeu012b2C', self.db_path + '/siif.sqlite')
         if mes_hasta is not None:
             df = df.loc[df['mes_hasta'] == mes_hasta]
         df.reset_index(drop=True, inplace=True)
@@ -282,7 +296,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_rf602(self, ejercicio:str = None) -> pd.DataFrame:
-        df = PptoGtosFteRf602().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('PptoGtosFteRf602', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -293,7 +307,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_rfp_p605b(self, ejercicio:str = None) -> pd.DataFrame:
-        df = FormGtoRfpP605b().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('FormGtoRfpP605b', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -306,7 +320,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_desc_pres(self, ejercicio_to:str = None) -> pd.DataFrame:
-        df = PptoGtosDescRf610().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('PptoGtosDescRf610', self.db_path + '/siif.sqlite')
         if ejercicio_to is not None:
             if isinstance(ejercicio_to, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio_to)]
@@ -353,7 +367,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_ppto_gto_con_desc(self, ejercicio:str = None) -> pd.DataFrame:
-        df = JoinPptoGtosFteDesc().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('JoinPptoGtosFteDesc', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -363,7 +377,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_rfondo07tp_pa6(self, ejercicio:str = None) -> pd.DataFrame:
-        df = ResumenFdosRfondo07tp().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('ResumenFdosRfondo07tp', self.db_path + '/siif.sqlite')
         # if ejercicio != None:
         #     df = df.loc[df['ejercicio'] == ejercicio]
         if ejercicio is not None:
@@ -377,7 +391,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_rcg01_uejp(self, ejercicio:str = None) -> pd.DataFrame:
-        df = ComprobantesGtosRcg01Uejp().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('ComprobantesGtosRcg01Uejp', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -390,12 +404,12 @@ class ImportDataFrame(HanglingPath):
             left_on='cta_cte', right_on='siif_gastos_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'siif_gastos_cta_cte'], axis='columns', inplace=True)
+        self.check_quality('siif_rcg01_uejp', df)
         self.siif_rcg01_uejp = df
         return self.siif_rcg01_uejp
 
     def import_siif_comprobantes(self, ejercicio:list = None) -> pd.DataFrame:
-        df = JoinComprobantesGtosGpoPart().from_sql(
-            self.db_path + '/siif.sqlite')
+        df = read_sql('JoinComprobantesGtosGpoPart', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -408,6 +422,7 @@ class ImportDataFrame(HanglingPath):
             left_on='cta_cte', right_on='siif_gastos_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'siif_gastos_cta_cte'], axis='columns', inplace=True)
+        self.check_quality('siif_comprobantes', df)
         self.siif_comprobantes = df
         return self.siif_comprobantes
 
@@ -415,7 +430,7 @@ class ImportDataFrame(HanglingPath):
         self, ejercicio:list = None
         ) -> pd.DataFrame:
         self.import_siif_comprobantes(ejercicio=ejercicio)
-        df = self.siif_comprobantes.copy()
+        df = self.siif_comprobantes
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -433,15 +448,15 @@ class ImportDataFrame(HanglingPath):
         self, ejercicio:str = None, neto_art:bool = False,
         neto_gcias_310:bool = False
         ) -> pd.DataFrame:
-        df = self.import_siif_comprobantes(ejercicio=ejercicio).copy()
+        df = self.import_siif_comprobantes(ejercicio=ejercicio)
         #df = df[df['grupo'] == '100']
         df = df[df['cta_cte'] == '130832-04']
         if neto_art:
             df = df.loc[~df['partida'].isin(['150', '151'])]
         if neto_gcias_310:
-            gcias_310 = self.import_siif_rcocc31(
+            gcias_310 = lazy_copy(self.import_siif_rcocc31(
                 ejercicio=ejercicio, cta_contable='2122-1-2'
-            ).copy()
+            ))
             gcias_310 = gcias_310[gcias_310['tipo_comprobante'] != 'APE']
             gcias_310 = gcias_310[gcias_310['auxiliar_1'].isin(['245', '310'])]
             gcias_310['nro_comprobante'] = gcias_310['nro_entrada'].str.zfill(5) + '/' + gcias_310['ejercicio'].str[-2:] + 'A'
@@ -485,7 +500,7 @@ class ImportDataFrame(HanglingPath):
         #Neteamos los comprobantes de gastos no pagados (Deuda Flotante)
         comprobantes_haberes =  self.import_siif_comprobantes_haberes(
             ejercicio=ejercicio, neto_art=neto_art, neto_gcias_310=neto_gcias_310
-        ).copy()
+        )
         rdeu = self.import_siif_rdeu012()
         rdeu = rdeu.drop(columns=[
             'mes_hasta', 'fecha_aprobado', 'fecha_desde', 'fecha_hasta', 'org_fin'
@@ -532,8 +547,9 @@ class ImportDataFrame(HanglingPath):
         rdeu = rdeu.drop_duplicates(subset=['nro_comprobante'], keep='last')
         rdeu['fecha_hasta'] = (rdeu['fecha_hasta']
             + pd.tseries.offsets.DateOffset(months=1))
-        rdeu['mes_hasta'] = rdeu['fecha_hasta'].dt.strftime('%m/%Y')
-        rdeu['ejercicio'] = rdeu['mes_hasta'].str[-4:]
+        # mes_hasta como entero YYYYMM (ver utils.periods), corrido un mes
+        periodo_hasta = add_months(mes_to_periodo(rdeu['mes_hasta']), 1)
+        rdeu['ejercicio'] = periodo_to_ejercicio(periodo_hasta)
 
         # Incorporamos los comprobantes de gastos pagados 
         # en periodos posteriores (Deuda Flotante)
@@ -542,7 +558,7 @@ class ImportDataFrame(HanglingPath):
         else:
             rdeu = rdeu.loc[rdeu['ejercicio'].isin([ejercicio])]
         rdeu['fecha'] = rdeu['fecha_hasta']
-        rdeu['mes'] = rdeu['mes_hasta']
+        rdeu['mes'] = periodo_to_mes(periodo_hasta.loc[rdeu.index])
         rdeu = rdeu.drop(columns=[
             'mes_hasta', 'fecha_aprobado', 'fecha_desde', 'fecha_hasta', 'org_fin'
         ])
@@ -595,7 +611,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_rci02(self, ejercicio:str = None) -> pd.DataFrame:
-        df = ComprobantesRecRci02().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('ComprobantesRecRci02', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -614,7 +630,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_siif_ri102(self, ejercicio:str = None) -> pd.DataFrame:
-        df = PptoRecRi102().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('PptoRecRi102', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -628,7 +644,7 @@ class ImportDataFrame(HanglingPath):
     # --------------------------------------------------
     def import_siif_rcocc31(
         self, ejercicio:str = None, cta_contable:str = None) -> pd.DataFrame:
-        df = MayorContableRcocc31().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('MayorContableRcocc31', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -646,10 +662,35 @@ class ImportDataFrame(HanglingPath):
         self.siif_rcocc31 = df
         return self.siif_rcocc31
 
+    # --------------------------------------------------
+    def iter_siif_rcocc31(
+        self, ejercicio:str = None, cta_contable:str = None,
+        partition:str = None
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Igual que import_siif_rcocc31, pero devuelve (clave, DataFrame) por
+        ejercicio o mes (partition; por defecto, la del memory_budget activo)
+        en orden cronológico. Dentro de memory_budget() cada partición se lee
+        por separado de siif.sqlite.
+        """
+        partition = partition or active_partition() or 'ejercicio'
+        if active_partition() is None:
+            # La versión base: los controles redefinen import_siif_rcocc31
+            # con otra firma y otros filtros
+            df = ImportDataFrame.import_siif_rcocc31(
+                self, ejercicio=ejercicio, cta_contable=cta_contable
+            )
+            yield from split_partitions(df, partition)
+            return
+        yield from iter_partitions(
+            self.db_path + '/siif.sqlite', 'rcocc31', partition,
+            ejercicio=ejercicio, cta_contable=cta_contable
+        )
+
     # --------------------------------------------------
     def import_siif_rvicon03(
         self, ejercicio:str = None, cta_contable:str = None) -> pd.DataFrame:
-        df = ResumenContableCtaRvicon03().from_sql(self.db_path + '/siif.sqlite')
+        df = read_sql('ResumenContableCtaRvicon03', self.db_path + '/siif.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -662,7 +703,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_resumen_rend(self, ejercicio:str = None) -> pd.DataFrame:
-        df = ResumenRendProv().from_sql(self.db_path + '/sgf.sqlite')  
+        df = read_sql('ResumenRendProv', self.db_path + '/sgf.sqlite')  
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] == ejercicio]
         df.reset_index(drop=True, inplace=True)
@@ -672,32 +713,16 @@ class ImportDataFrame(HanglingPath):
             left_on='cta_cte', right_on='sgf_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'sgf_cta_cte'], axis='columns', inplace=True)
-        #Filtramos los registros duplicados en la 106
-        df_106 = df.copy()
-        df_106 = df_106.loc[df_106['cta_cte'] == '106']
-        df_106 = df_106.drop_duplicates(subset=[
-            'mes', 'fecha', 'beneficiario', 
-            'libramiento_sgf', 'importe_bruto'
-        ])
-        # df_106 = df.copy()
-        # df_106 = df_106 >> \
-        #     dplyr.filter_(f.cta_cte == '106') >> \
-        #     dplyr.distinct(
-        #         f.mes, f.fecha, f.beneficiario,
-        #         f.libramiento_sgf, 
-        #         _keep_all=True
-        #     )
-        df = pd.concat([df[df['cta_cte'] != '106'], df_106])
-        # df = df >> \
-            # dplyr.filter_(f.cta_cte != '106') >> \
-            # dplyr.bind_rows(df_106)
+        #Filtramos los registros duplicados en la 106 (ver utils.dedup)
+        df = DEDUP_RULES['sgf_resumen_rend'].apply(df)
+        self.check_quality('sgf_resumen_rend', df)
         self.sgf_resumen_rend = pd.DataFrame(df)
         return self.sgf_resumen_rend
 
     # --------------------------------------------------
     def import_resumen_rend_cuit(
         self, ejercicio:str = None, neto_cert_neg:bool=False) -> pd.DataFrame:
-        df = JoinResumenRendProvCuit().from_sql(self.db_path + '/sgf.sqlite')  
+        df = read_sql('JoinResumenRendProvCuit', self.db_path + '/sgf.sqlite')  
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -710,35 +735,11 @@ class ImportDataFrame(HanglingPath):
             left_on='cta_cte', right_on='sgf_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'sgf_cta_cte'], axis='columns', inplace=True)
-        #Filtramos los registros duplicados en la 106
-        df_106 = df.copy()
-        df_106 = df_106.loc[df_106['cta_cte'] == '106']
-        df_106 = df_106.drop_duplicates(subset=[
-            'mes', 'fecha', 'beneficiario', 
-            'libramiento_sgf', 'importe_bruto'
-        ])
-        df = pd.concat([df[df['cta_cte'] != '106'], df_106], ignore_index=True)
-        # df = df >> \
-        #     dplyr.filter_(f.cta_cte != '106') >> \
-        #     dplyr.bind_rows(df_106)
-        #Filtramos los registros duplicados en la 106
-        df_2210178150 = df.copy()
-        df_2210178150 = df_2210178150.loc[df_2210178150['cta_cte'] == '2210178150']
-        df_2210178150 = df_2210178150.drop_duplicates(subset=[
-            'mes', 'fecha', 'beneficiario', 
-            'libramiento_sgf', 'importe_bruto'
-        ])
-        df = df[df['cta_cte'] != '2210178150']
-        df = pd.concat(
-            [df[df['cta_cte'] != '2210178150'], df_2210178150], 
-            ignore_index=True
-        )
-        # df = df >> \
-        #     dplyr.filter_(f.cta_cte != '2210178150') >> \
-        #     dplyr.bind_rows(df_2210178150)
+        #Filtramos los registros duplicados en la 106 y la 2210178150 (ver utils.dedup)
+        df = DEDUP_RULES['sgf_resumen_rend_cuit'].apply(df).reset_index(drop=True)
         if neto_cert_neg:
             self.import_banco_invico(ejercicio=ejercicio)
-            banco_invico = self.sscc_banco_invico.copy()
+            banco_invico = lazy_copy(self.sscc_banco_invico)
             banco_invico = banco_invico.loc[(banco_invico['cod_imputacion'] == '018') & 
                                             (banco_invico['es_cheque'] == False) & 
                                             (banco_invico['movimiento'] == 'DEPOSITO')]
@@ -775,12 +776,13 @@ class ImportDataFrame(HanglingPath):
             df = pd.concat([df, banco_invico], ignore_index=True)
             # df = df >> \
             #     dplyr.bind_rows(banco_invico, _copy=False)
+        self.check_quality('sgf_resumen_rend_cuit', df)
         self.sgf_resumen_rend_cuit = pd.DataFrame(df)
         return self.sgf_resumen_rend_cuit
 
     # --------------------------------------------------
     def import_resumen_rend_honorarios(self, ejercicio:str = None, dep_emb:bool = True) -> pd.DataFrame:
-        df = ResumenRendProv().from_sql(self.db_path + '/sgf.sqlite')  
+        df = read_sql('ResumenRendProv', self.db_path + '/sgf.sqlite')  
         df = df.loc[df['origen'] != 'OBRAS']
         df = df.loc[df['cta_cte'].isin(['130832-05', '130832-07'])]
         df = df.loc[df['destino'].isin(['HONORARIOS - FUNCIONAMIENTO', 
@@ -820,8 +822,9 @@ class ImportDataFrame(HanglingPath):
         return self.sgf_resumen_rend_honorarios
 
     # --------------------------------------------------
-    def import_banco_invico(self, ejercicio:str = None) -> pd.DataFrame:
-        df = BancoINVICO().from_sql(self.db_path + '/sscc.sqlite')
+    def import_banco_invico(
+        self, ejercicio:str = None, clasificar:bool = False) -> pd.DataFrame:
+        df = read_sql('BancoINVICO', self.db_path + '/sscc.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -830,19 +833,112 @@ class ImportDataFrame(HanglingPath):
         # if ejercicio != None:  
         #     df = df.loc[df['ejercicio'] == ejercicio]
         df.reset_index(drop=True, inplace=True)
+        df = self.map_banco_invico(df, clasificar=clasificar)
+        self.sscc_banco_invico = df
+        return self.sscc_banco_invico
+
+    # --------------------------------------------------
+    def iter_banco_invico(
+        self, ejercicio:str = None, clasificar:bool = False,
+        partition:str = None
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Igual que import_banco_invico, pero devuelve (clave, DataFrame) por
+        ejercicio o mes (partition; por defecto, la del memory_budget activo)
+        en orden cronológico. Dentro de memory_budget() cada partición se lee
+        por separado de sscc.sqlite.
+        """
+        partition = partition or active_partition() or 'ejercicio'
+        if active_partition() is None:
+            # La versión base: los controles redefinen import_banco_invico
+            # sin argumentos y con filtros propios (sólo depósitos, etc.)
+            df = ImportDataFrame.import_banco_invico(
+                self, ejercicio=ejercicio, clasificar=clasificar
+            )
+            yield from split_partitions(df, partition)
+            return
+        for key, df in iter_partitions(
+            self.db_path + '/sscc.sqlite', 'banco_invico', partition,
+            ejercicio=ejercicio
+        ):
+            yield key, self.map_banco_invico(df, clasificar=clasificar)
+
+    # --------------------------------------------------
+    def map_banco_invico(
+        self, df:pd.DataFrame, clasificar:bool = False) -> pd.DataFrame:
         map_to = self.ctas_ctes.loc[:,['map_to', 'sscc_cta_cte']]
         df = pd.merge(
             df, map_to, how='left',
             left_on='cta_cte', right_on='sscc_cta_cte')
         df['cta_cte'] = df['map_to']
         df.drop(['map_to', 'sscc_cta_cte'], axis='columns', inplace=True)
-        self.sscc_banco_invico = df
-        return self.sscc_banco_invico
+        self.check_quality('sscc_banco_invico', df)
+        if clasificar:
+            # clase_flujo_caja y grupo_imputacion (categóricas, ver utils/imputaciones.json)
+            df = self.dimension('sscc_imputaciones').lookup(
+                df, on='cod_imputacion', columns=CLASIFICACION_COLS
+            )
+            df['clase_flujo_caja'] = df['clase_flujo_caja'].fillna(CLASE_OTROS)
+        return df
+
+    # --------------------------------------------------
+    def update_banco_invico_saldo_mensual(self) -> pd.DataFrame:
+        """
+        Recalcula el saldo de cierre de cada cta_cte al final de cada mes
+        (acumulado desde el inicio) y lo persiste en el almacén local.
+        Se ejecuta al actualizar sscc.sqlite o cuando éste cambió.
+        """
+        # Se recorre por partición (ver iter_banco_invico), arrastrando el
+        # último saldo de cada cta_cte a la siguiente
+        saldos, saldo_anterior = [], pd.Series(dtype=float)
+        for _, df in self.iter_banco_invico(ejercicio=None):
+            df = df.sort_values(by=['fecha'], ascending=True)
+            df['saldo'] = (
+                df.groupby('cta_cte')['importe'].cumsum()
+                + df['cta_cte'].map(saldo_anterior).fillna(0)
+            )
+            saldo_anterior = df.groupby('cta_cte')['saldo'].last().combine_first(
+                saldo_anterior
+            )
+            df = df.loc[:, ['ejercicio', 'mes', 'cta_cte', 'saldo']]
+            df = df.fillna(0)
+            saldos.append(
+                df.groupby(['ejercicio', 'mes', 'cta_cte']).last().reset_index()
+            )
+        df = pd.concat(saldos, ignore_index=True) if saldos else pd.DataFrame(
+            columns=['ejercicio', 'mes', 'cta_cte', 'saldo']
+        )
+        LocalStore(self.db_path).write_table(
+            df, BANCO_INVICO_SALDO_MENSUAL_TABLE,
+            fingerprint=file_fingerprint(self.db_path + '/sscc.sqlite'),
+            dtype={'saldo': 'REAL'}, index_cols=['ejercicio', 'cta_cte']
+        )
+        return df
+
+    # --------------------------------------------------
+    def import_banco_invico_saldo_mensual(
+        self, ejercicio_to:str = None) -> pd.DataFrame:
+        """Saldos de cierre mensuales por cta_cte hasta ejercicio_to inclusive"""
+        where, params = None, ()
+        if ejercicio_to is not None:
+            where, params = 'CAST(ejercicio AS INTEGER) <= ?', (int(ejercicio_to),)
+        df = LocalStore(self.db_path).read_table(
+            BANCO_INVICO_SALDO_MENSUAL_TABLE,
+            fingerprint=file_fingerprint(self.db_path + '/sscc.sqlite'),
+            where=where, params=params
+        )
+        if df is None:
+            df = self.update_banco_invico_saldo_mensual()
+            if ejercicio_to is not None:
+                df = df.loc[df['ejercicio'].astype(int) <= int(ejercicio_to)]
+        df = df.astype({'ejercicio': str, 'mes': str, 'cta_cte': str})
+        df.reset_index(drop=True, inplace=True)
+        return df
 
     # --------------------------------------------------
     def import_banco_siif(self, ejercicio:str = None) -> pd.DataFrame:
         df = self.import_siif_rcocc31(
-            ejercicio = self.ejercicio, cta_contable = '1112-2-6'
+            ejercicio = ejercicio, cta_contable = '1112-2-6'
         )
         df = df.rename(columns={
             'auxiliar_1': 'cta_cte'
@@ -857,7 +953,7 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_sdo_final_banco_invico(self, ejercicio:str = None) -> pd.DataFrame:
-        df = SdoFinalBancoINVICO().from_sql(self.db_path + '/sscc.sqlite')
+        df = read_sql('SdoFinalBancoINVICO', self.db_path + '/sscc.sqlite')
         if ejercicio is not None:
             if isinstance(ejercicio, list):
                 df = df.loc[df['ejercicio'].isin(ejercicio)]
@@ -874,63 +970,63 @@ class ImportDataFrame(HanglingPath):
 
     # --------------------------------------------------
     def import_barrios_nuevos(self, ejercicio:str = None) -> pd.DataFrame:
-        df = BarriosNuevos().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('BarriosNuevos', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_resumen_facturado(self, ejercicio:str = None) -> pd.DataFrame:
-        df = ResumenFacturado().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('ResumenFacturado', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_resumen_recaudado(self, ejercicio:str = None) -> pd.DataFrame:
-        df = ResumenRecaudado().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('ResumenRecaudado', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_saldo_barrio_variacion(self, ejercicio:str = None) -> pd.DataFrame:
-        df = SaldoBarrioVariacion().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('SaldoBarrioVariacion', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_saldo_barrio(self, ejercicio:str = None) -> pd.DataFrame:
-        df = SaldoBarrio().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('SaldoBarrio', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_saldo_recuperos_cobrar_variacion(self, ejercicio:str = None) -> pd.DataFrame:
-        df = SaldoRecuperosCobrarVariacion().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('SaldoRecuperosCobrarVariacion', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
     
     # --------------------------------------------------
     def import_saldo_motivo_por_barrio(self, ejercicio:str = None) -> pd.DataFrame:
-        df = SaldoMotivoPorBarrio().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('SaldoMotivoPorBarrio', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_saldo_motivo(self, ejercicio:str = None) -> pd.DataFrame:
-        df = SaldoMotivo().from_sql(self.db_path + '/sgv.sqlite') 
+        df = read_sql('SaldoMotivo', self.db_path + '/sgv.sqlite') 
         if ejercicio is not None:
             df = df.loc[df['ejercicio'] <= ejercicio]
         return df
 
     # --------------------------------------------------
     def import_sgo_listado_obras(self) -> pd.DataFrame:
-        df = ListadoObras().from_sql(self.db_path + '/sgo.sqlite')
+        df = read_sql('ListadoObras', self.db_path + '/sgo.sqlite')
         df = df.loc[:, [
             'cod_obra', 'obra', 'contratista', 'localidad', 'tipo_obra',
             'operatoria', 'fecha_inicio', 'fecha_fin', 'avance_fis_real',
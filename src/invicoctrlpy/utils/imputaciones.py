@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Clasificación de los cod_imputacion del SSCC (clase de flujo de
+    caja, grupo de imputación) definida en imputaciones.json. Junto con el
+    listado de imputaciones del SSCC forma la dimensión 'sscc_imputaciones'
+    (ver utils.dimensions), que se agrega como columnas categóricas al
+    importar Banco INVICO.
+"""
+
+__all__ = [
+    'IMPUTACIONES_FILE', 'CLASE_OTROS', 'CLASIFICACION_COLS',
+    'load_clasificacion', 'build_sscc_imputaciones'
+]
+
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+IMPUTACIONES_FILE = os.path.join(os.path.dirname(__file__), 'imputaciones.json')
+CLASE_OTROS = '4 - OTROS'
+CLASIFICACION_COLS = ['clase_flujo_caja', 'grupo_imputacion']
+
+
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def load_clasificacion(file_path:str = IMPUTACIONES_FILE) -> pd.DataFrame:
+    """
+    Una fila por cod_imputacion con una columna categórica por
+    clasificación (las categorías respetan el orden del archivo)
+    """
+    with open(file_path, encoding='utf-8') as f:
+        data = json.load(f)
+    df = pd.DataFrame({'cod_imputacion': pd.Series(dtype=str)})
+    for col in CLASIFICACION_COLS:
+        mapping = pd.DataFrame(
+            [
+                (cod, categoria)
+                for categoria, codigos in data[col].items()
+                for cod in codigos
+            ],
+            columns=['cod_imputacion', col]
+        )
+        df = df.merge(mapping, how='outer', on='cod_imputacion')
+        df[col] = df[col].astype(pd.CategoricalDtype(list(data[col].keys())))
+    return df
+
+
+# --------------------------------------------------
+def build_sscc_imputaciones(import_df) -> pd.DataFrame:
+    df = import_df.import_sscc_listado_imputaciones()
+    df = df.loc[:, ['cod_imputacion', 'tipo']].drop_duplicates(subset=['cod_imputacion'])
+    # Se conservan también los códigos clasificados que no estén en el listado
+    df = df.merge(load_clasificacion(), how='outer', on='cod_imputacion')
+    df['clase_flujo_caja'] = df['clase_flujo_caja'].fillna(CLASE_OTROS)
+    return df
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Instrumentación de imports y controles. Cada método decorado (o
+    cada lectura SQLite vía read_sql) genera un Event con tiempo total y
+    propio, filas de entrada y salida, delta del pico de RSS y la tabla
+    leída. Los eventos van a los sinks registrados (memoria, JSON lines,
+    logging); si no hay ninguno, los decoradores sólo llaman a la función.
+"""
+
+__all__ = [
+    'Event', 'MemorySink', 'JsonLinesSink', 'LoggingSink',
+    'add_sink', 'remove_sink', 'recording', 'span',
+    'instrument', 'instrument_methods', 'instrument_class'
+]
+
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, List
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_SINKS:List = []
+_SINKS_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+# --------------------------------------------------
+def peak_rss_kb() -> int:
+    """Pico de memoria residente del proceso (KB), o 0 si no se puede medir"""
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# --------------------------------------------------
+def count_rows(*values) -> int:
+    return sum(len(value) for value in values if isinstance(value, pd.DataFrame))
+
+
+# --------------------------------------------------
+@dataclass
+class Event():
+    name:str
+    start:float
+    wall_time:float = 0.0
+    self_time:float = 0.0
+    rows_in:int = 0
+    rows_out:int = 0
+    rss_delta_kb:int = 0
+    source:str = None
+    parent:str = None
+    thread:str = field(default_factory=lambda: threading.current_thread().name)
+    error:str = None
+
+
+# --------------------------------------------------
+class MemorySink():
+    """Guarda los eventos en memoria; report() los resume por nombre"""
+
+    # --------------------------------------------------
+    def __init__(self):
+        self.events:List[Event] = []
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    def __call__(self, event:Event):
+        with self._lock:
+            self.events.append(event)
+
+    # --------------------------------------------------
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(event) for event in self.events])
+
+    # --------------------------------------------------
+    def report(self, sort_by:str = 'self_time') -> pd.DataFrame:
+        df = self.to_dataframe()
+        if df.empty:
+            return df
+        df = df.groupby('name').agg(
+            calls=('name', 'size'),
+            wall_time=('wall_time', 'sum'),
+            self_time=('self_time', 'sum'),
+            rows_in=('rows_in', 'sum'),
+            rows_out=('rows_out', 'sum'),
+            rss_delta_kb=('rss_delta_kb', 'sum'),
+            source=('source', 'first'),
+        )
+        df['self_%'] = df['self_time'] / df['self_time'].sum() * 100
+        return df.sort_values(by=sort_by, ascending=False).reset_index()
+
+
+# --------------------------------------------------
+class JsonLinesSink():
+    """Agrega un evento por línea (JSON) a file_path"""
+
+    # --------------------------------------------------
+    def __init__(self, file_path:str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    def __call__(self, event:Event):
+        line = json.dumps(asdict(event), default=str)
+        with self._lock:
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+# --------------------------------------------------
+class LoggingSink():
+    """Envía cada evento a un logger (DEBUG por defecto)"""
+
+    # --------------------------------------------------
+    def __init__(self, logger:logging.Logger = None, level:int = logging.DEBUG):
+        self.logger = logger or logging.getLogger('invicoctrlpy.profile')
+        self.level = level
+
+    # --------------------------------------------------
+    def __call__(self, event:Event):
+        self.logger.log(
+            self.level, '%s %.3fs (propio %.3fs) filas %s->%s rss +%sKB %s',
+            event.name, event.wall_time, event.self_time, event.rows_in,
+            event.rows_out, event.rss_delta_kb, event.source or ''
+        )
+
+
+# --------------------------------------------------
+def add_sink(sink:Callable[[Event], None]):
+    with _SINKS_LOCK:
+        _SINKS.append(sink)
+
+
+# --------------------------------------------------
+def remove_sink(sink:Callable[[Event], None]):
+    with _SINKS_LOCK:
+        if sink in _SINKS:
+            _SINKS.remove(sink)
+
+
+# --------------------------------------------------
+@contextmanager
+def recording(sink:Callable[[Event], None] = None):
+    """
+    Registra sink (por defecto un MemorySink nuevo) mientras dure el bloque:
+
+        with recording() as sink:
+            ControlRetenciones().icaro_vs_siif()
+        sink.report()
+    """
+    sink = MemorySink() if sink is None else sink
+    add_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_sink(sink)
+
+
+# --------------------------------------------------
+def emit(event:Event):
+    for sink in list(_SINKS):
+        sink(event)
+
+
+# --------------------------------------------------
+@contextmanager
+def span(name:str, source:str = None, rows_in:int = 0):
+    """
+    Mide el bloque como un Event. El tiempo de los spans anidados se descuenta
+    del tiempo propio (self_time) del span que los contiene.
+    """
+    if not _SINKS:
+        yield None
+        return
+    stack = getattr(_LOCAL, 'stack', None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    event = Event(
+        name=name, start=time.time(), rows_in=rows_in, source=source,
+        parent=stack[-1][0].name if stack else None
+    )
+    # [evento, tiempo de los hijos]
+    frame = [event, 0.0]
+    stack.append(frame)
+    rss = peak_rss_kb()
+    start = time.perf_counter()
+    try:
+        yield event
+    except BaseException as e:
+        event.error = repr(e)
+        raise
+    finally:
+        event.wall_time = time.perf_counter() - start
+        event.self_time = event.wall_time - frame[1]
+        event.rss_delta_kb = peak_rss_kb() - rss
+        stack.pop()
+        if stack:
+            stack[-1][1] += event.wall_time
+        emit(event)
+
+
+# --------------------------------------------------
+def instrument(func:Callable = None, *, name:str = None):
+    """Decorador: cada llamada a func se registra como un span"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _SINKS:
+                return func(*args, **kwargs)
+            rows_in = count_rows(*args, *kwargs.values())
+            with span(label, rows_in=rows_in) as event:
+                result = func(*args, **kwargs)
+                event.rows_out = count_rows(result)
+            return result
+
+        wrapper.__instrumented__ = True
+        return wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+# --------------------------------------------------
+def instrument_class(cls:type, prefixes:tuple = None) -> type:
+    """
+    Instrumenta los métodos públicos de cls (y de sus bases), o sólo los
+    que empiezan con alguno de prefixes. Se aplica una única vez por método.
+    """
+    for attr in dir(cls):
+        if attr.startswith('_'):
+            continue
+        if prefixes is not None and not attr.startswith(prefixes):
+            continue
+        method = inspect.getattr_static(cls, attr)
+        if not inspect.isfunction(method):
+            continue
+        if getattr(method, '__instrumented__', False):
+            continue
+        setattr(cls, attr, instrument(method, name=f'{cls.__name__}.{attr}'))
+    return cls
+
+
+# --------------------------------------------------
+def instrument_methods(*prefixes:str) -> Callable[[type], type]:
+    """Decorador de clase: instrumenta los métodos que empiezan con prefixes"""
+    def decorator(cls):
+        return instrument_class(cls, prefixes=prefixes)
+    return decorator
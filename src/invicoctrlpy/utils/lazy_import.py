@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Importación diferida de dependencias opcionales pesadas (plotly,
+    seaborn, ...). El módulo real se importa recién la primera vez que se
+    accede a uno de sus atributos, de modo que quien sólo usa las tablas no
+    paga el costo del stack de visualización.
+"""
+
+__all__ = ['LazyModule', 'lazy_import']
+
+import importlib
+import threading
+import types
+from typing import Callable
+
+
+# --------------------------------------------------
+class LazyModule(types.ModuleType):
+    """Proxy de un módulo que se importa en el primer acceso"""
+
+    # --------------------------------------------------
+    def __init__(
+        self, name:str, on_import:Callable[[types.ModuleType], None] = None,
+        install_hint:str = None
+    ):
+        super().__init__(name)
+        self._lazy_module = None
+        self._lazy_on_import = on_import
+        self._lazy_install_hint = install_hint
+        self._lazy_lock = threading.Lock()
+
+    # --------------------------------------------------
+    def _load(self) -> types.ModuleType:
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                try:
+                    module = importlib.import_module(self.__name__)
+                except ImportError as e:
+                    hint = self._lazy_install_hint or self.__name__.split('.')[0]
+                    raise ImportError(
+                        f"'{self.__name__}' es necesario para esta función "
+                        f"(pip install {hint})"
+                    ) from e
+                if self._lazy_on_import is not None:
+                    self._lazy_on_import(module)
+                self._lazy_module = module
+        return self._lazy_module
+
+    # --------------------------------------------------
+    def __getattr__(self, attr:str):
+        # Sólo se llama para atributos que no existen en el proxy
+        if attr.startswith('_lazy_'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    # --------------------------------------------------
+    def __dir__(self):
+        return dir(self._load())
+
+
+# --------------------------------------------------
+def lazy_import(
+    name:str, on_import:Callable[[types.ModuleType], None] = None,
+    install_hint:str = None
+) -> LazyModule:
+    """
+    Devuelve un proxy de name. on_import se ejecuta una única vez, con el
+    módulo real, al importarlo (ej. para fijar un tema de gráficos).
+    """
+    return LazyModule(name, on_import=on_import, install_hint=install_hint)
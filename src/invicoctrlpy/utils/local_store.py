@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Almacén local (SQLite) para tablas derivadas que no vale la pena
+    recalcular en cada corrida (ej. planillas Excel legadas). Cada tabla se
+    guarda junto a una huella (hash) de su origen para saber cuándo invalidarla.
+"""
+
+__all__ = [
+    'LocalStore', 'file_hash', 'file_fingerprint', 'db_fingerprint',
+    'CACHE_FILE_NAME'
+]
+
+import datetime as dt
+import glob
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+CACHE_FILE_NAME = 'invicoctrlpy_cache.sqlite'
+FINGERPRINTS_TABLE = '_fingerprints'
+
+
+# --------------------------------------------------
+def file_hash(file_path:str, chunk_size:int = 1024 * 1024) -> str:
+    """Devuelve el sha256 del contenido de file_path"""
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# --------------------------------------------------
+def file_fingerprint(file_path:str) -> str:
+    """
+    Huella barata (mtime + tamaño) para bases SQLite grandes, donde
+    calcular el hash completo en cada lectura no tiene sentido
+    """
+    stat = os.stat(file_path)
+    return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+
+# --------------------------------------------------
+def db_fingerprint(db_path:str) -> tuple:
+    """Huella de todos los SQLite de db_path (salvo el almacén local)"""
+    files = sorted(glob.glob(os.path.join(db_path, '*.sqlite')))
+    return tuple(
+        (os.path.basename(file), file_fingerprint(file)) for file in files
+        if os.path.basename(file) != CACHE_FILE_NAME
+    )
+
+
+# --------------------------------------------------
+@dataclass
+class LocalStore():
+    db_path:str
+    file_name:str = CACHE_FILE_NAME
+    file_path:str = field(init=False)
+
+    # --------------------------------------------------
+    def __post_init__(self):
+        self.file_path = os.path.join(self.db_path, self.file_name)
+
+    # --------------------------------------------------
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.file_path)
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {FINGERPRINTS_TABLE} ('
+            'table_name TEXT PRIMARY KEY, fingerprint TEXT, updated_at TEXT)'
+        )
+        return conn
+
+    # --------------------------------------------------
+    def get_fingerprint(self, table_name:str) -> str:
+        if not os.path.isfile(self.file_path):
+            return None
+        with self.connect() as conn:
+            row = conn.execute(
+                f'SELECT fingerprint FROM {FINGERPRINTS_TABLE} WHERE table_name = ?',
+                (table_name,)
+            ).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    # --------------------------------------------------
+    def read_table(
+        self, table_name:str, fingerprint:str = None,
+        columns:list = None, where:str = None, params:tuple = (),
+        parse_dates:list = None
+    ) -> pd.DataFrame:
+        """
+        Lee table_name del almacén. Si se indica fingerprint y no coincide con
+        la guardada, la tabla se considera vencida y se devuelve None.
+        """
+        stored = self.get_fingerprint(table_name)
+        if stored is None:
+            return None
+        if fingerprint is not None and stored != fingerprint:
+            return None
+        select = ', '.join(f'"{col}"' for col in columns) if columns else '*'
+        query = f'SELECT {select} FROM "{table_name}"'
+        if where:
+            query = query + ' WHERE ' + where
+        conn = self.connect()
+        try:
+            df = pd.read_sql(query, conn, params=params, parse_dates=parse_dates)
+        finally:
+            conn.close()
+        return df
+
+    # --------------------------------------------------
+    def write_table(
+        self, df:pd.DataFrame, table_name:str, fingerprint:str,
+        dtype:dict = None, index_cols:list = None
+    ) -> None:
+        """
+        Reemplaza table_name con df (tipado según dtype) y registra su fingerprint.
+        index_cols crea un índice SQLite sobre esas columnas.
+        """
+        conn = self.connect()
+        try:
+            with conn:
+                df.to_sql(
+                    table_name, conn, if_exists='replace',
+                    index=False, dtype=dtype
+                )
+                if index_cols:
+                    conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS "idx_{table_name}" ON "{table_name}" ('
+                        + ', '.join(f'"{col}"' for col in index_cols) + ')'
+                    )
+                conn.execute(
+                    f'INSERT OR REPLACE INTO {FINGERPRINTS_TABLE} VALUES (?, ?, ?)',
+                    (table_name, fingerprint, dt.datetime.now().isoformat())
+                )
+        finally:
+            conn.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Lectura particionada (por ejercicio o por mes) de las tablas
+    grandes, para el modo de memoria acotada. Dentro de memory_budget() los
+    iteradores de ImportDataFrame (iter_siif_rcocc31, iter_banco_invico) leen
+    cada partición directamente del SQLite, de modo que el pico de memoria
+    lo define una partición y no la historia completa. Fuera de ese modo
+    leen la tabla entera (una vez, vía read_sql) y la recorren por partes.
+    Ambos caminos deben dar las mismas columnas y tipos (ver
+    benchmarks/check_partitions.py).
+
+Ejemplo:
+    with memory_budget('mes'):
+        ControlBanco(ejercicio=['2024']).update_banco_invico_saldo_mensual()
+"""
+
+__all__ = [
+    'memory_budget', 'active_partition', 'iter_partitions',
+    'partition_keys', 'split_partitions', 'align_partitions', 'PARTITIONS'
+]
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype
+
+from .periods import mes_to_periodo
+from .sql_engine import TABLES, parse_fechas
+
+PARTITIONS = ('ejercicio', 'mes')
+
+_PARTITION = None
+
+
+# --------------------------------------------------
+@contextmanager
+def memory_budget(partition:str = 'ejercicio'):
+    """Activa la lectura particionada ('ejercicio' o 'mes') en el bloque"""
+    global _PARTITION
+    if partition not in PARTITIONS:
+        raise ValueError(f'partition debe ser uno de {PARTITIONS}')
+    previous, _PARTITION = _PARTITION, partition
+    try:
+        yield partition
+    finally:
+        _PARTITION = previous
+
+
+# --------------------------------------------------
+def active_partition() -> str:
+    """'ejercicio', 'mes' o None si no hay un memory_budget activo"""
+    return _PARTITION
+
+
+# --------------------------------------------------
+def sort_keys(keys:Iterable[str], partition:str) -> List[str]:
+    keys = [str(key) for key in keys if key is not None]
+    if partition == 'mes':
+        periodos = mes_to_periodo(pd.Series(keys, dtype=object))
+        return [key for _, key in sorted(zip(periodos, keys))]
+    return sorted(keys, key=int)
+
+
+# --------------------------------------------------
+def where_clause(filters:Dict[str, object]) -> Tuple[str, List]:
+    conditions, params = [], []
+    for col, value in filters.items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        conditions.append(f'"{col}" IN ({", ".join(["?"] * len(values))})')
+        params.extend(str(v) for v in values)
+    return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+
+# --------------------------------------------------
+def partition_keys(
+    sqlite_path:str, table:str, partition:str = 'ejercicio', **filters
+) -> List[str]:
+    """Valores distintos de partition en table (ordenados cronológicamente)"""
+    table = TABLES[table][1]
+    where, params = where_clause(filters)
+    with sqlite3.connect(sqlite_path) as conn:
+        rows = conn.execute(
+            f'SELECT DISTINCT "{partition}" FROM "{table}"{where}', params
+        ).fetchall()
+    return sort_keys([row[0] for row in rows], partition)
+
+
+# --------------------------------------------------
+def parse_types(df:pd.DataFrame) -> pd.DataFrame:
+    """
+    Tipos que el lector de invicodatpy restituye al leer de SQLite: fecha*
+    como datetime y los indicadores es_* (guardados como 0/1) como bool
+    """
+    df = parse_fechas(df)
+    for col in df.columns:
+        if col.startswith('es_') and not is_bool_dtype(df[col]):
+            df[col] = df[col].astype(bool)
+    return df
+
+
+# --------------------------------------------------
+def iter_partitions(
+    sqlite_path:str, table:str, partition:str = 'ejercicio', **filters
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    (clave, DataFrame) por cada valor de partition en table (clave lógica de
+    sql_engine.TABLES), en orden cronológico. filters ({columna: valor o
+    lista}) se aplican en el WHERE, antes de traer las filas a memoria.
+    """
+    sql_table = TABLES[table][1]
+    for key in partition_keys(sqlite_path, table, partition, **filters):
+        where, params = where_clause({**filters, partition: key})
+        with sqlite3.connect(sqlite_path) as conn:
+            df = pd.read_sql(f'SELECT * FROM "{sql_table}"{where}', conn, params=params)
+        yield key, parse_types(df)
+
+
+# --------------------------------------------------
+def split_partitions(
+    df:pd.DataFrame, partition:str = 'ejercicio'
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Recorre un DataFrame ya leído con la misma forma que iter_partitions"""
+    groups = dict(tuple(df.groupby(partition, sort=False)))
+    for key in sort_keys(groups, partition):
+        yield key, groups.pop(key).reset_index(drop=True)
+
+
+# --------------------------------------------------
+def align_partitions(
+    keys:Iterable[str], *iterators:Iterator[Tuple[str, pd.DataFrame]]
+) -> Iterator[Tuple]:
+    """
+    Recorre a la par varios iteradores de particiones (en el mismo orden que
+    keys) y devuelve (clave, df_1, df_2, ...) para cada clave de keys; None
+    si un iterador no tiene esa partición. Sólo hay una partición por
+    iterador en memoria.
+    """
+    keys = list(keys)
+    wanted = set(keys)
+    pending = [next(iterator, None) for iterator in iterators]
+    for key in keys:
+        frames = []
+        for i, iterator in enumerate(iterators):
+            while pending[i] is not None and pending[i][0] not in wanted:
+                pending[i] = next(iterator, None)
+            if pending[i] is not None and pending[i][0] == key:
+                frames.append(pending[i][1])
+                pending[i] = next(iterator, None)
+            else:
+                frames.append(None)
+        yield (key, *frames)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Períodos mensuales compactos. Los reportes SIIF traen el mes como
+    string 'MM/YYYY' (mes, mes_hasta); acá se representan como enteros int32
+    YYYYMM, de modo que ordenar, buscar el último mes o sumar meses son
+    operaciones enteras vectorizadas.
+"""
+
+__all__ = [
+    'mes_to_periodo', 'periodo_to_mes', 'periodo_to_ejercicio',
+    'add_months', 'last_periodo'
+]
+
+import pandas as pd
+
+PERIODO_DTYPE = 'int32'
+
+
+# --------------------------------------------------
+def mes_to_periodo(mes:pd.Series) -> pd.Series:
+    """'MM/YYYY' -> YYYYMM (int32)"""
+    mes = mes.astype(str)
+    return (mes.str[-4:] + mes.str[:2]).astype(PERIODO_DTYPE)
+
+
+# --------------------------------------------------
+def periodo_to_mes(periodo:pd.Series) -> pd.Series:
+    """YYYYMM -> 'MM/YYYY'"""
+    return (
+        (periodo % 100).astype(str).str.zfill(2)
+        + '/' + (periodo // 100).astype(str)
+    )
+
+
+# --------------------------------------------------
+def periodo_to_ejercicio(periodo:pd.Series) -> pd.Series:
+    """YYYYMM -> 'YYYY'"""
+    return (periodo // 100).astype(str)
+
+
+# --------------------------------------------------
+def add_months(periodo:pd.Series, months:int) -> pd.Series:
+    """Suma (o resta) months meses a cada período"""
+    total = (periodo // 100) * 12 + (periodo % 100) - 1 + months
+    return ((total // 12) * 100 + total % 12 + 1).astype(PERIODO_DTYPE)
+
+
+# --------------------------------------------------
+def last_periodo(periodo:pd.Series, by:pd.Series = None):
+    """
+    Último período de la serie. Si se indica by, devuelve una serie alineada
+    con periodo que contiene el máximo de cada grupo.
+    """
+    if by is None:
+        return periodo.max()
+    return periodo.groupby(by).transform('max')
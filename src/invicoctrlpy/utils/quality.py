@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Reglas de calidad de datos que se evalúan al importar cada tabla
+    (unicidad, cuentas mapeadas, signo de los importes y sufijo de ejercicio
+    de los comprobantes). La integridad con ctas_ctes la cubre NotNull: las
+    reglas corren después del cruce con ctas_ctes (left join), así que una
+    cuenta de origen inexistente en ctas_ctes queda con cta_cte nulo. Cada
+    regla es una
+    máscara vectorizada sobre la tabla; el resultado es un reporte compacto
+    (una fila por regla violada). Las reglas se evalúan sólo dentro de un
+    data_quality(), de modo que fuera de ese modo la importación no cambia.
+
+Ejemplo:
+    with data_quality('raise') as dq:
+        ControlRetenciones(ejercicio=['2024']).icaro_vs_siif()
+    dq.report()
+"""
+
+__all__ = [
+    'Rule', 'Unique', 'NotNull', 'Sign', 'EjercicioSuffix',
+    'RULES', 'DataQualityError', 'QualityCheck', 'data_quality',
+    'check_rules', 'validate', 'MODES'
+]
+
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dedup import SGF_RENDICION
+
+MODES = ('warn', 'raise')
+SEVERITIES = ('error', 'warning')
+MAX_EXAMPLES = 5
+
+_CHECK = None
+
+
+# --------------------------------------------------
+class DataQualityError(ValueError):
+    """Una tabla importada viola reglas de severidad 'error'"""
+
+    # --------------------------------------------------
+    def __init__(self, report:pd.DataFrame):
+        self.report = report
+        super().__init__(
+            'Reglas de calidad violadas:\n' + report.to_string(index=False)
+        )
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class Rule():
+    """
+    Regla base. where ({columna: valor o lista}) limita la regla a esas
+    filas; mask devuelve True en las filas que la violan.
+    """
+    name:str
+    severity:str = 'error'
+    where:dict = None
+
+    # --------------------------------------------------
+    def __post_init__(self):
+        if self.severity not in SEVERITIES:
+            raise ValueError(f'severity debe ser uno de {SEVERITIES}')
+
+    # --------------------------------------------------
+    def scope(self, df:pd.DataFrame) -> np.ndarray:
+        mask = np.ones(len(df), dtype=bool)
+        for col, value in (self.where or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= df[col].isin(values).to_numpy()
+        return mask
+
+    # --------------------------------------------------
+    def columns(self) -> List[str]:
+        return list(self.where or {})
+
+    # --------------------------------------------------
+    def violations(self, df:pd.DataFrame) -> np.ndarray:
+        raise NotImplementedError
+
+    # --------------------------------------------------
+    def mask(self, df:pd.DataFrame) -> np.ndarray:
+        return self.violations(df) & self.scope(df)
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class Unique(Rule):
+    """Filas repetidas en cols (se marcan las copias, no la primera)"""
+    cols:tuple = ()
+
+    # --------------------------------------------------
+    def columns(self) -> List[str]:
+        return super().columns() + list(self.cols)
+
+    # --------------------------------------------------
+    def violations(self, df:pd.DataFrame) -> np.ndarray:
+        # Las columnas de where entran en la clave: las copias se buscan
+        # dentro de cada partición en una sola pasada
+        subset = list(dict.fromkeys(list(self.cols) + list(self.where or {})))
+        return df.duplicated(subset=subset).to_numpy()
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class NotNull(Rule):
+    """
+    Valores nulos en cols (p.ej. cta_cte sin map_to en ctas_ctes o
+    inexistente en ctas_ctes)
+    """
+    cols:tuple = ()
+
+    # --------------------------------------------------
+    def columns(self) -> List[str]:
+        return super().columns() + list(self.cols)
+
+    # --------------------------------------------------
+    def violations(self, df:pd.DataFrame) -> np.ndarray:
+        return df[list(self.cols)].isna().any(axis=1).to_numpy()
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class Sign(Rule):
+    """Importes de col con signo distinto de sign ('+' o '-'); el cero vale"""
+    col:str = 'importe'
+    sign:str = '+'
+
+    # --------------------------------------------------
+    def columns(self) -> List[str]:
+        return super().columns() + [self.col]
+
+    # --------------------------------------------------
+    def violations(self, df:pd.DataFrame) -> np.ndarray:
+        serie = pd.to_numeric(df[self.col], errors='coerce')
+        return (serie < 0 if self.sign == '+' else serie > 0).to_numpy()
+
+
+# --------------------------------------------------
+@dataclass(frozen=True)
+class EjercicioSuffix(Rule):
+    """
+    Comprobantes ('00012/24') cuyo sufijo no coincide con los dos últimos
+    dígitos de ejercicio_col
+    """
+    col:str = 'nro_comprobante'
+    ejercicio_col:str = 'ejercicio'
+
+    # --------------------------------------------------
+    def columns(self) -> List[str]:
+        return super().columns() + [self.col, self.ejercicio_col]
+
+    # --------------------------------------------------
+    def violations(self, df:pd.DataFrame) -> np.ndarray:
+        serie = df[self.col].astype('string')
+        suffix = serie.str.split('/', n=1).str[1].str[:2]
+        ejercicio = df[self.ejercicio_col].astype('string').str[-2:]
+        return (serie.notna() & (suffix != ejercicio).fillna(True)).to_numpy()
+
+
+CUENTA_MAPEADA = NotNull(
+    'cta_cte sin map_to o inexistente en ctas_ctes', cols=('cta_cte',)
+)
+SUFIJO_EJERCICIO = EjercicioSuffix('nro_comprobante de otro ejercicio')
+
+RULES:Dict[str, Tuple[Rule, ...]] = {
+    'icaro_carga': (
+        CUENTA_MAPEADA, SUFIJO_EJERCICIO,
+        Sign('importe negativo', severity='warning', col='importe'),
+    ),
+    'siif_rcg01_uejp': (
+        CUENTA_MAPEADA, SUFIJO_EJERCICIO,
+    ),
+    'siif_comprobantes': (
+        CUENTA_MAPEADA, SUFIJO_EJERCICIO,
+    ),
+    'siif_rdeu012': (
+        CUENTA_MAPEADA,
+        Sign('saldo negativo', severity='warning', col='saldo'),
+    ),
+    'sgf_resumen_rend': (
+        CUENTA_MAPEADA,
+        Unique('rendición repetida', severity='warning', cols=SGF_RENDICION),
+    ),
+    'sgf_resumen_rend_cuit': (
+        CUENTA_MAPEADA,
+        Unique('rendición repetida', severity='warning', cols=SGF_RENDICION),
+        Sign(
+            'importe_bruto negativo', severity='warning', col='importe_bruto',
+            where={'origen': ['OBRAS', 'FUNCIONAMIENTO', 'EPAM']}
+        ),
+    ),
+    'sscc_banco_invico': (
+        CUENTA_MAPEADA,
+        Sign(
+            'depósito negativo', severity='warning', col='importe',
+            where={'movimiento': 'DEPOSITO'}
+        ),
+    ),
+}
+
+
+# --------------------------------------------------
+def check_rules(
+    df:pd.DataFrame, table:str, rules:Tuple[Rule, ...] = None
+) -> pd.DataFrame:
+    """
+    Evalúa rules (por defecto RULES[table]) sobre df. Devuelve una fila por
+    regla violada: tabla, regla, severidad, filas y algunos índices de
+    ejemplo. Las reglas cuyas columnas no están en df se omiten.
+    """
+    rules = RULES.get(table, ()) if rules is None else rules
+    rows = []
+    for rule in rules:
+        if any(col not in df.columns for col in rule.columns()):
+            continue
+        mask = rule.mask(df)
+        count = int(mask.sum())
+        if count:
+            rows.append({
+                'tabla': table, 'regla': rule.name, 'severidad': rule.severity,
+                'filas': count,
+                'ejemplos': df.index[mask][:MAX_EXAMPLES].tolist(),
+            })
+    return pd.DataFrame(
+        rows, columns=['tabla', 'regla', 'severidad', 'filas', 'ejemplos']
+    )
+
+
+# --------------------------------------------------
+@dataclass
+class QualityCheck():
+    mode:str = 'warn'
+    reports:List[pd.DataFrame] = field(default_factory=list)
+
+    # --------------------------------------------------
+    def report(self) -> pd.DataFrame:
+        """Violaciones de todas las tablas importadas en el bloque"""
+        if not self.reports:
+            return check_rules(pd.DataFrame(), '', rules=())
+        return pd.concat(self.reports, ignore_index=True)
+
+
+# --------------------------------------------------
+@contextmanager
+def data_quality(mode:str = 'warn'):
+    """
+    Evalúa las reglas de RULES al importar cada tabla. mode='warn' emite un
+    warning por tabla con violaciones; mode='raise' además corta con
+    DataQualityError si alguna regla de severidad 'error' se viola.
+    """
+    global _CHECK
+    if mode not in MODES:
+        raise ValueError(f'mode debe ser uno de {MODES}')
+    previous, _CHECK = _CHECK, QualityCheck(mode=mode)
+    try:
+        yield _CHECK
+    finally:
+        _CHECK = previous
+
+
+# --------------------------------------------------
+def validate(table:str, df:pd.DataFrame) -> pd.DataFrame:
+    """Evalúa las reglas de table si hay un data_quality activo"""
+    check = _CHECK
+    if check is None or table not in RULES:
+        return df
+    report = check_rules(df, table)
+    if report.empty:
+        return df
+    check.reports.append(report)
+    if check.mode == 'raise' and (report['severidad'] == 'error').any():
+        raise DataQualityError(report)
+    warnings.warn(
+        f'{table}: ' + '; '.join(
+            f"{regla} ({filas} filas)"
+            for regla, filas in zip(report['regla'], report['filas'])
+        ), stacklevel=3
+    )
+    return df
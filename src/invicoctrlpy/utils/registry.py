@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Registro de lectores (invicodatpy) y actualizadores (invicodb) que
+    se importan recién al usarse. Importar un control no carga los parsers
+    de todos los sistemas de origen: read_sql recibe el nombre del lector y
+    la clase se resuelve en la primera lectura; update_db se importa recién
+    al actualizar las bases.
+"""
+
+__all__ = ['READERS', 'get_reader', 'model_name', 'update_db']
+
+import importlib
+import threading
+from typing import Dict, Union
+
+from .lazy_import import lazy_import
+
+# Lector -> módulo de invicodatpy que lo define
+READERS:Dict[str, str] = {
+    'MigrateIcaro': 'invicodatpy.icaro.migrate_icaro',
+    'MigrateSlave': 'invicodatpy.slave.migrate_slave',
+    'JoinResumenRendProvCuit': 'invicodatpy.sgf.all',
+    'ResumenRendProv': 'invicodatpy.sgf.all',
+    'BarriosNuevos': 'invicodatpy.sgv.all',
+    'ResumenFacturado': 'invicodatpy.sgv.all',
+    'ResumenRecaudado': 'invicodatpy.sgv.all',
+    'SaldoBarrio': 'invicodatpy.sgv.all',
+    'SaldoBarrioVariacion': 'invicodatpy.sgv.all',
+    'SaldoMotivo': 'invicodatpy.sgv.all',
+    'SaldoMotivoPorBarrio': 'invicodatpy.sgv.all',
+    'SaldoRecuperosCobrarVariacion': 'invicodatpy.sgv.all',
+    'ComprobantesGtosRcg01Uejp': 'invicodatpy.siif.all',
+    'ComprobantesRecRci02': 'invicodatpy.siif.all',
+    'DeudaFlotanteRdeu012': 'invicodatpy.siif.all',
+    'DeudaFlotanteRdeu012b2C': 'invicodatpy.siif.all',
+    'FormGtoRfpP605b': 'invicodatpy.siif.all',
+    'JoinComprobantesGtosGpoPart': 'invicodatpy.siif.all',
+    'JoinPptoGtosFteDesc': 'invicodatpy.siif.all',
+    'MayorContableRcocc31': 'invicodatpy.siif.all',
+    'PptoGtosDescRf610': 'invicodatpy.siif.all',
+    'PptoGtosFteRf602': 'invicodatpy.siif.all',
+    'PptoRecRi102': 'invicodatpy.siif.all',
+    'ResumenContableCtaRvicon03': 'invicodatpy.siif.all',
+    'ResumenFdosRfondo07tp': 'invicodatpy.siif.all',
+    'BancoINVICO': 'invicodatpy.sscc.all',
+    'CtasCtes': 'invicodatpy.sscc.all',
+    'ListadoImputaciones': 'invicodatpy.sscc.all',
+    'SdoFinalBancoINVICO': 'invicodatpy.sscc.all',
+    'ListadoObras': 'invicodatpy.sgo.all',
+}
+
+_CLASSES:Dict[str, type] = {}
+_LOCK = threading.Lock()
+
+update_db = lazy_import('invicodb.update.update_db', install_hint='invicodb')
+
+
+# --------------------------------------------------
+def model_name(model:Union[str, type]) -> str:
+    return model if isinstance(model, str) else model.__name__
+
+
+# --------------------------------------------------
+def get_reader(model:Union[str, type]) -> type:
+    """Clase lectora de invicodatpy (se importa su módulo la primera vez)"""
+    if not isinstance(model, str):
+        return model
+    with _LOCK:
+        cls = _CLASSES.get(model)
+        if cls is None:
+            if model not in READERS:
+                raise KeyError(f'Lector desconocido: {model}')
+            try:
+                module = importlib.import_module(READERS[model])
+            except ImportError as e:
+                raise ImportError(
+                    f"'{READERS[model]}' es necesario para leer {model} "
+                    "(pip install invicodatpy)"
+                ) from e
+            cls = _CLASSES[model] = getattr(module, model)
+    return cls
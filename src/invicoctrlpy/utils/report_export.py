@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Exportación de informes de varias hojas. Las hojas se calculan en
+    paralelo y, a medida que están listas (en el orden pedido), se vuelcan
+    por bloques a un libro openpyxl en modo write-only, que no mantiene el
+    modelo de objetos del libro en memoria. Opcionalmente cada hoja se guarda
+    también como CSV o Parquet en una carpeta con el nombre del libro.
+"""
+
+__all__ = ['export_report', 'SIDECAR_FORMATS']
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Union
+
+import pandas as pd
+
+from .lazy_import import lazy_import
+
+openpyxl = lazy_import('openpyxl')
+
+SIDECAR_FORMATS = ('csv', 'parquet')
+CHUNK_SIZE = 10000
+MAX_SHEET_NAME = 31
+
+Sheet = Union[pd.DataFrame, Callable[[], pd.DataFrame]]
+
+
+# --------------------------------------------------
+def iter_rows(df:pd.DataFrame, chunk_size:int = CHUNK_SIZE) -> Iterable[tuple]:
+    """
+    Filas de df listas para openpyxl (NaN/NaT -> celda vacía). Se convierte
+    de a chunk_size filas para no duplicar el DataFrame completo en memoria.
+    """
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+# --------------------------------------------------
+def write_sheet(workbook, sheet_name:str, df:pd.DataFrame):
+    worksheet = workbook.create_sheet(title=sheet_name[:MAX_SHEET_NAME])
+    worksheet.append([str(col) for col in df.columns])
+    for row in iter_rows(df):
+        worksheet.append(row)
+
+
+# --------------------------------------------------
+def write_sidecar(df:pd.DataFrame, file_name:str, fmt:str):
+    if fmt == 'csv':
+        df.to_csv(file_name, index=False)
+    else:
+        df.to_parquet(file_name, index=False)
+
+
+# --------------------------------------------------
+def export_report(
+    file_name:str, sheets:Dict[str, Sheet], sidecars:Iterable[str] = (),
+    max_workers:int = 4
+) -> List[str]:
+    """
+    Escribe sheets ({nombre_hoja: DataFrame o función que lo devuelve}) en
+    file_name (.xlsx). Las funciones se ejecutan en max_workers hilos mientras
+    se escriben las hojas ya calculadas; nunca hay más de max_workers hojas
+    pendientes de escribir y cada una se libera apenas se escribe. sidecars admite 'csv' y/o 'parquet'. Devuelve los archivos
+    generados.
+    """
+    sidecars = tuple(sidecars)
+    for fmt in sidecars:
+        if fmt not in SIDECAR_FORMATS:
+            raise ValueError(f'sidecar debe ser uno de {SIDECAR_FORMATS}')
+    sidecar_path = os.path.splitext(file_name)[0]
+    if sidecars:
+        os.makedirs(sidecar_path, exist_ok=True)
+
+    files = [file_name]
+    workbook = openpyxl.Workbook(write_only=True)
+    max_workers = max(max_workers, 1)
+    queued = iter(sheets.items())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = deque()
+        while True:
+            # A lo sumo max_workers hojas pendientes: la siguiente se lanza
+            # recién después de escribir una, así una hoja terminada no
+            # queda retenida en memoria detrás de otra más lenta
+            for name, sheet in islice(queued, max_workers - len(futures)):
+                futures.append(
+                    (name, executor.submit(sheet) if callable(sheet) else sheet)
+                )
+            if not futures:
+                break
+            name, pending = futures.popleft()
+            df = pending if isinstance(pending, pd.DataFrame) else pending.result()
+            write_sheet(workbook, name, df)
+            for fmt in sidecars:
+                sidecar = os.path.join(sidecar_path, f'{name}.{fmt}')
+                write_sidecar(df, sidecar, fmt)
+                files.append(sidecar)
+            del df, pending
+    workbook.save(file_name)
+    return files
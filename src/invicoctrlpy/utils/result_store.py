@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Almacén persistente de resultados de controles. Cada resultado se
+    guarda (Parquet si hay pyarrow/fastparquet, si no pickle) bajo una clave
+    que combina método, parámetros y huellas de las bases de entrada, de modo
+    que repetir un control con las mismas entradas lo lee del disco. Las
+    entradas se descartan por antigüedad (último uso) y por tamaño total.
+
+Ejemplo:
+    use_result_store(ResultStore(db_path))
+    ControlRetenciones(ejercicio=['2024']).icaro_vs_siif()  # calcula y guarda
+    ControlRetenciones(ejercicio=['2024']).icaro_vs_siif()  # lee del disco
+"""
+
+__all__ = [
+    'ResultStore', 'cached_result', 'use_result_store', 'active_result_store',
+    'RESULTS_FOLDER', 'FORMATS', 'default_format', 'write_frame', 'read_frame',
+    'call_params'
+]
+
+import datetime as dt
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import warnings
+from dataclasses import dataclass, field, fields, is_dataclass
+from importlib.util import find_spec
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from .local_store import db_fingerprint, file_fingerprint
+
+RESULTS_FOLDER = 'invicoctrlpy_results'
+INDEX_FILE_NAME = 'index.sqlite'
+INDEX_TABLE = 'results'
+FORMATS = {'parquet': '.parquet', 'pickle': '.pkl'}
+# Campos de los controles que no cambian el resultado
+IGNORED_FIELDS = ('update_db',)
+
+_STORE = None
+
+
+# --------------------------------------------------
+def default_format() -> str:
+    if find_spec('pyarrow') is not None or find_spec('fastparquet') is not None:
+        return 'parquet'
+    return 'pickle'
+
+
+# --------------------------------------------------
+def write_frame(df:pd.DataFrame, file_path:str):
+    """Guarda df en file_path (Parquet o pickle según la extensión)"""
+    # Se escribe aparte y se renombra: una lectura concurrente nunca ve
+    # un archivo a medio escribir
+    tmp_path = f'{file_path}.{threading.get_ident()}.tmp'
+    if file_path.endswith(FORMATS['parquet']):
+        df.to_parquet(tmp_path)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, file_path)
+
+
+# --------------------------------------------------
+def read_frame(file_path:str) -> pd.DataFrame:
+    if file_path.endswith(FORMATS['parquet']):
+        return pd.read_parquet(file_path)
+    return pd.read_pickle(file_path)
+
+
+# --------------------------------------------------
+@dataclass
+class ResultStore():
+    db_path:str
+    folder:str = RESULTS_FOLDER
+    max_age_days:float = 30
+    max_size_mb:float = 1024
+    fmt:str = None
+    path:str = field(init=False)
+    hits:int = field(init=False, default=0)
+    misses:int = field(init=False, default=0)
+
+    # --------------------------------------------------
+    def __post_init__(self):
+        self.path = os.path.join(self.db_path, self.folder)
+        self.fmt = self.fmt or default_format()
+        if self.fmt not in FORMATS:
+            raise ValueError(f'fmt debe ser uno de {tuple(FORMATS)}')
+        self._lock = threading.Lock()
+        self._previous = None
+
+    # --------------------------------------------------
+    def __enter__(self):
+        global _STORE
+        self._previous = _STORE
+        _STORE = self
+        return self
+
+    # --------------------------------------------------
+    def __exit__(self, *exc):
+        global _STORE
+        _STORE = self._previous
+        self._previous = None
+        return False
+
+    # --------------------------------------------------
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(self.path, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.path, INDEX_FILE_NAME))
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ('
+            'key TEXT PRIMARY KEY, method TEXT, params TEXT, file_name TEXT, '
+            'size INTEGER, created_at TEXT, last_used_at TEXT)'
+        )
+        return conn
+
+    # --------------------------------------------------
+    @staticmethod
+    def make_key(method:str, params:dict, inputs:tuple) -> str:
+        payload = json.dumps(
+            {'method': method, 'params': params, 'inputs': inputs},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # --------------------------------------------------
+    def get(self, key:str) -> pd.DataFrame:
+        """Resultado guardado bajo key, o None"""
+        with self._lock:
+            conn = self.connect()
+            try:
+                with conn:
+                    row = conn.execute(
+                        f'SELECT file_name FROM {INDEX_TABLE} WHERE key = ?', (key,)
+                    ).fetchone()
+                    if row is None:
+                        self.misses += 1
+                        return None
+                    file_path = os.path.join(self.path, row[0])
+                    if not os.path.isfile(file_path):
+                        conn.execute(f'DELETE FROM {INDEX_TABLE} WHERE key = ?', (key,))
+                        self.misses += 1
+                        return None
+                    conn.execute(
+                        f'UPDATE {INDEX_TABLE} SET last_used_at = ? WHERE key = ?',
+                        (dt.datetime.now().isoformat(), key)
+                    )
+            finally:
+                conn.close()
+            self.hits += 1
+        return read_frame(file_path)
+
+    # --------------------------------------------------
+    def put(self, key:str, method:str, params:dict, df:pd.DataFrame):
+        file_name = key + FORMATS[self.fmt]
+        file_path = os.path.join(self.path, file_name)
+        os.makedirs(self.path, exist_ok=True)
+        write_frame(df, file_path)
+        now = dt.datetime.now().isoformat()
+        with self._lock:
+            conn = self.connect()
+            try:
+                with conn:
+                    conn.execute(
+                        f'INSERT OR REPLACE INTO {INDEX_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (key, method, json.dumps(params, sort_keys=True, default=str),
+                         file_name, os.path.getsize(file_path), now, now)
+                    )
+            finally:
+                conn.close()
+        self.evict()
+
+    # --------------------------------------------------
+    def evict(self, max_age_days:float = None, max_size_mb:float = None) -> int:
+        """
+        Borra los resultados sin usar hace más de max_age_days y, si el total
+        supera max_size_mb, los menos usados recientemente. Devuelve cuántos
+        borró.
+        """
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        max_size_mb = self.max_size_mb if max_size_mb is None else max_size_mb
+        limit = (dt.datetime.now() - dt.timedelta(days=max_age_days)).isoformat()
+        with self._lock:
+            conn = self.connect()
+            try:
+                rows = conn.execute(
+                    f'SELECT key, file_name, size, last_used_at FROM {INDEX_TABLE} '
+                    'ORDER BY last_used_at DESC'
+                ).fetchall()
+                remove, total = [], 0
+                for key, file_name, size, last_used_at in rows:
+                    total += size
+                    if last_used_at < limit or total > max_size_mb * 1024 * 1024:
+                        remove.append((key, file_name))
+                with conn:
+                    for key, file_name in remove:
+                        conn.execute(f'DELETE FROM {INDEX_TABLE} WHERE key = ?', (key,))
+                        file_path = os.path.join(self.path, file_name)
+                        if os.path.isfile(file_path):
+                            os.remove(file_path)
+            finally:
+                conn.close()
+        return len(remove)
+
+    # --------------------------------------------------
+    def clear(self) -> int:
+        return self.evict(max_age_days=0, max_size_mb=0)
+
+    # --------------------------------------------------
+    def stats(self) -> pd.DataFrame:
+        """Resultados guardados, del uso más reciente al más antiguo"""
+        conn = self.connect()
+        try:
+            return pd.read_sql(
+                f'SELECT method, params, size, created_at, last_used_at '
+                f'FROM {INDEX_TABLE} ORDER BY last_used_at DESC', conn
+            )
+        finally:
+            conn.close()
+
+
+# --------------------------------------------------
+def use_result_store(store:ResultStore = None):
+    """Activa store para toda la sesión (None lo desactiva)"""
+    global _STORE
+    _STORE = store
+
+
+# --------------------------------------------------
+def active_result_store() -> ResultStore:
+    return _STORE
+
+
+# --------------------------------------------------
+def control_params(control) -> dict:
+    """Campos de inicialización del control (ejercicio, db_path, ...)"""
+    if not is_dataclass(control):
+        return {}
+    return {
+        f.name: getattr(control, f.name, None) for f in fields(control)
+        if f.init and f.name not in IGNORED_FIELDS
+    }
+
+
+# --------------------------------------------------
+def call_params(signature:inspect.Signature, control, args, kwargs) -> dict:
+    """Campos del control más los argumentos de la llamada (con defaults)"""
+    bound = signature.bind(control, *args, **kwargs)
+    bound.apply_defaults()
+    arguments:Dict = dict(bound.arguments)
+    arguments.pop(next(iter(signature.parameters)))
+    return {**control_params(control), **arguments}
+
+
+# --------------------------------------------------
+def input_fingerprints(control, inputs:Callable = None) -> tuple:
+    db_path = getattr(control, 'db_path', None)
+    fingerprints = db_fingerprint(db_path) if db_path else ()
+    if inputs is not None:
+        files:List[str] = inputs(control)
+        fingerprints += tuple(
+            (file, file_fingerprint(file)) for file in files if os.path.isfile(file)
+        )
+    return fingerprints
+
+
+# --------------------------------------------------
+def cached_result(func:Callable = None, *, inputs:Callable = None):
+    """
+    Decorador de métodos de controles que devuelven un DataFrame. Con un
+    ResultStore activo, el resultado se guarda por (método, campos del
+    control, argumentos, huella de los SQLite de db_path y de los archivos
+    que devuelva inputs(control)). Sin store, sólo llama al método. Si no
+    se puede guardar el resultado, se avisa con un warning y se devuelve
+    igual.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            store = _STORE
+            if store is None:
+                return func(self, *args, **kwargs)
+            method = f'{type(self).__name__}.{func.__name__}'
+            params = call_params(signature, self, args, kwargs)
+            key = store.make_key(method, params, input_fingerprints(self, inputs))
+            df = store.get(key)
+            if df is not None:
+                return df
+            df = func(self, *args, **kwargs)
+            if isinstance(df, pd.DataFrame):
+                try:
+                    store.put(key, method, params, df)
+                except Exception as e:
+                    warnings.warn(
+                        f'{method}: no se pudo guardar el resultado ({e!r})',
+                        stacklevel=2
+                    )
+            return df
+
+        return wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
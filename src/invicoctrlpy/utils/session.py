@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Sesión de datos compartida entre varios controles. Mientras una
+    DataSession está activa, cada tabla SQLite se lee una única vez (por
+    modelo, archivo y huella del archivo) y los controles que la vuelven a
+    pedir, aun desde otros hilos, reciben una copia de la versión en memoria.
+    Dentro de la sesión rige copy-on-write (ver utils/copy_on_write.py).
+"""
+
+__all__ = ['DataSession', 'active_session', 'read_sql']
+
+import os
+import threading
+from typing import Callable, Dict, Tuple, Union
+
+import pandas as pd
+
+from .copy_on_write import copy_on_write, lazy_copy
+from .instrumentation import span
+from .local_store import file_fingerprint
+from .registry import get_reader, model_name
+
+_ACTIVE_SESSION = None
+
+
+# --------------------------------------------------
+def from_sql(model:Union[str, type], sqlite_path:str, *args) -> pd.DataFrame:
+    return get_reader(model)().from_sql(sqlite_path, *args)
+
+
+# --------------------------------------------------
+class DataSession():
+    """
+    Caché de tablas en memoria. Se usa como context manager:
+
+        with DataSession():
+            ControlRetenciones(ejercicio=['2024'])
+            ControlHonorarios(ejercicio=['2024'])
+    """
+
+    # --------------------------------------------------
+    def __init__(self, reader:Callable[..., pd.DataFrame] = None):
+        # reader(model, sqlite_path, *args) reemplaza a model().from_sql
+        # (ej. para leer las bases sintéticas de los benchmarks)
+        self.reader = reader or from_sql
+        self._tables:Dict[Tuple, pd.DataFrame] = {}
+        self._locks:Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._previous = None
+        self._copy_on_write = None
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------------------------------
+    def __enter__(self):
+        global _ACTIVE_SESSION
+        self._previous = _ACTIVE_SESSION
+        _ACTIVE_SESSION = self
+        self._copy_on_write = copy_on_write()
+        self._copy_on_write.__enter__()
+        return self
+
+    # --------------------------------------------------
+    def __exit__(self, *exc):
+        global _ACTIVE_SESSION
+        _ACTIVE_SESSION = self._previous
+        self._previous = None
+        self._copy_on_write.__exit__(*exc)
+        self._copy_on_write = None
+        return False
+
+    # --------------------------------------------------
+    def key_lock(self, table:Tuple) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(table, threading.Lock())
+
+    # --------------------------------------------------
+    def read(self, model:Union[str, type], sqlite_path:str, *args) -> pd.DataFrame:
+        sqlite_path = os.path.abspath(sqlite_path)
+        table = (model_name(model), sqlite_path, args)
+        key = table + (file_fingerprint(sqlite_path),)
+        # Un lock por tabla: dos hilos que piden la misma tabla comparten
+        # una sola lectura, mientras que tablas distintas se leen en paralelo
+        with self.key_lock(table):
+            df = self._tables.get(key)
+            if df is None:
+                self.misses += 1
+                df = self.reader(model, sqlite_path, *args)
+                with self._lock:
+                    # Si cambió el archivo, la versión anterior deja de servir
+                    for old_key in [k for k in self._tables if k[:3] == table]:
+                        del self._tables[old_key]
+                    self._tables[key] = df
+            else:
+                self.hits += 1
+        return lazy_copy(df)
+
+    # --------------------------------------------------
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._locks.clear()
+
+
+# --------------------------------------------------
+def active_session() -> DataSession:
+    return _ACTIVE_SESSION
+
+
+# --------------------------------------------------
+def read_sql(model:Union[str, type], sqlite_path:str, *args) -> pd.DataFrame:
+    """
+    Equivalente a model().from_sql(sqlite_path, *args), pero pasa por la
+    DataSession activa (si la hay). model puede ser el nombre del lector
+    (ver utils.registry), que se importa recién al leer sin sesión/reader.
+    """
+    source = ':'.join([os.path.basename(sqlite_path), *map(str, args)])
+    with span(f'read_sql.{model_name(model)}', source=source) as event:
+        session = _ACTIVE_SESSION
+        if session is None:
+            df = from_sql(model, sqlite_path, *args)
+        else:
+            df = session.read(model, sqlite_path, *args)
+        if event is not None:
+            event.rows_out = len(df)
+    return df
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Snapshots de las corridas de los controles y diferencias entre
+    corridas. Cada resultado se guarda con su nombre (p.ej.
+    'ControlRetenciones.icaro_vs_sscc'), sus parámetros y sus columnas clave;
+    diff_frames compara dos snapshots uniendo por un hash de la clave y
+    devuelve sólo las filas nuevas, resueltas y modificadas.
+
+Ejemplo:
+    with SnapshotStore(db_path) as snapshots:
+        ControlRetenciones(ejercicio=['2024']).icaro_vs_sscc(only_diff=True)
+    ...
+    snapshots.diff('ControlRetenciones.icaro_vs_sscc').summary()
+"""
+
+__all__ = [
+    'SnapshotStore', 'SnapshotDiff', 'diff_frames', 'snapshot_result',
+    'active_snapshot_store', 'SNAPSHOTS_FOLDER'
+]
+
+import datetime as dt
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (is_bool_dtype, is_float_dtype,
+                              is_numeric_dtype)
+
+from .result_store import (FORMATS, call_params, default_format, read_frame,
+                           write_frame)
+
+SNAPSHOTS_FOLDER = 'invicoctrlpy_snapshots'
+INDEX_FILE_NAME = 'index.sqlite'
+INDEX_TABLE = 'snapshots'
+
+_SNAPSHOTS = None
+
+
+# --------------------------------------------------
+def key_columns(df:pd.DataFrame) -> List[str]:
+    """Columnas no numéricas (ejercicio, mes, cta_cte, ...)"""
+    return [
+        col for col in df.columns
+        if not is_numeric_dtype(df[col]) or is_bool_dtype(df[col])
+    ]
+
+
+# --------------------------------------------------
+def hash_rows(df:pd.DataFrame, cols:List[str], decimals:int = None) -> np.ndarray:
+    """Hash uint64 por fila de cols (los float se redondean a decimals)"""
+    if not cols:
+        return np.zeros(len(df), dtype='uint64')
+    df = df[cols]
+    if decimals is not None:
+        floats = [col for col in cols if is_float_dtype(df[col])]
+        if floats:
+            df = df.assign(**{col: df[col].round(decimals) for col in floats})
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+# --------------------------------------------------
+def row_hashes(
+    df:pd.DataFrame, key_cols:List[str], value_cols:List[str], decimals:int
+) -> pd.DataFrame:
+    hashes = pd.DataFrame({
+        'key': hash_rows(df, key_cols),
+        'value': hash_rows(df, value_cols, decimals),
+        'row': np.arange(len(df)),
+    })
+    # Claves repetidas se aparean por orden de aparición
+    hashes['n'] = hashes.groupby('key').cumcount()
+    return hashes
+
+
+# --------------------------------------------------
+@dataclass
+class SnapshotDiff():
+    key_cols:List[str]
+    value_cols:List[str]
+    added:pd.DataFrame
+    resolved:pd.DataFrame
+    changed:pd.DataFrame
+    unchanged:int
+
+    # --------------------------------------------------
+    def summary(self) -> dict:
+        return {
+            'nuevas': len(self.added), 'resueltas': len(self.resolved),
+            'modificadas': len(self.changed), 'sin_cambios': self.unchanged,
+        }
+
+    # --------------------------------------------------
+    def to_frame(self) -> pd.DataFrame:
+        """Las tres partes en una tabla, con la columna estado"""
+        return pd.concat([
+            self.added.assign(estado='nueva'),
+            self.resolved.assign(estado='resuelta'),
+            self.changed.assign(estado='modificada'),
+        ], ignore_index=True)
+
+
+# --------------------------------------------------
+def diff_frames(
+    old:pd.DataFrame, new:pd.DataFrame, key_cols:List[str] = None,
+    value_cols:List[str] = None, decimals:int = 2
+) -> SnapshotDiff:
+    """
+    Filas nuevas (clave sólo en new), resueltas (sólo en old) y modificadas
+    (misma clave, otros valores) entre dos resultados. Se une por el hash de
+    key_cols (por defecto, las columnas no numéricas) y se compara el hash
+    de value_cols (por defecto, el resto, con los float redondeados a
+    decimals); las filas sólo se materializan para el delta.
+    """
+    key_cols = list(key_cols or key_columns(new))
+    missing = [col for col in key_cols if col not in old.columns or col not in new.columns]
+    if missing:
+        raise ValueError(f'Columnas clave ausentes en algún snapshot: {missing}')
+    if value_cols is None:
+        value_cols = [
+            col for col in new.columns if col not in key_cols and col in old.columns
+        ]
+    old = old.reset_index(drop=True)
+    new = new.reset_index(drop=True)
+    merged = row_hashes(old, key_cols, value_cols, decimals).merge(
+        row_hashes(new, key_cols, value_cols, decimals),
+        on=['key', 'n'], how='outer', suffixes=('_old', '_new'), indicator=True
+    )
+    added = new.iloc[merged.loc[merged['_merge'] == 'right_only', 'row_new'].astype(int)]
+    resolved = old.iloc[merged.loc[merged['_merge'] == 'left_only', 'row_old'].astype(int)]
+    both = merged.loc[merged['_merge'] == 'both']
+    is_changed = (both['value_old'] != both['value_new']).to_numpy()
+    both = both.loc[is_changed]
+    changed = new.iloc[both['row_new'].astype(int)].loc[:, key_cols].reset_index(drop=True)
+    old_values = old.iloc[both['row_old'].astype(int)].reset_index(drop=True)
+    new_values = new.iloc[both['row_new'].astype(int)].reset_index(drop=True)
+    for col in value_cols:
+        changed[col + '_anterior'] = old_values[col]
+        changed[col + '_actual'] = new_values[col]
+    return SnapshotDiff(
+        key_cols=key_cols, value_cols=value_cols,
+        added=added.reset_index(drop=True),
+        resolved=resolved.reset_index(drop=True),
+        changed=changed, unchanged=int(len(is_changed) - is_changed.sum())
+    )
+
+
+# --------------------------------------------------
+@dataclass
+class SnapshotStore():
+    db_path:str
+    folder:str = SNAPSHOTS_FOLDER
+    fmt:str = None
+    path:str = field(init=False)
+
+    # --------------------------------------------------
+    def __post_init__(self):
+        self.path = os.path.join(self.db_path, self.folder)
+        self.fmt = self.fmt or default_format()
+        if self.fmt not in FORMATS:
+            raise ValueError(f'fmt debe ser uno de {tuple(FORMATS)}')
+        self._lock = threading.Lock()
+        self._previous = None
+
+    # --------------------------------------------------
+    def __enter__(self):
+        global _SNAPSHOTS
+        self._previous = _SNAPSHOTS
+        _SNAPSHOTS = self
+        return self
+
+    # --------------------------------------------------
+    def __exit__(self, *exc):
+        global _SNAPSHOTS
+        _SNAPSHOTS = self._previous
+        self._previous = None
+        return False
+
+    # --------------------------------------------------
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(self.path, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.path, INDEX_FILE_NAME))
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, params TEXT, '
+            'key_cols TEXT, file_name TEXT, rows INTEGER, created_at TEXT)'
+        )
+        return conn
+
+    # --------------------------------------------------
+    def save(
+        self, name:str, df:pd.DataFrame, params:dict = None,
+        key_cols:List[str] = None
+    ) -> int:
+        """Guarda df como una nueva corrida de name y devuelve su id"""
+        created_at = dt.datetime.now()
+        file_name = (
+            f"{name.replace('/', '_')}_{created_at:%Y%m%d%H%M%S%f}"
+            f"_{threading.get_ident()}{FORMATS[self.fmt]}"
+        )
+        os.makedirs(self.path, exist_ok=True)
+        write_frame(df, os.path.join(self.path, file_name))
+        with self._lock:
+            conn = self.connect()
+            try:
+                with conn:
+                    cursor = conn.execute(
+                        f'INSERT INTO {INDEX_TABLE} '
+                        '(name, params, key_cols, file_name, rows, created_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        (name, json.dumps(params or {}, sort_keys=True, default=str),
+                         json.dumps(key_cols), file_name, len(df),
+                         created_at.isoformat())
+                    )
+            finally:
+                conn.close()
+        return cursor.lastrowid
+
+    # --------------------------------------------------
+    def snapshots(self, name:str = None, params:dict = None) -> pd.DataFrame:
+        """Corridas guardadas (de la más reciente a la más antigua)"""
+        where, args = [], []
+        if name is not None:
+            where.append('name = ?')
+            args.append(name)
+        if params is not None:
+            where.append('params = ?')
+            args.append(json.dumps(params, sort_keys=True, default=str))
+        conn = self.connect()
+        try:
+            return pd.read_sql(
+                f'SELECT * FROM {INDEX_TABLE}'
+                + (' WHERE ' + ' AND '.join(where) if where else '')
+                + ' ORDER BY id DESC', conn, params=args
+            )
+        finally:
+            conn.close()
+
+    # --------------------------------------------------
+    def entry(self, snapshot_id:int) -> pd.Series:
+        df = self.snapshots().set_index('id')
+        if snapshot_id not in df.index:
+            raise KeyError(f'Snapshot inexistente: {snapshot_id}')
+        return df.loc[snapshot_id]
+
+    # --------------------------------------------------
+    def load(self, snapshot_id:int) -> pd.DataFrame:
+        return read_frame(os.path.join(self.path, self.entry(snapshot_id)['file_name']))
+
+    # --------------------------------------------------
+    def diff(
+        self, name:str, params:dict = None, old_id:int = None,
+        new_id:int = None, key_cols:List[str] = None, **kwargs
+    ) -> SnapshotDiff:
+        """
+        Diferencias entre dos corridas de name. Por defecto, la última y la
+        anterior con los mismos parámetros que la última.
+        """
+        if new_id is None:
+            runs = self.snapshots(name, params)
+            if runs.empty:
+                raise KeyError(f'No hay snapshots de {name}')
+            new_id = int(runs['id'].iloc[0])
+        new = self.entry(new_id)
+        if old_id is None:
+            runs = self.snapshots(name, json.loads(new['params']))
+            runs = runs.loc[runs['id'] < new_id]
+            if runs.empty:
+                raise KeyError(f'No hay una corrida anterior a {new_id} de {name}')
+            old_id = int(runs['id'].iloc[0])
+        return diff_frames(
+            self.load(old_id), self.load(new_id),
+            key_cols=key_cols or json.loads(new['key_cols']), **kwargs
+        )
+
+    # --------------------------------------------------
+    def prune(self, keep:int = 10) -> int:
+        """Deja las últimas keep corridas de cada (nombre, parámetros)"""
+        df = self.snapshots()
+        df = df.loc[df.groupby(['name', 'params']).cumcount() >= keep]
+        with self._lock:
+            conn = self.connect()
+            try:
+                with conn:
+                    for snapshot_id, file_name in zip(df['id'], df['file_name']):
+                        conn.execute(
+                            f'DELETE FROM {INDEX_TABLE} WHERE id = ?', (int(snapshot_id),)
+                        )
+                        file_path = os.path.join(self.path, file_name)
+                        if os.path.isfile(file_path):
+                            os.remove(file_path)
+            finally:
+                conn.close()
+        return len(df)
+
+
+# --------------------------------------------------
+def active_snapshot_store() -> SnapshotStore:
+    return _SNAPSHOTS
+
+
+# --------------------------------------------------
+def snapshot_result(func:Callable = None, *, key_cols:List[str] = None):
+    """
+    Decorador de métodos de controles que devuelven un DataFrame. Con un
+    SnapshotStore activo, cada llamada guarda su resultado como una corrida
+    de 'Clase.método' con los campos del control y los argumentos. Las
+    columnas clave son key_cols o, si el método las recibe, groupby_cols.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            df = func(self, *args, **kwargs)
+            store = _SNAPSHOTS
+            if store is not None and isinstance(df, pd.DataFrame):
+                params = call_params(signature, self, args, kwargs)
+                store.save(
+                    f'{type(self).__name__}.{func.__name__}', df, params=params,
+                    key_cols=key_cols or params.get('groupby_cols')
+                )
+            return df
+
+        return wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
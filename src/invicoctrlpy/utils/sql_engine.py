@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Author: Fernando Corrales <fscpython@gmail.com>
+Purpose: Motor SQL embebido (opcional) para los controles que son trabajo
+    relacional puro (filtrar, cruzar por nro_entrada, agrupar y comparar).
+    Con DuckDB se adjuntan las bases SQLite (siif, sscc, sgf, ...) y los
+    joins y agregaciones corren vectorizados y en varios hilos dentro de
+    DuckDB; a pandas sólo vuelve el resultado. Los DataFrames ya procesados
+    se pueden consultar también, sin copiarlos.
+
+    Sin DuckDB instalado se usa sqlite3 (mismo resultado, en un solo hilo).
+
+Ejemplo:
+    with SqlEngine(db_path):
+        ControlRetenciones(ejercicio=['2024']).import_siif_pagos_contratistas()
+"""
+
+__all__ = [
+    'SqlEngine', 'active_engine', 'in_params', 'parse_fechas',
+    'SQLITE_FILES', 'TABLES'
+]
+
+import os
+import sqlite3
+import threading
+from importlib.util import find_spec
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from .lazy_import import lazy_import
+
+duckdb = lazy_import('duckdb')
+
+_ACTIVE_ENGINE = None
+
+SQLITE_FILES = ('siif', 'sscc', 'sgf', 'icaro', 'slave', 'sgv', 'sgo')
+
+# Tabla lógica -> (base, tabla SQLite). Las tablas las escribe invicodatpy
+# (update_sql_db); si cambian de nombre, se pasa tables= a SqlEngine
+TABLES:Dict[str, Tuple[str, str]] = {
+    'ctas_ctes': ('sscc', 'CtasCtes'),
+    'banco_invico': ('sscc', 'BancoINVICO'),
+    'rcocc31': ('siif', 'MayorContableRcocc31'),
+    'rcg01_uejp': ('siif', 'ComprobantesGtosRcg01Uejp'),
+    'rdeu012': ('siif', 'DeudaFlotanteRdeu012'),
+    'resumen_rend': ('sgf', 'ResumenRendProv'),
+    'resumen_rend_cuit': ('sgf', 'JoinResumenRendProvCuit'),
+}
+
+
+# --------------------------------------------------
+def in_params(values) -> Tuple[str, List]:
+    """('?, ?, ?', [valores]) para una cláusula IN (...)"""
+    if not isinstance(values, (list, tuple, set)):
+        values = [values]
+    values = [str(value) for value in values]
+    return ', '.join(['?'] * len(values)), values
+
+
+# --------------------------------------------------
+def parse_fechas(df:pd.DataFrame) -> pd.DataFrame:
+    """Las columnas fecha* leídas como texto de SQLite pasan a datetime"""
+    for col in df.columns:
+        if col.startswith('fecha') and not is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+
+# --------------------------------------------------
+class SqlEngine():
+    """
+    Backend SQL sobre los archivos de db_path. backend es 'duckdb' o
+    'sqlite' (por defecto, duckdb si está instalado). Se activa como
+    context manager, igual que DataSession.
+    """
+
+    # --------------------------------------------------
+    def __init__(
+        self, db_path:str, backend:str = None,
+        tables:Dict[str, Tuple[str, str]] = None, threads:int = None
+    ):
+        if backend is None:
+            backend = 'duckdb' if find_spec('duckdb') is not None else 'sqlite'
+        if backend not in ('duckdb', 'sqlite'):
+            raise ValueError("backend debe ser 'duckdb' o 'sqlite'")
+        self.db_path = db_path
+        self.backend = backend
+        self.tables = {**TABLES, **(tables or {})}
+        self.threads = threads
+        self._con = None
+        self._lock = threading.Lock()
+        self._previous = None
+
+    # --------------------------------------------------
+    def __enter__(self):
+        global _ACTIVE_ENGINE
+        self._previous = _ACTIVE_ENGINE
+        _ACTIVE_ENGINE = self
+        return self
+
+    # --------------------------------------------------
+    def __exit__(self, *exc):
+        global _ACTIVE_ENGINE
+        _ACTIVE_ENGINE = self._previous
+        self._previous = None
+        self.close()
+        return False
+
+    # --------------------------------------------------
+    def sqlite_files(self) -> Dict[str, str]:
+        files = {}
+        for name in SQLITE_FILES:
+            file_path = os.path.join(self.db_path, name + '.sqlite')
+            if os.path.exists(file_path):
+                files[name] = file_path
+        return files
+
+    # --------------------------------------------------
+    def duckdb_connection(self):
+        # Las bases se adjuntan una vez; cada consulta usa su propio cursor
+        # (thread-safe) sobre la misma instancia de DuckDB
+        with self._lock:
+            if self._con is None:
+                self._con = self.attach_duckdb()
+        return self._con
+
+    # --------------------------------------------------
+    def attach_duckdb(self):
+        con = duckdb.connect()
+        con.execute('INSTALL sqlite')
+        con.execute('LOAD sqlite')
+        if self.threads:
+            con.execute(f'SET threads = {int(self.threads)}')
+        for name, file_path in self.sqlite_files().items():
+            con.execute(f"ATTACH '{file_path}' AS {name} (TYPE SQLITE, READ_ONLY)")
+        return con
+
+    # --------------------------------------------------
+    def sqlite_connection(self) -> sqlite3.Connection:
+        con = sqlite3.connect(':memory:')
+        for name, file_path in self.sqlite_files().items():
+            con.execute(f'ATTACH DATABASE ? AS {name}', (file_path,))
+        return con
+
+    # --------------------------------------------------
+    def table_names(self) -> Dict[str, str]:
+        return {
+            key: f'{database}."{table}"'
+            for key, (database, table) in self.tables.items()
+        }
+
+    # --------------------------------------------------
+    def query(
+        self, sql:str, params:Sequence = (), **frames:pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Ejecuta sql y devuelve el resultado. {tabla} se reemplaza por la tabla
+        SQLite de TABLES (ej. {rcocc31}); cada DataFrame de frames se consulta
+        por su nombre. Los parámetros van como '?'.
+        """
+        sql = sql.format(**self.table_names())
+        if self.backend == 'duckdb':
+            cursor = self.duckdb_connection().cursor()
+            try:
+                for name, df in frames.items():
+                    cursor.register(name, df)
+                df = cursor.execute(sql, list(params)).df()
+            finally:
+                cursor.close()
+        else:
+            con = self.sqlite_connection()
+            try:
+                for name, df in frames.items():
+                    df.to_sql(name, con, index=False)
+                df = pd.read_sql(sql, con, params=list(params))
+            finally:
+                con.close()
+        return parse_fechas(df)
+
+    # --------------------------------------------------
+    def compare_sums(
+        self, groupby_cols:List[str],
+        left:pd.DataFrame, left_col:str, left_name:str,
+        right:pd.DataFrame, right_col:str, right_name:str
+    ) -> pd.DataFrame:
+        """
+        Suma left_col de left y right_col de right por groupby_cols, las cruza
+        con un full outer join (faltantes = 0) y agrega la columna diferencia
+        (left_name - right_name). Ordenado por groupby_cols, como pd.merge.
+        Las filas con alguna clave nula se descartan, como en groupby de
+        pandas (en SQL cada lado aportaría su propio grupo NULL sin cruzar).
+        """
+        keys = ', '.join(f'"{col}"' for col in groupby_cols)
+        key_cols = ', '.join(
+            f'COALESCE(l."{col}", r."{col}") AS "{col}"' for col in groupby_cols
+        )
+        on = ' AND '.join(f'l."{col}" = r."{col}"' for col in groupby_cols)
+        not_null = ' AND '.join(f'"{col}" IS NOT NULL' for col in groupby_cols)
+        sql = f"""
+            WITH l AS (
+                SELECT {keys}, SUM("{left_col}") AS {left_name}
+                FROM left_df WHERE {not_null} GROUP BY {keys}
+            ), r AS (
+                SELECT {keys}, SUM("{right_col}") AS {right_name}
+                FROM right_df WHERE {not_null} GROUP BY {keys}
+            )
+            SELECT {key_cols},
+                COALESCE(l.{left_name}, 0) AS {left_name},
+                COALESCE(r.{right_name}, 0) AS {right_name},
+                COALESCE(l.{left_name}, 0) - COALESCE(r.{right_name}, 0) AS diferencia
+            FROM l FULL OUTER JOIN r ON {on}
+            ORDER BY {', '.join(str(i + 1) for i in range(len(groupby_cols)))}
+        """
+        return self.query(
+            sql,
+            left_df=left.loc[:, groupby_cols + [left_col]],
+            right_df=right.loc[:, groupby_cols + [right_col]]
+        )
+
+    # --------------------------------------------------
+    def close(self):
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
+
+# --------------------------------------------------
+def active_engine() -> SqlEngine:
+    return _ACTIVE_ENGINE